@@ -7,7 +7,15 @@ from plotly.subplots import make_subplots
 import warnings
 # from scipy import stats  # Commented out for Streamlit Cloud compatibility
 warnings.filterwarnings('ignore')
-from data_manager import DataManager
+from data_manager import DataManager, render_load_report
+from dimensions import MONTH_NAMES, attach_calendar, attach_cohort, cohort_order
+from leaderboard import grouped_top_bottom, leaderboard_table, top_bottom
+from score_correlations import correlation_stats
+from score_distributions import (bin_scores, histogram_trace, merge_partitions, normal_curve_trace,
+                                 partition_moments)
+from significance import compare_groups, describe_result
+from student_facts import IMPACT_FACT_COLUMNS, JPT_LEVELS, PRP_FACT_COLUMNS, StudentFacts, placement_rate_by
+from student_index import build_student_index, join_students
 import os
 
 # Page configuration
@@ -52,23 +60,114 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# Columns each analysis section reads, per data type. Only these are loaded,
+# so free-text columns such as Faculty_Feedback stay on disk.
+SECTION_COLUMNS = {
+    'AI Tutor': {
+        'AI Tutor': ['Campus (SG/MUM/SYD/DXB)', 'Course(GCGM/MGM/GMBA)', 'Cohort', 'Unit_Name',
+                     'Batch_size(number should come from student feedback form)', 'Faculty Name',
+                     'No_of_Session_IDs_created', 'Total_Students_Participated_watched videos',
+                     'Average Score of AI Tutor Platform Quiz', 'Faculty_Rating_provide by students',
+                     'Avg_Rating_for_AI_Tutor_Tool', 'No. of Quizzes_conducted'],
+    },
+    'AI Mentor': {
+        'AI Mentor': ['Academic_Manager_Name', 'Course', 'Cohort',
+                      'Project Type (ARP, IBR 1, IBR 2, Industry Project)',
+                      "Q1_Are Students_motivated to use AI Mentor? (Yes/No, as they don't find it useful)",
+                      'Q2_Are students using AI Mentor effectively ? (Yes/No)',
+                      "Q4_Improvement_observed in student's logical thinking, Presentation & Report Structure with the use of AI Mentor (Yes/No)",
+                      'Approx. percentage of students under your guidance who levelled up using AI Mentor.'],
+    },
+    'JPT': {
+        'PRP (Placement Readiness Program)': ['Student Roll No.', 'Email id', 'Course', 'Year',
+                                              'Term-1', 'Term-2', 'Term-3',
+                                              'No. of JPT Mock Interviews attempted and scored equal or above 80%',
+                                              'Area Head Mock Interview Score',
+                                              'Categorise student overall (Outstanding, Good, Average, Needs Handholding)',
+                                              'Placed/Not Placed'],
+        'CR (Corporate Relations)': ['Course', 'Year', 'No. of Students_Interviewed', 'Students_Selected',
+                                     'Avg_CTC(in USD)', 'Highest_CTC(in USD)', 'Students used JPT(Yes/No)'],
+        'AI Impact': ['Student _mail id', 'CGPA'],
+    },
+    'Unit Performance': {
+        'Unit Performance': ['Course', 'Cohort', 'Year', 'Unit_Name', 'AI Tutor (Before/After)', 'Total_Avg_score',
+                             'Unit_Commencement_date'],
+    },
+}
+
 @st.cache_data
-def load_data():
-    """Load all the data files"""
+def load_data(selected_years=None):
+    """Load the columns the analysis sections need, pushing the year filter down to storage"""
     try:
         data_manager = DataManager()
-        data = {}
         
-        for data_type, filename in data_manager.data_files.items():
-            if os.path.exists(filename):
-                data[data_type] = pd.read_csv(filename)
-            else:
-                data[data_type] = pd.DataFrame()
+        filters = None
+        if selected_years and list(selected_years) != ['All']:
+            filters = {'Year': [int(y) for y in selected_years]}
         
-        return data
+        return data_manager.load_sections(SECTION_COLUMNS, filters=filters)
     except Exception as e:
         st.error(f"Error loading data: {e}")
-        return {}
+        return {}, {}
+
+# Columns the student fact table is built from. The table covers every stored
+# student, whatever the filters, and is filtered afterwards.
+FACT_SOURCES = {
+    'PRP (Placement Readiness Program)': list(PRP_FACT_COLUMNS),
+    'AI Impact': list(IMPACT_FACT_COLUMNS),
+}
+
+def stored_versions(data_types):
+    """Version token of each stored dataset, so cached results follow saves"""
+    store = DataManager().store
+    return tuple(store.version(data_type) if store.exists(data_type) else None for data_type in data_types)
+
+@st.cache_data
+def load_fact_sources(versions):
+    """All stored PRP and AI Impact rows of the student fact table, for the given dataset versions"""
+    return DataManager().load_all_data(FACT_SOURCES)
+
+@st.cache_resource
+def student_facts():
+    """Student fact table shared across reruns, updated incrementally as PRP / AI Impact data change"""
+    return StudentFacts()
+
+@st.cache_data
+def course_coverage(versions, selected_years=None):
+    """Records per course and data type, grouped on the course keys shared by the star schema's fact tables"""
+    data_manager = DataManager()
+    filters = None
+    if selected_years and list(selected_years) != ['All']:
+        filters = {'Year': [int(y) for y in selected_years]}
+    data, report = data_manager.load_all_data(filters=filters)
+    schema = data_manager.build_star_schema(data)
+    keys = pd.concat([pd.DataFrame({'Data Type': data_type, 'course_key': fact['course_key']})
+                      for data_type, fact in schema.facts.items() if 'course_key' in fact.columns])
+    counts = keys[keys['course_key'] >= 0].groupby(['Data Type', 'course_key']).size().reset_index(name='Records')
+    counts.insert(1, 'Course', schema.labels('course', counts.pop('course_key')))
+    return counts, report
+
+# PRP scores whose distribution moments are kept per (Year, Course) partition
+PRP_MOMENT_COLUMNS = ['Avg_Term_Score', 'Area Head Mock Interview Score',
+                      'No. of JPT Mock Interviews attempted and scored equal or above 80%']
+
+@st.cache_data
+def prp_score_moments(versions):
+    """Score moments of every (Year, Course) partition of the stored PRP data, for the given dataset version"""
+    data, report = DataManager().load_all_data({'PRP (Placement Readiness Program)': [
+        'Year', 'Course', 'Term-1', 'Term-2', 'Term-3', *PRP_MOMENT_COLUMNS[1:]]})
+    prp_scores = data['PRP (Placement Readiness Program)']
+    if prp_scores.empty:
+        return {}, report
+    prp_scores = prp_scores.assign(Avg_Term_Score=(prp_scores['Term-1'] + prp_scores['Term-2'] + prp_scores['Term-3']) / 3)
+    return partition_moments(prp_scores, PRP_MOMENT_COLUMNS, ['Year', 'Course']), report
+
+def student_fact_table():
+    """The shared student fact table, brought up to date with the stored PRP and AI Impact data"""
+    sources, report = load_fact_sources(stored_versions(FACT_SOURCES))
+    if any(entry['status'] != 'ok' for entry in report.values()):
+        load_fact_sources.clear()
+    return student_facts().update(sources['PRP (Placement Readiness Program)'], sources['AI Impact'])
 
 def calculate_adoption_rate(participated, batch_size):
     """Calculate adoption rate: students who participated vs total batch size"""
@@ -96,7 +195,7 @@ def comprehensive_ai_tutor_analysis(data, selected_years, selected_programs, sel
         return
     
     # Add year extraction for filtering
-    ai_tutor_data['Year'] = ai_tutor_data['Cohort'].apply(lambda x: int(x.split('-')[1]) + 2000)
+    ai_tutor_data = attach_cohort(ai_tutor_data, {'year': 'Year'})
     
     # Apply filters
     filtered_data = ai_tutor_data.copy()
@@ -158,7 +257,7 @@ def comprehensive_ai_tutor_analysis(data, selected_years, selected_programs, sel
         selected_subject = st.selectbox("Select Subject", subject_options, key="ai_tutor_subject")
     
     with col3:
-        cohort_options = ['All Cohorts'] + sorted(filtered_data['Cohort'].unique().tolist())
+        cohort_options = ['All Cohorts'] + cohort_order(filtered_data['Cohort'])
         selected_cohort = st.selectbox("Select Cohort", cohort_options, key="ai_tutor_cohort")
     
     st.markdown('</div>', unsafe_allow_html=True)
@@ -236,31 +335,27 @@ def comprehensive_ai_tutor_analysis(data, selected_years, selected_programs, sel
     # Top 5 and Bottom 5 Units by Average Quiz Score (Per Program)
     st.subheader("📈 Top 5 and Bottom 5 Units by Average Quiz Score")
     
-    for program in display_data['Course(GCGM/MGM/GMBA)'].unique():
-        program_data = display_data[display_data['Course(GCGM/MGM/GMBA)'] == program]
-        
-        # Group by unit and calculate average
-        unit_scores = program_data.groupby(['Unit_Name', 'Cohort']).agg({
-            'Average Score of AI Tutor Platform Quiz': 'mean',
-            'Faculty Name': 'first'
-        }).reset_index()
-        unit_scores = unit_scores.sort_values('Average Score of AI Tutor Platform Quiz', ascending=False)
-        
+    # Rank units for every program in a single grouped pass
+    program_rankings = grouped_top_bottom(display_data, 'Course(GCGM/MGM/GMBA)', ['Unit_Name', 'Cohort'],
+                                          'Average Score of AI Tutor Platform Quiz', agg={
+                                              'Average Score of AI Tutor Platform Quiz': 'mean',
+                                              'Faculty Name': 'first'
+                                          }, k=5)
+    unit_columns = {'Unit_Name': 'Unit', 'Cohort': 'Cohort',
+                    'Average Score of AI Tutor Platform Quiz': 'Avg Quiz Score (/10)'}
+    
+    for program, (top_5, bottom_5) in program_rankings.items():
         st.write(f"**{program} Program:**")
         
         col1, col2 = st.columns(2)
         
         with col1:
             st.write("**🏆 Top 5 Units:**")
-            top_5 = unit_scores.head(5)
-            for _, row in top_5.iterrows():
-                st.write(f"• {row['Unit_Name']} ({row['Cohort']}) - {row['Average Score of AI Tutor Platform Quiz']:.1f}/10")
+            st.dataframe(leaderboard_table(top_5, unit_columns).round(1), use_container_width=True, hide_index=True)
         
         with col2:
             st.write("**📉 Bottom 5 Units:**")
-            bottom_5 = unit_scores.tail(5)
-            for _, row in bottom_5.iterrows():
-                st.write(f"• {row['Unit_Name']} ({row['Cohort']}) - {row['Average Score of AI Tutor Platform Quiz']:.1f}/10")
+            st.dataframe(leaderboard_table(bottom_5, unit_columns).round(1), use_container_width=True, hide_index=True)
     
     # Average Quiz Score Distribution Across Units (Box & Whiskers)
     st.subheader("📊 Average Quiz Score Distribution by Program & Cohort")
@@ -423,42 +518,28 @@ def comprehensive_ai_tutor_analysis(data, selected_years, selected_programs, sel
     faculty_performance.columns = ['Faculty_Name', 'Avg_Faculty_Rating', 'Avg_Quiz_Score',
                                   'Units_Taught', 'Avg_Adoption_Rate', 'Programs']
     
-    # Sort by average faculty rating
-    faculty_performance = faculty_performance.sort_values('Avg_Faculty_Rating', ascending=False)
+    # Select the top and bottom faculty by average rating without sorting everyone
+    top_5_faculty, bottom_5_faculty = top_bottom(faculty_performance, 'Avg_Faculty_Rating', k=5)
+    faculty_columns = {
+        'Faculty_Name': 'Faculty',
+        'Avg_Faculty_Rating': 'Faculty Rating (/10)',
+        'Avg_Quiz_Score': 'Avg Quiz Score (/10)',
+        'Units_Taught': 'Units Taught',
+        'Programs': 'Programs',
+        'Avg_Adoption_Rate': 'Adoption Rate (%)'
+    }
     
     col1, col2 = st.columns(2)
     
     with col1:
         st.write("**🏆 Top 5 Faculty (by Student Rating):**")
-        top_5_faculty = faculty_performance.head(5)
-        
-        for i, (_, row) in enumerate(top_5_faculty.iterrows(), 1):
-            st.markdown(f"""
-            <div class="insight-box">
-            <h5>{i}. {row['Faculty_Name']}</h5>
-            <p><strong>Faculty Rating:</strong> {row['Avg_Faculty_Rating']:.2f}/10</p>
-            <p><strong>Avg Quiz Score:</strong> {row['Avg_Quiz_Score']:.2f}/10</p>
-            <p><strong>Units Taught:</strong> {row['Units_Taught']}</p>
-            <p><strong>Programs:</strong> {row['Programs']}</p>
-            <p><strong>Adoption Rate:</strong> {row['Avg_Adoption_Rate']:.1f}%</p>
-            </div>
-            """, unsafe_allow_html=True)
+        st.dataframe(leaderboard_table(top_5_faculty, faculty_columns).round(2),
+                     use_container_width=True, hide_index=True)
     
     with col2:
         st.write("**📉 Bottom 5 Faculty (by Student Rating):**")
-        bottom_5_faculty = faculty_performance.tail(5)
-        
-        for i, (_, row) in enumerate(bottom_5_faculty.iterrows(), 1):
-            st.markdown(f"""
-            <div class="insight-box">
-            <h5>{i}. {row['Faculty_Name']}</h5>
-            <p><strong>Faculty Rating:</strong> {row['Avg_Faculty_Rating']:.2f}/10</p>
-            <p><strong>Avg Quiz Score:</strong> {row['Avg_Quiz_Score']:.2f}/10</p>
-            <p><strong>Units Taught:</strong> {row['Units_Taught']}</p>
-            <p><strong>Programs:</strong> {row['Programs']}</p>
-            <p><strong>Adoption Rate:</strong> {row['Avg_Adoption_Rate']:.1f}%</p>
-            </div>
-            """, unsafe_allow_html=True)
+        st.dataframe(leaderboard_table(bottom_5_faculty, faculty_columns).round(2),
+                     use_container_width=True, hide_index=True)
     
     # Explanation of metrics
     st.info("""
@@ -485,7 +566,7 @@ def comprehensive_ai_mentor_analysis(data, selected_years, selected_programs, se
         return
     
     # Add year extraction for filtering
-    ai_mentor_data['Year'] = ai_mentor_data['Cohort'].apply(lambda x: int(x.split('-')[1]) + 2000)
+    ai_mentor_data = attach_cohort(ai_mentor_data, {'year': 'Year'})
     
     # Apply filters
     filtered_data = ai_mentor_data.copy()
@@ -585,15 +666,18 @@ def comprehensive_ai_mentor_analysis(data, selected_years, selected_programs, se
     
     top_am = display_data.groupby(['Academic_Manager_Name', 'Course']).agg({
         'Approx. percentage of students under your guidance who levelled up using AI Mentor.': 'mean'
-    }).reset_index().sort_values('Approx. percentage of students under your guidance who levelled up using AI Mentor.', ascending=False)
+    }).reset_index()
+    top_10, _ = top_bottom(top_am, 'Approx. percentage of students under your guidance who levelled up using AI Mentor.', k=10)
     
     col1, col2 = st.columns(2)
     
     with col1:
         st.write("**🏆 Top 10 Academic Managers:**")
-        top_10 = top_am.head(10)
-        for i, (_, row) in enumerate(top_10.iterrows(), 1):
-            st.write(f"{i}. {row['Academic_Manager_Name']} ({row['Course']}) - {row['Approx. percentage of students under your guidance who levelled up using AI Mentor.']:.1f}%")
+        st.dataframe(leaderboard_table(top_10, {
+            'Academic_Manager_Name': 'Academic Manager',
+            'Course': 'Program',
+            'Approx. percentage of students under your guidance who levelled up using AI Mentor.': 'Level-up Rate (%)'
+        }).round(1), use_container_width=True, hide_index=True)
     
     with col2:
         fig = px.bar(top_10, x='Approx. percentage of students under your guidance who levelled up using AI Mentor.', 
@@ -686,6 +770,16 @@ def comprehensive_jpt_analysis(data, selected_years, selected_programs, selected
         
         with col4:
             st.metric("Non-JPT Users Conversion Rate", f"{jpt_no['Conversion_Rate']:.1f}%")
+        
+        # Significance of the JPT Yes/No differences across company drives
+        jpt_drives = filtered_cr[filtered_cr['No. of Students_Interviewed'] > 0]
+        drive_conversion = jpt_drives['Students_Selected'] / jpt_drives['No. of Students_Interviewed'] * 100
+        jpt_used = jpt_drives['Students used JPT(Yes/No)']
+        conversion_significance = compare_groups(drive_conversion[jpt_used == 'No'], drive_conversion[jpt_used == 'Yes'])
+        ctc_significance = compare_groups(filtered_cr.loc[filtered_cr['Students used JPT(Yes/No)'] == 'No', 'Avg_CTC(in USD)'],
+                                          filtered_cr.loc[filtered_cr['Students used JPT(Yes/No)'] == 'Yes', 'Avg_CTC(in USD)'])
+        st.caption(f"📐 Conversion rate per drive (JPT vs non-JPT): {describe_result(conversion_significance, '%')}")
+        st.caption(f"📐 Average CTC (JPT vs non-JPT): {describe_result(ctc_significance, 'K')}")
     
     # Visualization of JPT impact
     col1, col2 = st.columns(2)
@@ -722,21 +816,41 @@ def comprehensive_jpt_analysis(data, selected_years, selected_programs, selected
                 color='Placement_Rate', color_continuous_scale='RdYlGn')
     st.plotly_chart(fig, use_container_width=True)
     
+    # Placement by JPT level and AI Tutor usage from the student fact table
+    st.subheader("🎓 Placement Rate by JPT Level and AI Tutor Usage")
+    facts = student_fact_table()
+    if selected_years and selected_years != ['All']:
+        facts = facts[facts['Year'].isin([int(y) for y in selected_years])]
+    if selected_programs and selected_programs != ['All']:
+        facts = facts[facts['Course'].isin(selected_programs)]
+    
+    rates = placement_rate_by(facts, 'JPT Level', 'AI Tutor Usage')
+    if rates.empty:
+        st.info("No students with both PRP and AI Impact records for the selected filters.")
+    else:
+        heatmap = rates.pivot(index='JPT Level', columns='AI Tutor Usage', values='Placement_Rate')
+        heatmap = heatmap.reindex(index=[level for level in JPT_LEVELS if level in heatmap.index],
+                                  columns=[usage for usage in ['Low', 'Medium', 'High'] if usage in heatmap.columns])
+        fig = px.imshow(heatmap, text_auto=True, color_continuous_scale='RdYlGn', aspect='auto',
+                        title=f'Placement Rate (%) - {rates["Students"].sum()} students in both PRP and AI Impact',
+                        labels={'x': 'AI Tutor Usage', 'y': 'JPT Level', 'color': 'Placement Rate (%)'})
+        st.plotly_chart(fig, use_container_width=True)
+    
     # Comprehensive Score Analysis with Bell Curves and Skewness
     st.subheader("🔍 Comprehensive Score Analysis with Distribution & Skewness")
     
     # Calculate average term scores for PRP comparison
     filtered_prp['Avg_Term_Score'] = (filtered_prp['Term-1'] + filtered_prp['Term-2'] + filtered_prp['Term-3']) / 3
     
-    # Get CGPA data from AI Impact data if available
+    # Get each student's CGPA from AI Impact data if available
     ai_impact_data = data.get('AI Impact', pd.DataFrame())
     if not ai_impact_data.empty:
-        # Merge CGPA data with PRP data based on student name or cohort
-        cgpa_data = ai_impact_data.groupby('Cohort')['CGPA'].mean().reset_index()
-        filtered_prp = filtered_prp.merge(cgpa_data, on='Cohort', how='left')
+        # Join at student level on normalized email / roll number
+        impact_index = build_student_index(ai_impact_data)
+        filtered_prp = join_students(filtered_prp, ai_impact_data, ['CGPA'], impact_index)
     else:
-        # If no CGPA data, create dummy data for visualization
-        filtered_prp['CGPA'] = np.random.uniform(2.5, 4.0, len(filtered_prp))
+        # No CGPA data to join; leave it missing rather than inventing values
+        filtered_prp['CGPA'] = np.nan
     
     # Define variables with shorter labels (removed CGPA as it's not relevant for comparison)
     variables = {
@@ -757,15 +871,18 @@ def comprehensive_jpt_analysis(data, selected_years, selected_programs, selected
         
         for i, (var, label) in enumerate(variables.items()):
             if var in filtered_prp.columns:
-                data_values = filtered_prp[var].dropna()
-                fig.add_trace(go.Histogram(
-                    x=data_values,
+                binned = bin_scores(filtered_prp[var], nbins=20, density=True)
+                fig.add_trace(histogram_trace(
+                    binned,
                     name=label,
                     opacity=0.7,
-                    nbinsx=20,
-                    histnorm='probability density',
                     marker_color=colors[i % len(colors)]
                 ))
+                fig.add_trace(normal_curve_trace(
+                    binned,
+                    name=f'{label} (Normal Fit)',
+                    line=dict(color=colors[i % len(colors)], dash='dash')
+                ))
         
         fig.update_layout(
             title='Score Distributions (Bell Curves)',
@@ -781,13 +898,21 @@ def comprehensive_jpt_analysis(data, selected_years, selected_programs, selected
         st.write("**📈 Skewness Analysis:**")
         skewness_data = []
         
+        # Merge the per-(Year, Course) moment partials of the stored data selected by the global filters
+        partials, moments_report = prp_score_moments(stored_versions(['PRP (Placement Readiness Program)']))
+        if any(entry['status'] != 'ok' for entry in moments_report.values()):
+            prp_score_moments.clear()
+        moments = merge_partitions(partials, list(variables), ['Year', 'Course'], filters={
+            'Year': [int(y) for y in selected_years] if selected_years and selected_years != ['All'] else None,
+            'Course': selected_programs if selected_programs and selected_programs != ['All'] else None
+        }).summary()
+        
         for var, label in variables.items():
-            if var in filtered_prp.columns:
-                data_values = filtered_prp[var].dropna()
-                if len(data_values) > 0:
-                    mean_val = data_values.mean()
-                    std_val = data_values.std()
-                    skew_val = ((data_values - mean_val) ** 3).mean() / (std_val ** 3)
+            if var in moments.index:
+                if moments.loc[var, 'count'] > 0:
+                    mean_val = moments.loc[var, 'mean']
+                    std_val = moments.loc[var, 'std']
+                    skew_val = moments.loc[var, 'skewness']
                     
                     skewness_data.append({
                         'Variable': label,
@@ -814,6 +939,11 @@ def comprehensive_jpt_analysis(data, selected_years, selected_programs, selected
     - **Correlation**: Measures how strongly related the scores are (-1 to +1)
     """)
     
+    # Full correlation matrix computed once per filter state; every panel reads pairs from it
+    score_columns = ['Term-1', 'Term-2', 'Term-3', 'Avg_Term_Score', 'Area Head Mock Interview Score',
+                     'No. of JPT Mock Interviews attempted and scored equal or above 80%']
+    correlations = correlation_stats(filtered_prp[score_columns])
+    
     # Only keep relevant combinations - remove ALL CGPA comparisons as they are different parameters
     combinations = [
         ('Avg_Term_Score', 'Area Head Mock Interview Score'),
@@ -846,7 +976,7 @@ def comprehensive_jpt_analysis(data, selected_years, selected_programs, selected
                 st.plotly_chart(fig, use_container_width=True)
                 
                 # Show correlation with interpretation
-                correlation = filtered_prp[x_var].corr(filtered_prp[y_var])
+                correlation = correlations.pair(x_var, y_var)
                 col_a, col_b = st.columns(2)
                 with col_a:
                     st.metric("Correlation", f"{correlation:.3f}")
@@ -883,7 +1013,7 @@ def comprehensive_jpt_analysis(data, selected_years, selected_programs, selected
                 st.plotly_chart(fig, use_container_width=True)
                 
                 # Show correlation with interpretation
-                correlation = filtered_prp[x_var].corr(filtered_prp[y_var])
+                correlation = correlations.pair(x_var, y_var)
                 col_a, col_b = st.columns(2)
                 with col_a:
                     st.metric("Correlation", f"{correlation:.3f}")
@@ -902,16 +1032,13 @@ def comprehensive_jpt_analysis(data, selected_years, selected_programs, selected
     # Correlation Matrix and Statistical Analysis
     st.subheader("📈 Comprehensive Statistical Analysis")
     
-    # Prepare data for correlation analysis
-    correlation_data = filtered_prp[['Term-1', 'Term-2', 'Term-3', 'Area Head Mock Interview Score', 
-                                    'No. of JPT Mock Interviews attempted and scored equal or above 80%']].copy()
-    correlation_data.columns = ['Term-1', 'Term-2', 'Term-3', 'Area Head Score', 'JPT High Scores']
-    
     col1, col2 = st.columns(2)
     
     with col1:
         # Correlation matrix
-        corr_matrix = correlation_data.corr()
+        corr_matrix = correlations.matrix(['Term-1', 'Term-2', 'Term-3', 'Area Head Mock Interview Score',
+                                           'No. of JPT Mock Interviews attempted and scored equal or above 80%'])
+        corr_matrix.index = corr_matrix.columns = ['Term-1', 'Term-2', 'Term-3', 'Area Head Score', 'JPT High Scores']
         fig = px.imshow(corr_matrix, title='Correlation Matrix: PRP, Area Head, and JPT Scores',
                        labels=dict(color="Correlation"), color_continuous_scale='RdBu_r')
         st.plotly_chart(fig, use_container_width=True)
@@ -920,8 +1047,10 @@ def comprehensive_jpt_analysis(data, selected_years, selected_programs, selected
         # Distribution analysis
         fig = go.Figure()
         
-        fig.add_trace(go.Histogram(x=filtered_prp['Avg_Term_Score'], name='PRP Scores', opacity=0.7, nbinsx=20))
-        fig.add_trace(go.Histogram(x=filtered_prp['Area Head Mock Interview Score'], name='Area Head Scores', opacity=0.7, nbinsx=20))
+        fig.add_trace(histogram_trace(bin_scores(filtered_prp['Avg_Term_Score'], nbins=20),
+                                      name='PRP Scores', opacity=0.7))
+        fig.add_trace(histogram_trace(bin_scores(filtered_prp['Area Head Mock Interview Score'], nbins=20),
+                                      name='Area Head Scores', opacity=0.7))
         
         fig.update_layout(title='Score Distribution: PRP vs Area Head',
                          xaxis_title='Score', yaxis_title='Frequency',
@@ -944,14 +1073,34 @@ def comprehensive_jpt_analysis(data, selected_years, selected_programs, selected
     if high_jpt_placement > no_jpt_placement:
         insights.append(f"🎯 High JPT users have {high_jpt_placement - no_jpt_placement:.1f}% better placement rate")
     
-    if correlation > 0.5:
-        insights.append(f"📊 Strong positive correlation ({correlation:.2f}) between PRP and Area Head scores")
-    elif correlation < 0.3:
-        insights.append(f"⚠️ Weak correlation ({correlation:.2f}) suggests scoring inconsistencies")
+    prp_area_head_correlation = correlations.pair('Avg_Term_Score', 'Area Head Mock Interview Score')
+    if prp_area_head_correlation > 0.5:
+        insights.append(f"📊 Strong positive correlation ({prp_area_head_correlation:.2f}) between PRP and Area Head scores")
+    elif prp_area_head_correlation < 0.3:
+        insights.append(f"⚠️ Weak correlation ({prp_area_head_correlation:.2f}) suggests scoring inconsistencies")
     
     for insight in insights:
         st.markdown(f"<div class='insight-box'>{insight}</div>", unsafe_allow_html=True)
 
+def course_coverage_analysis(selected_years, selected_programs):
+    """Records of every initiative per course, across datasets that spell the course column differently"""
+    st.markdown('<h2 class="section-header">🌐 Course Coverage Across Initiatives</h2>', unsafe_allow_html=True)
+    
+    counts, report = course_coverage(stored_versions(DataManager().data_files), tuple(selected_years))
+    if any(entry['status'] != 'ok' for entry in report.values()):
+        course_coverage.clear()
+    if selected_programs and selected_programs != ['All']:
+        counts = counts[counts['Course'].isin(selected_programs)]
+    if counts.empty:
+        st.info("No records with a course for the selected filters.")
+        return
+    
+    coverage = counts.pivot(index='Data Type', columns='Course', values='Records').fillna(0).astype(int)
+    fig = px.imshow(coverage, text_auto=True, color_continuous_scale='Blues', aspect='auto',
+                    title='Records per Course and Initiative',
+                    labels={'x': 'Course', 'y': 'Data Type', 'color': 'Records'})
+    st.plotly_chart(fig, use_container_width=True)
+
 def unit_performance_analysis(data, selected_years, selected_programs, selected_campuses):
     """Unit Performance Analysis with visualizations"""
     st.markdown('<h2 class="section-header">📊 Unit Performance Analysis</h2>', unsafe_allow_html=True)
@@ -1034,15 +1183,13 @@ def unit_performance_analysis(data, selected_years, selected_programs, selected_
                          showlegend=True)
         st.plotly_chart(fig, use_container_width=True)
         
-        # Statistical significance test (simplified without scipy)
+        # Statistical significance via bootstrap CI and permutation test (NumPy only)
         if len(before_scores) > 1 and len(after_scores) > 1:
-            before_mean = before_scores.mean()
-            after_mean = after_scores.mean()
-            improvement = after_mean - before_mean
-            if improvement > 0:
-                st.success(f"✅ Performance improvement observed: +{improvement:.2f} points")
+            significance = compare_groups(before_scores, after_scores)
+            if significance['significant'] and significance['difference'] > 0:
+                st.success(f"✅ Performance improvement: {describe_result(significance, ' points')}")
             else:
-                st.info(f"ℹ️ Performance change: {improvement:+.2f} points")
+                st.info(f"ℹ️ Performance change: {describe_result(significance, ' points')}")
     
     with col2:
         # Program-wise analysis
@@ -1065,25 +1212,29 @@ def unit_performance_analysis(data, selected_years, selected_programs, selected_
     unit_comparison['Percent_Improvement'] = (unit_comparison['Improvement'] / unit_comparison['Before'] * 100).round(1)
     
     if not unit_comparison.empty:
-        # Sort by improvement
-        unit_comparison_sorted = unit_comparison.sort_values('Improvement', ascending=False)
+        top_improved, least_improved = top_bottom(unit_comparison.reset_index(), 'Improvement', k=5)
+        improvement_columns = {
+            'Unit_Name': 'Unit',
+            'Before': 'Before',
+            'After': 'After',
+            'Improvement': 'Improvement',
+            'Percent_Improvement': 'Improvement (%)'
+        }
         
         col1, col2 = st.columns(2)
         
         with col1:
             st.write("**🏆 Top 5 Most Improved Units:**")
-            top_improved = unit_comparison_sorted.head(5)
-            for unit, row in top_improved.iterrows():
-                st.write(f"• **{unit}**: {row['Before']:.1f} → {row['After']:.1f} (+{row['Improvement']:.1f}, +{row['Percent_Improvement']:.1f}%)")
+            st.dataframe(leaderboard_table(top_improved, improvement_columns).round(1),
+                         use_container_width=True, hide_index=True)
         
         with col2:
             st.write("**📉 Units with Least Improvement:**")
-            least_improved = unit_comparison_sorted.tail(5)
-            for unit, row in least_improved.iterrows():
-                st.write(f"• **{unit}**: {row['Before']:.1f} → {row['After']:.1f} ({row['Improvement']:+.1f}, {row['Percent_Improvement']:+.1f}%)")
+            st.dataframe(leaderboard_table(least_improved, improvement_columns).round(1),
+                         use_container_width=True, hide_index=True)
         
         # Visualization of unit improvements
-        fig = px.scatter(unit_comparison_sorted.reset_index(), x='Before', y='After', 
+        fig = px.scatter(unit_comparison.reset_index(), x='Before', y='After', 
                         size='Percent_Improvement', hover_name='Unit_Name',
                         title='Unit Performance: Before vs After AI Tutor Implementation',
                         labels={'Before': 'Score Before AI Tutor', 'After': 'Score After AI Tutor'},
@@ -1113,29 +1264,18 @@ def unit_performance_analysis(data, selected_years, selected_programs, selected_
     # Month-wise Performance Analysis
     st.subheader("📅 Month-wise Performance Analysis")
     
-    # Extract month from Unit_Commencement_date or create dummy months
+    # Month number of Unit_Commencement_date from the calendar dimension, or dummy months
     if 'Unit_Commencement_date' in filtered_data.columns:
-        # Try to extract month from date string
-        try:
-            filtered_data['Month'] = pd.to_datetime(filtered_data['Unit_Commencement_date'], errors='coerce').dt.month_name()
-        except:
-            # If date parsing fails, create dummy months
-            months = ['January', 'February', 'March', 'April', 'May', 'June', 
-                     'July', 'August', 'September', 'October', 'November', 'December']
-            filtered_data['Month'] = np.random.choice(months, len(filtered_data))
+        filtered_data = attach_calendar(filtered_data, 'Unit_Commencement_date', {'month': 'Month_Number'})
+        filtered_data = filtered_data[filtered_data['Month_Number'] > 0]
     else:
         # Create dummy months for demonstration
-        months = ['January', 'February', 'March', 'April', 'May', 'June', 
-                 'July', 'August', 'September', 'October', 'November', 'December']
-        filtered_data['Month'] = np.random.choice(months, len(filtered_data))
-    
-    monthly_performance = filtered_data.groupby(['Month', 'AI Tutor (Before/After)'])['Total_Avg_score'].mean().reset_index()
+        filtered_data['Month_Number'] = np.random.randint(1, 13, len(filtered_data))
     
-    # Order months correctly
-    month_order = ['January', 'February', 'March', 'April', 'May', 'June',
-                   'July', 'August', 'September', 'October', 'November', 'December']
-    monthly_performance['Month'] = pd.Categorical(monthly_performance['Month'], categories=month_order, ordered=True)
-    monthly_performance = monthly_performance.sort_values('Month')
+    # Group and order on the integer month, then label it
+    monthly_performance = (filtered_data.groupby(['Month_Number', 'AI Tutor (Before/After)'])['Total_Avg_score']
+                           .mean().reset_index().sort_values('Month_Number'))
+    monthly_performance['Month'] = np.array(MONTH_NAMES)[monthly_performance['Month_Number'].to_numpy() - 1]
     
     fig = px.line(monthly_performance, x='Month', y='Total_Avg_score', color='AI Tutor (Before/After)',
                  title='Unit Performance Trends by Month',
@@ -1149,13 +1289,6 @@ def main():
     st.markdown('<h1 class="main-header">🚀 AI Initiatives Impact Dashboard</h1>', unsafe_allow_html=True)
     st.markdown("### SP Jain School of Global Management - Comprehensive Analysis")
     
-    # Load data
-    data = load_data()
-    
-    if not data:
-        st.error("Failed to load data. Please check if all CSV files are present.")
-        return
-    
     # Main filters at the top of the page
     st.markdown('<div class="filter-container">', unsafe_allow_html=True)
     st.write("**🔍 Global Filters (Applied to all analyses):**")
@@ -1179,11 +1312,23 @@ def main():
     
     st.markdown('</div>', unsafe_allow_html=True)
     
+    # Load data (datasets with a Year column only fetch the selected years)
+    data, load_report = load_data(tuple(selected_years))
+    if not data or any(entry['status'] != 'ok' for entry in load_report.values()):
+        # Keep failed or partial loads out of the cache so the next rerun retries them
+        load_data.clear()
+    
+    if not data:
+        st.error("Failed to load data. Please check if all CSV files are present.")
+        return
+    render_load_report(load_report)
+    
     # Analysis sections
     comprehensive_ai_tutor_analysis(data, selected_years, selected_programs, selected_campuses)
     comprehensive_ai_mentor_analysis(data, selected_years, selected_programs, selected_campuses)
     comprehensive_jpt_analysis(data, selected_years, selected_programs, selected_campuses)
     unit_performance_analysis(data, selected_years, selected_programs, selected_campuses)
+    course_coverage_analysis(selected_years, selected_programs)
     
     # Footer
     st.markdown("---")
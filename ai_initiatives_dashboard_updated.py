@@ -6,7 +6,13 @@ import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import warnings
 warnings.filterwarnings('ignore')
-from data_manager import DataManager
+from data_manager import DataManager, render_load_report
+from csv_reader import read_csv
+from audit_log import AUDIT_PAGE_SIZE
+from data_profiler import profile_table
+from record_keys import NATURAL_KEYS
+from score_distributions import bin_scores, histogram_trace
+from significance import compare_paired, describe_result
 import os
 
 # Page configuration
@@ -51,21 +57,13 @@ st.markdown("""
 
 @st.cache_data
 def load_data():
-    """Load all the data files"""
+    """Load all the data files concurrently"""
     try:
         data_manager = DataManager()
-        data = {}
-        
-        for data_type, filename in data_manager.data_files.items():
-            if os.path.exists(filename):
-                data[data_type] = pd.read_csv(filename)
-            else:
-                data[data_type] = pd.DataFrame()
-        
-        return data
+        return data_manager.load_all_data()
     except Exception as e:
         st.error(f"Error loading data: {e}")
-        return {}
+        return {}, {}
 
 def calculate_conversion_rate(selected, applied):
     """Calculate conversion rate with error handling"""
@@ -108,7 +106,8 @@ def data_management_page():
                         data=template_data,
                         file_name=data_manager.templates[data_type]['filename'],
                         mime='text/csv',
-                        key=f"download_{data_type.replace(' ', '_')}",
+                        # The ETag changes with the template's columns, so a new schema gets a new button
+                        key=f"download_{data_type.replace(' ', '_')}_{data_manager.template_etag(data_type)}",
                         help=f"{template_info['description'] if template_info else ''}"
                     )
         
@@ -120,7 +119,8 @@ def data_management_page():
                 label="📦 Download All Templates (ZIP)",
                 data=all_templates,
                 file_name="ai_initiatives_templates_updated.zip",
-                mime='application/zip'
+                mime='application/zip',
+                key=f"download_all_templates_{data_manager.template_etag()}"
             )
             
             st.info("""
@@ -161,7 +161,7 @@ def data_management_page():
         if uploaded_file is not None:
             try:
                 # Read uploaded file
-                uploaded_df = pd.read_csv(uploaded_file)
+                uploaded_df = read_csv(uploaded_file, data_type)
                 
                 st.write("**Preview of uploaded data:**")
                 st.dataframe(uploaded_df.head())
@@ -178,11 +178,40 @@ def data_management_page():
                     st.write(f"**Current data:** {len(existing_df)} records")
                     st.write(f"**New data:** {len(uploaded_df)} records")
                     
-                    # Operation selection
+                    # Compare the upload with the stored records before anything is written
+                    diff = data_manager.diff_upload(existing_df, uploaded_df, data_type)
+                    diff_labels = {
+                        'new': "🆕 New records",
+                        'changed': "✏️ Key stored, values differ",
+                        'unchanged': "✅ Already stored",
+                        'dropped': "➖ Not in upload",
+                    }
+                    diff_cols = st.columns(4)
+                    for diff_col, (name, label) in zip(diff_cols, diff_labels.items()):
+                        with diff_col:
+                            st.metric(label, diff[name]['count'])
+                    if diff['changed']['ambiguous']:
+                        st.warning(f"⚠️ {diff['changed']['ambiguous']} uploaded records have a key matching several "
+                                   "stored records; an upsert skips them")
+                    with st.expander("🔍 Sample rows by change type"):
+                        for name, label in diff_labels.items():
+                            if diff[name]['count']:
+                                st.write(f"**{label}** ({diff[name]['count']})")
+                                st.dataframe(diff[name]['sample'])
+                    
+                    # Operation selection; upserts need a column combination identifying each record
+                    key_columns = NATURAL_KEYS[data_type]
+                    if key_columns:
+                        operations = ["Merge with existing data", "Upsert by record key", "Replace all existing data"]
+                        upsert_help = f"Upsert: Update records whose key ({', '.join(key_columns)}) already exists and add the rest. "
+                    else:
+                        operations = ["Merge with existing data", "Replace all existing data"]
+                        upsert_help = f"Upsert is not available, as no columns identify a single {data_type} record. "
                     operation = st.radio(
                         "Choose operation:",
-                        ["Merge with existing data", "Replace all existing data"],
-                        help="Merge: Add new data to existing data. Replace: Delete all existing data and use only new data."
+                        operations,
+                        help="Merge: Add new data to existing data. " + upsert_help +
+                             "Replace: Delete all existing data and use only new data."
                     )
                     
                     col1, col2 = st.columns(2)
@@ -191,6 +220,8 @@ def data_management_page():
                         if st.button("🚀 Execute Upload", type="primary"):
                             if operation == "Merge with existing data":
                                 result_df, success, msg = data_manager.merge_data(existing_df, uploaded_df, data_type, user_info)
+                            elif operation == "Upsert by record key":
+                                result_df, success, msg = data_manager.upsert_data(existing_df, uploaded_df, data_type, user_info)
                             else:
                                 result_df, success, msg = data_manager.replace_data(uploaded_df, data_type, user_info)
                             
@@ -251,21 +282,43 @@ def data_management_page():
                     📝 Description: {info.get('description', 'N/A')}
                     """)
         
+        # Column profiles, computed once per dataset version
+        stored_types = [data_type for data_type, info in summary.items() if 'last_modified' in info]
+        if stored_types:
+            st.write("**Column Profile:**")
+            profile_type = st.selectbox("Dataset", stored_types, key="profile_data_type")
+            profile = data_manager.get_data_profile(profile_type)
+            if profile:
+                st.dataframe(profile_table(profile), hide_index=True)
+            
+            # Saved versions of a dataset, each readable as it was
+            st.write("**Dataset History:**")
+            history_type = st.selectbox("Dataset", stored_types, key="history_data_type")
+            versions = data_manager.list_versions(history_type)
+            if versions:
+                st.dataframe(pd.DataFrame(versions), hide_index=True)
+                selected = st.selectbox("View version", [v['version'] for v in reversed(versions)], key="history_version")
+                position = [v['version'] for v in versions].index(selected)
+                previous_rows = versions[position - 1]['rows'] if position else 0
+                st.metric(f"Records in version {selected}", versions[position]['rows'],
+                          delta=versions[position]['rows'] - previous_rows)
+                st.dataframe(data_manager.load_version(history_type, selected).head(100))
+            else:
+                st.caption("No saved versions yet: one is recorded with every upload or deletion.")
+        
         # Refresh button
         if st.button("🔄 Refresh Summary"):
             st.cache_data.clear()
-            st.experimental_rerun()
+            st.rerun()
     
     with tab4:
         st.subheader("📋 Operation Logs")
         
-        if 'operation_logs' in st.session_state and st.session_state.operation_logs:
-            # Display recent logs
+        session_log = st.session_state.get('operation_logs')
+        if session_log:
+            # Display recent logs (the session log is kept newest first)
             st.write("**Recent Operations:**")
-            logs_df = pd.DataFrame(st.session_state.operation_logs)
-            
-            # Sort by timestamp (most recent first)
-            logs_df = logs_df.sort_values('timestamp', ascending=False)
+            logs_df = pd.DataFrame(session_log.page(0, AUDIT_PAGE_SIZE))
             
             # Display as table
             st.dataframe(
@@ -273,25 +326,48 @@ def data_management_page():
                 use_container_width=True,
                 hide_index=True
             )
+            if len(session_log) > AUDIT_PAGE_SIZE:
+                st.caption(f"Latest {AUDIT_PAGE_SIZE} of this session's operations; all of them are under All Operations below")
             
             # Clear logs button
             if st.button("🗑️ Clear Logs"):
-                st.session_state.operation_logs = []
-                st.experimental_rerun()
+                session_log.clear()
+                st.rerun()
                 
         else:
             st.info("No operations logged yet.")
         
-        # Download full log file
-        if os.path.exists('data_operations.log'):
-            with open('data_operations.log', 'r') as f:
-                log_content = f.read()
+        # All logged operations, read a page at a time from the audit log
+        facets = data_manager.audit.facets()
+        if facets['records']:
+            st.write("**All Operations:**")
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                log_operations = st.multiselect("Operation", facets['operations'], key="log_operations")
+            with col2:
+                log_data_types = st.multiselect("Data Type", facets['data_types'], key="log_data_types")
+            with col3:
+                log_users = st.multiselect("User", facets['users'], key="log_users")
+            log_filters = {'operations': log_operations, 'data_types': log_data_types, 'users': log_users}
+            
+            # One query returns both the open page and the number of matching records
+            log_page = st.session_state.get('log_page', 1)
+            log_records, log_total = data_manager.audit.query(offset=(log_page - 1) * AUDIT_PAGE_SIZE, **log_filters)
+            log_pages = max(1, -(-log_total // AUDIT_PAGE_SIZE))
+            if log_page > log_pages:
+                # Narrower filters can leave the open page past the last one
+                log_page = st.session_state['log_page'] = log_pages
+                log_records, _ = data_manager.audit.query(offset=(log_page - 1) * AUDIT_PAGE_SIZE, **log_filters)
+            st.number_input(f"Page (of {log_pages})", min_value=1, max_value=log_pages, key="log_page")
+            st.caption(f"{log_total} matching operations, newest first")
+            st.dataframe(pd.DataFrame(log_records), use_container_width=True, hide_index=True)
             
+            # The file is only produced, segment by segment, when the button is clicked
             st.download_button(
                 label="📄 Download Full Log File",
-                data=log_content,
-                file_name=f"data_operations_log_{pd.Timestamp.now().strftime('%Y%m%d')}.txt",
-                mime='text/plain'
+                data=lambda: data_manager.audit.export(**log_filters),
+                file_name=f"data_operations_log_{pd.Timestamp.now().strftime('%Y%m%d')}.jsonl",
+                mime='application/x-ndjson'
             )
 
 def ai_tkt_analysis(data):
@@ -333,10 +409,17 @@ def ai_tkt_analysis(data):
         with col1:
             # Score distribution comparison
             fig = go.Figure()
-            fig.add_trace(go.Histogram(x=ai_tkt_data['Average Grades Before AI for TKT'], name='Before AI TKT', opacity=0.7))
-            fig.add_trace(go.Histogram(x=ai_tkt_data['Avergae Grades After AI for TKT'], name='After AI TKT', opacity=0.7))
+            fig.add_trace(histogram_trace(bin_scores(ai_tkt_data['Average Grades Before AI for TKT']),
+                                          name='Before AI TKT', opacity=0.7))
+            fig.add_trace(histogram_trace(bin_scores(ai_tkt_data['Avergae Grades After AI for TKT']),
+                                          name='After AI TKT', opacity=0.7))
             fig.update_layout(title='Score Distribution: Before vs After AI TKT', barmode='overlay')
             st.plotly_chart(fig, use_container_width=True)
+            
+            # Paired significance test on the per-unit before/after grades
+            significance = compare_paired(ai_tkt_data['Average Grades Before AI for TKT'],
+                                          ai_tkt_data['Avergae Grades After AI for TKT'])
+            st.caption(f"📐 Before vs After AI TKT: {describe_result(significance, ' points')}")
         
         with col2:
             # Improvement by unit/course
@@ -395,8 +478,9 @@ def cr_analysis(data):
     with col2:
         # CTC distribution
         if 'Avg_CTC(in USD)' in cr_data.columns:
-            fig = px.histogram(cr_data, x='Avg_CTC(in USD)', title='CTC Distribution',
-                              labels={'Avg_CTC(in USD)': 'Average CTC (USD)', 'count': 'Number of Companies'})
+            fig = go.Figure(histogram_trace(bin_scores(cr_data['Avg_CTC(in USD)']), name='CTC'))
+            fig.update_layout(title='CTC Distribution', xaxis_title='Average CTC (USD)',
+                              yaxis_title='Number of Companies')
             st.plotly_chart(fig, use_container_width=True)
 
 def prp_analysis(data):
@@ -440,8 +524,9 @@ def prp_analysis(data):
     with col1:
         # Score distribution
         if 'Term-1' in prp_data.columns:
-            fig = px.histogram(prp_data, x='Term-1', title='Term-1 Score Distribution',
-                              labels={'Term-1': 'Term-1 Score', 'count': 'Number of Students'})
+            fig = go.Figure(histogram_trace(bin_scores(prp_data['Term-1']), name='Term-1'))
+            fig.update_layout(title='Term-1 Score Distribution', xaxis_title='Term-1 Score',
+                              yaxis_title='Number of Students')
             st.plotly_chart(fig, use_container_width=True)
     
     with col2:
@@ -589,11 +674,15 @@ def main():
     st.markdown("### SP Jain School of Global Management - MGB, GMBA & GCGM Programs")
     
     # Load data
-    data = load_data()
+    data, load_report = load_data()
+    if not data or any(entry['status'] != 'ok' for entry in load_report.values()):
+        # Keep failed or partial loads out of the cache so the next rerun retries them
+        load_data.clear()
     
     if not data:
         st.error("Failed to load data. Please check if all CSV files are present.")
         return
+    render_load_report(load_report, st.sidebar)
     
     # Sidebar for filters
     st.sidebar.header("📊 Dashboard Filters")
@@ -677,7 +766,7 @@ def main():
     
     # Reset filters button
     if st.sidebar.button("🔄 Reset All Filters"):
-        st.experimental_rerun()
+        st.rerun()
     
     # Apply filters to data
     filtered_data = {}
@@ -0,0 +1,232 @@
+import io
+import json
+import os
+import threading
+from collections import deque
+from datetime import datetime
+from itertools import islice
+
+# A new segment is started once the current one reaches this size, and the
+# oldest segments are removed beyond the maximum count
+AUDIT_SEGMENT_BYTES = int(os.environ.get('AI_DASHBOARD_AUDIT_SEGMENT_BYTES', 1 << 20))
+AUDIT_MAX_SEGMENTS = int(os.environ.get('AI_DASHBOARD_AUDIT_MAX_SEGMENTS', 100))
+
+# Records shown per page of the Operation Logs tab
+AUDIT_PAGE_SIZE = 50
+
+# Operations of a session kept in memory; older ones are only in the audit log
+SESSION_LOG_CAPACITY = 200
+
+# Record fields and the keys they are stored under in the sidecar index
+_INDEXED = {'timestamp': 't', 'operation': 'o', 'data_type': 'd', 'user': 'u'}
+
+# Appends rewrite the manifest, so they go one at a time
+_APPEND_LOCK = threading.Lock()
+
+
+class _IterStream(io.RawIOBase):
+    """Readable binary stream over an iterator of byte chunks"""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._pending = b''
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        while not self._pending:
+            self._pending = next(self._chunks, None)
+            if self._pending is None:
+                self._pending = b''
+                return 0
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+
+class AuditLog:
+    """Data operations recorded as JSON lines in size-rotated segment files.
+
+    Every segment has a sidecar index with the time, operation, data type,
+    user and byte range of each record, and a manifest lists the segments
+    with their record counts, time span and distinct operations, data types
+    and users. Queries skip segments that cannot match, filter on the
+    indexes and read only the records of the requested page.
+    """
+
+    def __init__(self, directory='audit_log', segment_bytes=AUDIT_SEGMENT_BYTES, max_segments=AUDIT_MAX_SEGMENTS):
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.max_segments = max_segments
+        self.manifest_path = os.path.join(directory, 'manifest.json')
+
+    def _read_manifest(self):
+        if not os.path.exists(self.manifest_path):
+            return {'segments': []}
+        with open(self.manifest_path) as f:
+            return json.load(f)
+
+    def _write_manifest(self, manifest):
+        """Swap in a new manifest atomically so readers never see a partial one"""
+        with open(self.manifest_path + '.tmp', 'w') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(self.manifest_path + '.tmp', self.manifest_path)
+
+    def _path(self, segment, suffix):
+        return os.path.join(self.directory, f"segment-{segment['id']:06d}{suffix}")
+
+    def append(self, operation, data_type, user_info, details=""):
+        """Record one operation and return the record"""
+        record = {
+            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'operation': operation,
+            'data_type': data_type,
+            'user': user_info,
+            'details': details,
+        }
+        line = (json.dumps(record) + '\n').encode('utf-8')
+
+        with _APPEND_LOCK:
+            os.makedirs(self.directory, exist_ok=True)
+            manifest = self._read_manifest()
+            segments = manifest['segments']
+            if not segments or segments[-1]['bytes'] >= self.segment_bytes:
+                segments.append({'id': segments[-1]['id'] + 1 if segments else 1, 'records': 0, 'bytes': 0,
+                                 'first': record['timestamp'], 'last': record['timestamp'],
+                                 'operations': [], 'data_types': [], 'users': []})
+            segment = segments[-1]
+
+            # Offsets come from the file itself, so they hold even if the manifest fell behind it
+            with open(self._path(segment, '.jsonl'), 'ab') as f:
+                offset = f.tell()
+                f.write(line)
+                size = f.tell()
+            entry = {key: record[field] for field, key in _INDEXED.items()}
+            entry.update(p=offset, n=len(line))
+            with open(self._path(segment, '.idx'), 'a') as f:
+                f.write(json.dumps(entry) + '\n')
+
+            segment['records'] += 1
+            segment['bytes'] = size
+            segment['last'] = record['timestamp']
+            for field in ('operation', 'data_type', 'user'):
+                if record[field] not in segment[field + 's']:
+                    segment[field + 's'].append(record[field])
+
+            # Rotate out the oldest segments
+            while len(segments) > self.max_segments:
+                oldest = segments.pop(0)
+                for suffix in ('.jsonl', '.idx'):
+                    os.remove(self._path(oldest, suffix))
+            self._write_manifest(manifest)
+        return record
+
+    def facets(self):
+        """Number of records and the distinct operations, data types and users logged"""
+        segments = self._read_manifest()['segments']
+        return {
+            'records': sum(segment['records'] for segment in segments),
+            **{field: sorted({value for segment in segments for value in segment[field]})
+               for field in ('operations', 'data_types', 'users')},
+        }
+
+    def _entries(self, segment):
+        """Index entries of a segment, oldest first"""
+        with open(self._path(segment, '.idx')) as f:
+            return [json.loads(line) for line in f]
+
+    def _read(self, segment, entries):
+        """The records at the given index entries of a segment"""
+        records = []
+        with open(self._path(segment, '.jsonl'), 'rb') as f:
+            for entry in entries:
+                f.seek(entry['p'])
+                records.append(json.loads(f.read(entry['n'])))
+        return records
+
+    def _matching(self, segments, operations, data_types, users, since, until):
+        """Index entries of the records matching the filters, per segment, in segment order"""
+        filters = {'o': operations, 'd': data_types, 'u': users}
+        for segment in segments:
+            if any(values and not set(values) & set(segment[field])
+                   for field, values in (('operations', operations), ('data_types', data_types), ('users', users))):
+                continue
+            if (since and segment['last'] < since) or (until and segment['first'] > until):
+                continue
+            yield segment, [entry for entry in self._entries(segment)
+                            if all(not values or entry[key] in values for key, values in filters.items())
+                            and (not since or entry['t'] >= since) and (not until or entry['t'] <= until)]
+
+    def query(self, operations=None, data_types=None, users=None, since=None, until=None, offset=0, limit=AUDIT_PAGE_SIZE):
+        """A page of matching records, newest first, and the number of matching records.
+
+        `since` and `until` are inclusive 'YYYY-MM-DD HH:MM:SS' strings.
+        """
+        segments = self._read_manifest()['segments'][::-1]
+        if any((operations, data_types, users, since, until)):
+            matching = ((segment, entries[::-1]) for segment, entries
+                        in self._matching(segments, operations, data_types, users, since, until))
+        else:
+            # Every record matches, so the manifest counts place the page and
+            # only the indexes of the segments holding it are read
+            matching = ((segment, None) for segment in segments)
+
+        total, page = 0, []
+        for segment, entries in matching:
+            count = segment['records'] if entries is None else len(entries)
+            start, stop = max(offset - total, 0), min(max(offset + limit - total, 0), count)
+            if start < stop:
+                if entries is None:
+                    entries = self._entries(segment)[:count][::-1]
+                page.extend(self._read(segment, entries[start:stop]))
+            total += count
+        return page, total
+
+    def _export_chunks(self, filters):
+        segments = self._read_manifest()['segments']
+        if not any(filters.values()):
+            for segment in segments:
+                with open(self._path(segment, '.jsonl'), 'rb') as f:
+                    while chunk := f.read(1 << 16):
+                        yield chunk
+            return
+        for segment, entries in self._matching(segments, **filters):
+            with open(self._path(segment, '.jsonl'), 'rb') as f:
+                for entry in entries:
+                    f.seek(entry['p'])
+                    yield f.read(entry['n'])
+
+    def export(self, operations=None, data_types=None, users=None, since=None, until=None):
+        """Stream of the matching records as JSON lines, oldest first"""
+        filters = {'operations': operations, 'data_types': data_types, 'users': users, 'since': since, 'until': until}
+        return io.BufferedReader(_IterStream(self._export_chunks(filters)))
+
+
+class SessionLog:
+    """The latest operations of one session, newest first, in a fixed-size ring buffer.
+
+    Every operation is also in the persistent audit log, so dropping the
+    oldest entries when the buffer is full loses nothing.
+    """
+
+    def __init__(self, capacity=SESSION_LOG_CAPACITY):
+        self._records = deque(maxlen=capacity)
+
+    def __len__(self):
+        return len(self._records)
+
+    @property
+    def capacity(self):
+        return self._records.maxlen
+
+    def add(self, record):
+        self._records.appendleft(record)
+
+    def page(self, offset=0, limit=AUDIT_PAGE_SIZE):
+        """Records `offset` to `offset + limit`, newest first"""
+        return list(islice(self._records, offset, offset + limit))
+
+    def clear(self):
+        self._records.clear()
@@ -0,0 +1,137 @@
+import os
+import re
+import shutil
+import threading
+import zipfile
+from datetime import datetime, timedelta
+
+from storage import dataset_slug
+
+# Retention policy: recent backups are kept as one archive each, older ones are
+# folded into one archive per month, and anything older than the maximum age
+# is removed
+BACKUP_KEEP_RECENT = int(os.environ.get('AI_DASHBOARD_BACKUP_KEEP_RECENT', 5))
+BACKUP_COMPACT_AFTER_DAYS = int(os.environ.get('AI_DASHBOARD_BACKUP_COMPACT_AFTER_DAYS', 7))
+BACKUP_MAX_AGE_DAYS = int(os.environ.get('AI_DASHBOARD_BACKUP_MAX_AGE_DAYS', 180))
+
+COPY_BUFFER_BYTES = 1 << 20
+_TIMESTAMP_FORMAT = '%Y%m%d_%H%M%S_%f'
+_SNAPSHOT = re.compile(r'^(?P<slug>.+)-(?P<stamp>\d{8}_\d{6}_\d{6})\.zip$')
+_MONTHLY = re.compile(r'^(?P<slug>.+)-(?P<month>\d{6})\.compact\.zip$')
+
+# One compaction at a time across all managers, as the monthly archives are shared
+_COMPACTION_LOCK = threading.Lock()
+
+
+class BackupManager:
+    """Compressed backups of stored datasets with retention and compaction.
+
+    A backup streams the bytes of the files holding a dataset into one
+    DEFLATE zip archive, without parsing them. Compaction runs on a
+    background thread: snapshots beyond the most recent `keep_recent`, or
+    older than `compact_after_days`, are moved into one LZMA archive per
+    month, and archives older than `max_age_days` are removed. A monthly
+    archive is rewritten to a temporary file and swapped in before the
+    snapshots folded into it are removed, so an interrupted compaction
+    loses nothing.
+    """
+
+    def __init__(self, directory='backups', keep_recent=BACKUP_KEEP_RECENT,
+                 compact_after_days=BACKUP_COMPACT_AFTER_DAYS, max_age_days=BACKUP_MAX_AGE_DAYS):
+        self.directory = directory
+        self.keep_recent = keep_recent
+        self.compact_after_days = compact_after_days
+        self.max_age_days = max_age_days
+
+    def _dir(self, data_type):
+        return os.path.join(self.directory, dataset_slug(data_type))
+
+    def backup(self, data_type, paths, now=None):
+        """Archive the given files of a dataset and return the archive path"""
+        os.makedirs(self._dir(data_type), exist_ok=True)
+        stamp = (now or datetime.now()).strftime(_TIMESTAMP_FORMAT)
+        path = os.path.join(self._dir(data_type), f'{dataset_slug(data_type)}-{stamp}.zip')
+        with zipfile.ZipFile(path + '.tmp', 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+            for source in paths:
+                name = os.path.relpath(source)
+                if name.startswith('..'):
+                    name = os.path.basename(source)
+                with open(source, 'rb') as src, archive.open(name, 'w') as dst:
+                    shutil.copyfileobj(src, dst, COPY_BUFFER_BYTES)
+        os.replace(path + '.tmp', path)
+        return path
+
+    def list_backups(self, data_type):
+        """Archives of a dataset, newest first, as (file name, time of the newest backup, size in bytes)"""
+        if not os.path.isdir(self._dir(data_type)):
+            return []
+        entries = []
+        for name in os.listdir(self._dir(data_type)):
+            when = self._backup_time(name)
+            if when is not None:
+                entries.append((name, when, os.path.getsize(os.path.join(self._dir(data_type), name))))
+        return sorted(entries, key=lambda entry: entry[1], reverse=True)
+
+    @staticmethod
+    def _backup_time(name):
+        """When the newest backup in an archive was taken, from its file name"""
+        snapshot, monthly = _SNAPSHOT.match(name), _MONTHLY.match(name)
+        if snapshot:
+            return datetime.strptime(snapshot['stamp'], _TIMESTAMP_FORMAT)
+        if monthly:
+            start = datetime.strptime(monthly['month'], '%Y%m')
+            return (start + timedelta(days=32)).replace(day=1) - timedelta(microseconds=1)
+        return None
+
+    def _due(self, data_type, now):
+        """Snapshots to fold into monthly archives and archives past the maximum age"""
+        backups = self.list_backups(data_type)
+        snapshots = [(name, when) for name, when, _ in backups if _SNAPSHOT.match(name)]
+        fold = [(name, when) for position, (name, when) in enumerate(snapshots)
+                if position >= self.keep_recent or now - when > timedelta(days=self.compact_after_days)]
+        expired = [name for name, when, _ in backups if now - when > timedelta(days=self.max_age_days)]
+        return fold, expired
+
+    def compact(self, data_type, now=None):
+        """Apply the retention policy to a dataset's archives"""
+        now = now or datetime.now()
+        with _COMPACTION_LOCK:
+            fold, expired = self._due(data_type, now)
+            months = {}
+            for name, when in fold:
+                if name not in expired:
+                    months.setdefault(when.strftime('%Y%m'), []).append((name, when))
+            for month, snapshots in months.items():
+                self._fold(data_type, month, snapshots)
+            for name, when, _ in self.list_backups(data_type):
+                if now - when > timedelta(days=self.max_age_days):
+                    os.remove(os.path.join(self._dir(data_type), name))
+
+    def _fold(self, data_type, month, snapshots):
+        """Move snapshots' files into their month's archive, under each snapshot's time stamp"""
+        target = os.path.join(self._dir(data_type), f"{dataset_slug(data_type)}-{month}.compact.zip")
+        with zipfile.ZipFile(target + '.tmp', 'w', compression=zipfile.ZIP_LZMA) as monthly:
+            sources = [(target, None)] if os.path.exists(target) else []
+            sources += [(os.path.join(self._dir(data_type), name), when.strftime(_TIMESTAMP_FORMAT)) for name, when in snapshots]
+            for path, prefix in sources:
+                with zipfile.ZipFile(path) as archive:
+                    for entry in archive.infolist():
+                        name = f"{prefix}/{entry.filename}" if prefix else entry.filename
+                        with archive.open(entry) as src, monthly.open(name, 'w') as dst:
+                            shutil.copyfileobj(src, dst, COPY_BUFFER_BYTES)
+        os.replace(target + '.tmp', target)
+        for name, _ in snapshots:
+            os.remove(os.path.join(self._dir(data_type), name))
+
+    def compact_in_background(self, data_type):
+        """Compact a dataset's archives on a background thread if the policy has work to do.
+
+        The thread is not a daemon, so the interpreter waits for a compaction
+        in progress before exiting. Returns the thread, or None when nothing
+        is due.
+        """
+        if not any(self._due(data_type, datetime.now())):
+            return None
+        thread = threading.Thread(target=self.compact, args=(data_type,))
+        thread.start()
+        return thread
@@ -0,0 +1,139 @@
+import os
+
+import pandas as pd
+
+# Parser used for CSV files: 'pyarrow' (multithreaded, falls back to 'c' when
+# it cannot handle a file) or 'c' to always use pandas' own parser
+CSV_ENGINE = os.environ.get('AI_DASHBOARD_CSV_ENGINE', 'pyarrow')
+
+# read_csv options the pyarrow engine does not support
+_ARROW_UNSUPPORTED = {'nrows', 'chunksize', 'iterator', 'skipfooter', 'low_memory', 'on_bad_lines'}
+
+# Columns of each template, in order, with their types. This is the one definition
+# of the templates: downloads, upload checks, validation rules and profiles use its
+# columns, and the parser is given its types so it does not have to infer them
+TEMPLATE_DTYPES = {
+    'AI Tutor': {
+        'Campus (SG/MUM/SYD/DXB)': 'str',
+        'Course(GCGM/MGM/GMBA)': 'str',
+        'Cohort': 'str',
+        'Unit_Name': 'str',
+        'Batch_size(number should come from student feedback form)': 'int64',
+        'Faculty Name': 'str',
+        'Faculty_Email_ID': 'str',
+        'Unit_Commencement_date': 'str',
+        'Unit_End_Date': 'str',
+        'No_of_Session_IDs_created': 'int64',
+        'Total_Students_Participated_watched videos': 'int64',
+        'Total_Students_Attempted_AI Tutor Platform Quiz': 'int64',
+        'Average Score of AI Tutor Platform Quiz': 'float64',
+        'No_of_students_who_filled_student feedback form': 'int64',
+        'Faculty_Rating_provide by students': 'float64',
+        'AI_Tutor_quality_score': 'float64',
+        'AI_Tutor_impact_score': 'float64',
+        'Avg_Rating_for_AI_Tutor_Tool': 'float64',
+        'Faculty_Implemented_AI_Tutor_efficiently(Yes/No)': 'str',
+        'No. of Quizzes_conducted': 'int64',
+        'AI_Quizzes_used_for_grading': 'str',
+        'Average_ Quiz_Score': 'float64',
+        'Faculty_Feedback': 'str',
+    },
+    'AI Mentor': {
+        'Academic_Manager_Name': 'str',
+        'Course': 'str',
+        'Cohort': 'str',
+        'Term': 'str',
+        'Project Type (ARP, IBR 1, IBR 2, Industry Project)': 'str',
+        'Total Number of students/teams  mentoring/mentored': 'int64',
+        "Q1_Are Students_motivated to use AI Mentor? (Yes/No, as they don't find it useful)": 'str',
+        'Q2_Are students using AI Mentor effectively ? (Yes/No)': 'str',
+        'Q3_Have you mandated students to meet you only after obtaining suggestions from AI Mentor? (Yes/No)': 'str',
+        "Q4_Improvement_observed in student's logical thinking, Presentation & Report Structure with the use of AI Mentor (Yes/No)": 'str',
+        'Approx. percentage of students under your guidance who levelled up using AI Mentor.': 'int64',
+    },
+    'AI Impact': {
+        'Student Name': 'str',
+        'Student _mail id': 'str',
+        'Course': 'str',
+        'Cohort': 'str',
+        'Placed/Not Placed': 'str',
+        'CGPA': 'float64',
+        'AI Tutor Usage': 'str',
+        'AI Mentor Usage': 'str',
+        'JPT Usage': 'str',
+        'Yoodli Usage': 'str',
+    },
+    'AI TKT': {
+        'Unit': 'str',
+        'Course': 'str',
+        'Average Grades Before AI for TKT': 'float64',
+        'Avergae Grades After AI for TKT': 'float64',
+        'Improvement%': 'float64',
+    },
+    'Unit Performance': {
+        'Course': 'str',
+        'Cohort': 'str',
+        'Year': 'int64',
+        'Unit_Name': 'str',
+        'AI Tutor (Before/After)': 'str',
+        'Total_Avg_score': 'float64',
+    },
+    'CR (Corporate Relations)': {
+        'Course': 'str',
+        'Cohort': 'str',
+        'Year': 'int64',
+        'Industry_Sector': 'str',
+        'Company Name': 'str',
+        'Company_Tier': 'str',
+        'Job_role': 'str',
+        'Location': 'str',
+        'No. of Vacancies_Offered': 'int64',
+        'Date of first interview(mm/dd/yyyy)': 'str',
+        'No. of Students_Eligible': 'int64',
+        'No. of students applied': 'int64',
+        'No. of Students_Interviewed': 'int64',
+        'Students_Selected': 'int64',
+        'Avg_CTC(in USD)': 'float64',
+        'Highest_CTC(in USD)': 'float64',
+        'Students used JPT(Yes/No)': 'str',
+    },
+    'PRP (Placement Readiness Program)': {
+        'Student Roll No.': 'str',
+        'Student Name': 'str',
+        'Email id': 'str',
+        'Course': 'str',
+        'Cohort': 'str',
+        'Year': 'int64',
+        'Term-1': 'float64',
+        'Term-2': 'float64',
+        'Term-3': 'float64',
+        'No. of JPT Mock Interviews attempted and scored equal or above 80%': 'int64',
+        'Area Head Mock Interview Score': 'float64',
+        'No. of Allocated Interview Attempts': 'int64',
+        'Categorise student overall (Outstanding, Good, Average, Needs Handholding)': 'str',
+        'Placed/Not Placed': 'str',
+        'If placed, no. of interview attempts required for placement': 'int64',
+    },
+}
+
+
+def read_csv(source, data_type=None, usecols=None, **kwargs):
+    """Parse a CSV file or upload, using the template's column types when known.
+
+    The pyarrow engine is tried first. If it is unavailable, does not support
+    the options, or rejects the data (e.g. a blank cell in an integer column),
+    the file is parsed again by pandas' C engine with inferred types.
+    """
+    dtypes = TEMPLATE_DTYPES.get(data_type)
+    if dtypes and usecols is not None:
+        dtypes = {column: dtype for column, dtype in dtypes.items() if column in usecols}
+
+    if CSV_ENGINE == 'pyarrow' and not callable(usecols) and not _ARROW_UNSUPPORTED & set(kwargs):
+        position = source.tell() if hasattr(source, 'tell') else None
+        try:
+            return pd.read_csv(source, engine='pyarrow', dtype=dtypes, usecols=usecols, **kwargs)
+        except Exception:
+            if position is not None:
+                source.seek(position)
+
+    return pd.read_csv(source, usecols=usecols, **kwargs)
@@ -1,22 +1,105 @@
 import pandas as pd
 import os
-import logging
-from datetime import datetime
+import hashlib
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
 import streamlit as st
 import zipfile
 from io import BytesIO
+from audit_log import AuditLog, SessionLog
+from backups import BackupManager
+from csv_reader import TEMPLATE_DTYPES
+from data_profiler import cached_profile
+from dimensions import StarSchema, parse_dates
+from history import DatasetHistory
+from record_keys import NATURAL_KEYS, RecordIndex, diff_rows, key_hashes
+from storage import CSVStore, PartitionedCSVStore, SQLiteStore, project_columns
+from validation_rules import ERROR, check_values, render_violations
+
+# Seconds a parallel load waits before giving up on files still being read
+LOAD_TIMEOUT_SECONDS = 30
+
+
+def load_in_parallel(loaders, timeout=LOAD_TIMEOUT_SECONDS, max_workers=None):
+    """Run named loader callables on a thread pool.
+
+    Returns ({name: result}, {name: timing report}). A loader that raises or
+    is still running after `timeout` seconds is reported instead of returned,
+    so one slow or corrupt file does not hold back the others.
+    """
+    def timed(loader):
+        start = time.perf_counter()
+        result = loader()
+        return result, time.perf_counter() - start
+
+    started = time.perf_counter()
+    executor = ThreadPoolExecutor(max_workers=max_workers or max(len(loaders), 1))
+    futures = {name: executor.submit(timed, loader) for name, loader in loaders.items()}
+    wait(futures.values(), timeout=timeout)
+    executor.shutdown(wait=False, cancel_futures=True)
+
+    results, report = {}, {}
+    for name, future in futures.items():
+        if not future.done():
+            report[name] = {'status': 'timeout', 'seconds': time.perf_counter() - started, 'error': f'still loading after {timeout}s'}
+        elif future.exception() is not None:
+            report[name] = {'status': 'error', 'seconds': None, 'error': str(future.exception())}
+        else:
+            results[name], seconds = future.result()
+            report[name] = {'status': 'ok', 'seconds': seconds, 'error': None}
+    return results, report
+
+
+def render_load_report(report, container=st):
+    """Warn about files that failed to load and show per-file load timings"""
+    for data_type, entry in report.items():
+        if entry['status'] != 'ok':
+            container.warning(f"⚠️ {data_type} data could not be loaded: {entry['error']}")
+    if report:
+        timings = pd.DataFrame([
+            {'Data Type': data_type, 'Status': entry['status'], 'Rows': entry.get('rows'),
+             'Seconds': None if entry['seconds'] is None else round(entry['seconds'], 3)}
+            for data_type, entry in report.items()
+        ])
+        with container.expander("⏱️ Data load timings"):
+            st.dataframe(timings, hide_index=True)
+
+
+def _etag(data):
+    """Strong HTTP ETag of some bytes"""
+    return f'"{hashlib.sha256(data).hexdigest()[:32]}"'
+
+
+@st.cache_data(show_spinner=False)
+def template_csv(columns):
+    """Empty template CSV for a column list and its ETag, built once per schema"""
+    csv_buffer = BytesIO()
+    pd.DataFrame(columns=list(columns)).to_csv(csv_buffer, index=False)
+    return csv_buffer.getvalue(), _etag(csv_buffer.getvalue())
+
+
+@st.cache_data(show_spinner=False)
+def templates_zip(schemas):
+    """Zip of the templates given as (file name, columns) pairs, and its ETag.
+
+    Entries get a fixed time stamp and permissions, so the same schemas
+    always give the same bytes and ETag.
+    """
+    zip_buffer = BytesIO()
+    with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
+        for filename, columns in schemas:
+            entry = zipfile.ZipInfo(filename, date_time=(1980, 1, 1, 0, 0, 0))
+            entry.compress_type = zipfile.ZIP_DEFLATED
+            entry.external_attr = 0o644 << 16
+            zip_file.writestr(entry, template_csv(columns)[0])
+    return zip_buffer.getvalue(), _etag(zip_buffer.getvalue())
 
-# Configure logging
-logging.basicConfig(
-    filename='data_operations.log',
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
 
 class DataManager:
     """Enhanced class to handle data upload, download, merge, and delete operations for all AI initiatives"""
     
-    def __init__(self):
+    def __init__(self, storage=None):
         # Updated data files mapping
         self.data_files = {
             'AI Tutor': 'ai_tutor template updated.csv',
@@ -28,75 +111,76 @@ class DataManager:
             'PRP (Placement Readiness Program)': 'PRP_template - updated.csv'
         }
         
-        # Enhanced templates with all new columns (will be updated after conversion)
+        # Templates offered for download and checked on upload; their columns come from the
+        # template schema the CSV parser, profiler and validation rules also use
         self.templates = {
             'AI Tutor': {
                 'filename': 'ai_tutor_template_updated.csv',
                 'description': 'Enhanced AI Tutor with additional tracking columns',
-                'columns': []  # Will be populated after conversion
+                'columns': list(TEMPLATE_DTYPES['AI Tutor'])
             },
             'AI Mentor': {
                 'filename': 'ai_mentor_template_updated.csv',
                 'description': 'AI Mentor feedback and effectiveness tracking',
-                'columns': []  # Will be populated after conversion
+                'columns': list(TEMPLATE_DTYPES['AI Mentor'])
             },
             'AI Impact': {
                 'filename': 'ai_impact_template_updated.csv',
                 'description': 'Overall AI initiatives impact on student outcomes',
-                'columns': []  # Will be populated after conversion
+                'columns': list(TEMPLATE_DTYPES['AI Impact'])
             },
             'AI TKT': {
                 'filename': 'ai_tkt_template_updated.csv',
                 'description': 'Technical Knowledge Test before/after analysis',
-                'columns': []  # Will be populated after conversion
+                'columns': list(TEMPLATE_DTYPES['AI TKT'])
             },
             'Unit Performance': {
                 'filename': 'unit_performance_template_updated.csv',
                 'description': 'Unit performance with AI tutor effectiveness tracking',
-                'columns': []  # Will be populated after conversion
+                'columns': list(TEMPLATE_DTYPES['Unit Performance'])
             },
             'CR (Corporate Relations)': {
                 'filename': 'cr_template_updated.csv',
                 'description': 'Corporate Relations and placement data',
-                'columns': []  # Will be populated after conversion
+                'columns': list(TEMPLATE_DTYPES['CR (Corporate Relations)'])
             },
             'PRP (Placement Readiness Program)': {
                 'filename': 'prp_template_updated.csv',
                 'description': 'Placement Readiness Program evaluation and JPT integration',
-                'columns': []  # Will be populated after conversion
+                'columns': list(TEMPLATE_DTYPES['PRP (Placement Readiness Program)'])
             }
         }
         
-        # Initialize column structures after conversion
-        self._initialize_column_structures()
-    
-    def _initialize_column_structures(self):
-        """Initialize column structures from converted CSV files"""
-        for data_type, filename in self.data_files.items():
-            if os.path.exists(filename):
-                try:
-                    df = pd.read_csv(filename)
-                    if data_type in self.templates:
-                        self.templates[data_type]['columns'] = list(df.columns)
-                except Exception as e:
-                    st.warning(f"Could not load columns for {data_type}: {e}")
+        # Storage backend: flat CSV files (default), an embedded SQLite database,
+        # or CSV partitions per Year (and Cohort) with a manifest
+        storage = storage or os.environ.get('AI_DASHBOARD_STORAGE', 'csv')
+        if storage == 'sqlite':
+            self.store = SQLiteStore(self.data_files)
+        elif storage == 'partitioned':
+            self.store = PartitionedCSVStore(self.data_files)
+        elif storage == 'partitioned_cohort':
+            self.store = PartitionedCSVStore(self.data_files, partition_columns=('Year', 'Cohort'))
+        else:
+            self.store = CSVStore(self.data_files)
+        
+        # Structured audit trail of data operations
+        self.audit = AuditLog()
+        
+        # Compressed backups taken before deletions
+        self.backups = BackupManager()
+        
+        # Results of merge/replace waiting for save_data, so a merge can be saved as an append
+        self._pending_changes = {}
     
     def log_operation(self, operation, data_type, user_info, details=""):
         """Log data operations for audit trail"""
-        log_message = f"Operation: {operation} | Data Type: {data_type} | User: {user_info} | Details: {details}"
-        logging.info(log_message)
+        record = self.audit.append(operation, data_type, user_info, details)
         
-        # Also create a session log for display
+        # Also keep the latest operations of the session for display
         if 'operation_logs' not in st.session_state:
-            st.session_state.operation_logs = []
+            st.session_state.operation_logs = SessionLog()
         
-        st.session_state.operation_logs.append({
-            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            'operation': operation,
-            'data_type': data_type,
-            'user': user_info,
-            'details': details
-        })
+        st.session_state.operation_logs.add(record)
     
     def create_template(self, data_type):
         """Create empty template for data type"""
@@ -105,31 +189,30 @@ class DataManager:
             return template_df
         return None
     
+    def _template_schemas(self):
+        """(file name, columns) of every template with a known structure"""
+        return tuple((info['filename'], tuple(info['columns'])) for info in self.templates.values() if info['columns'])
+    
     def download_template(self, data_type):
         """Generate downloadable template"""
-        template_df = self.create_template(data_type)
-        if template_df is not None:
-            csv_buffer = BytesIO()
-            template_df.to_csv(csv_buffer, index=False)
-            return csv_buffer.getvalue()
+        if data_type in self.templates and self.templates[data_type]['columns']:
+            return template_csv(tuple(self.templates[data_type]['columns']))[0]
         return None
     
     def download_all_templates(self):
         """Create a zip file with all templates"""
-        zip_buffer = BytesIO()
-        
-        with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-            for data_type, template_info in self.templates.items():
-                template_df = self.create_template(data_type)
-                if template_df is not None:
-                    csv_buffer = BytesIO()
-                    template_df.to_csv(csv_buffer, index=False)
-                    zip_file.writestr(template_info['filename'], csv_buffer.getvalue())
-        
-        return zip_buffer.getvalue()
+        return templates_zip(self._template_schemas())[0]
+    
+    def template_etag(self, data_type=None):
+        """ETag of a template's CSV, or of the zip of all templates when no data type is given"""
+        if data_type is None:
+            return templates_zip(self._template_schemas())[1]
+        if data_type in self.templates and self.templates[data_type]['columns']:
+            return template_csv(tuple(self.templates[data_type]['columns']))[1]
+        return None
     
     def validate_uploaded_data(self, uploaded_df, data_type):
-        """Validate uploaded data structure"""
+        """Validate uploaded data structure and values"""
         if data_type not in self.templates:
             return False, "Invalid data type"
         
@@ -148,19 +231,78 @@ class DataManager:
         if extra_columns:
             st.warning(f"Extra columns found (will be ignored): {', '.join(extra_columns)}")
         
-        return True, "Valid data structure"
+        # Value checks: errors block the upload, warnings are only shown
+        violations = check_values(uploaded_df, data_type)
+        render_violations(violations)
+        errors = [result for result in violations if result['severity'] == ERROR and result['count']]
+        if errors:
+            failed = ', '.join(f"{result['rule']} ({result['count']} rows)" for result in errors)
+            return False, f"Invalid values: {failed}"
+        
+        return True, "Valid data structure and values"
     
-    def load_existing_data(self, data_type):
-        """Load existing data file"""
-        filename = self.data_files.get(data_type)
-        if filename and os.path.exists(filename):
+    def load_existing_data(self, data_type, filters=None, columns=None):
+        """Load existing data, optionally only rows matching filters ({column: allowed values})"""
+        if data_type in self.data_files and self.store.exists(data_type):
             try:
-                return pd.read_csv(filename)
+                return self.store.load(data_type, filters=filters, columns=columns)
             except Exception as e:
                 st.error(f"Error loading existing data: {e}")
                 return pd.DataFrame()
         return pd.DataFrame()
     
+    def load_all_data(self, columns=None, filters=None, timeout=LOAD_TIMEOUT_SECONDS):
+        """Load data types concurrently, returning (data, per-file timing report).
+
+        `columns` maps data type to the columns to read (None for all columns);
+        by default every data type is loaded in full. Date columns are parsed
+        into datetimes as they are loaded. Data types whose files are missing,
+        corrupt or too slow come back as empty frames, with the reason in the
+        report.
+        """
+        columns = columns if columns is not None else dict.fromkeys(self.data_files)
+        loaders = {
+            data_type: (lambda data_type=data_type, cols=cols:
+                        parse_dates(self.store.load(data_type, filters=filters, columns=cols)))
+            for data_type, cols in columns.items()
+            if data_type in self.data_files and self.store.exists(data_type)
+        }
+        loaded, report = load_in_parallel(loaders, timeout=timeout)
+        data = {data_type: loaded.get(data_type, pd.DataFrame()) for data_type in columns}
+        for data_type, entry in report.items():
+            if entry['status'] == 'ok':
+                entry['rows'] = len(data[data_type])
+        return data, report
+    
+    def load_sections(self, section_columns, filters=None, timeout=LOAD_TIMEOUT_SECONDS):
+        """Load every data type the given sections read, with only the columns they need.
+
+        `section_columns` maps section name to {data_type: [columns]}. Each data
+        type is read once with the union of the columns its sections declare.
+        Returns (data, per-file timing report) like load_all_data.
+        """
+        required = {}
+        for data_types in section_columns.values():
+            for data_type, columns in data_types.items():
+                merged = required.setdefault(data_type, [])
+                for column in columns:
+                    if column not in merged:
+                        merged.append(column)
+        return self.load_all_data(required, filters=filters, timeout=timeout)
+    
+    def build_star_schema(self, data=None):
+        """Normalize datasets into integer-keyed fact tables with shared dimensions.
+
+        `data` defaults to every data type loaded through load_all_data.
+        """
+        if data is None:
+            data, _ = self.load_all_data()
+        schema = StarSchema()
+        for data_type, df in data.items():
+            if not df.empty:
+                schema.add(data_type, df)
+        return schema
+    
     def merge_data(self, existing_df, new_df, data_type, user_info):
         """Merge new data with existing data"""
         try:
@@ -168,28 +310,95 @@ class DataManager:
             expected_columns = self.templates[data_type]['columns']
             new_df_filtered = new_df[expected_columns]
             
+            # Rows not already stored, so saving the merge only has to insert them
+            # (hashed after concat so both sides share the same dtypes)
+            row_hashes = pd.util.hash_pandas_object(
+                pd.concat([existing_df, new_df_filtered], ignore_index=True)[expected_columns], index=False
+            ).to_numpy()
+            existing_hashes, new_hashes = row_hashes[:len(existing_df)], row_hashes[len(existing_df):]
+            is_new = ~pd.Series(new_hashes).isin(existing_hashes).to_numpy() & ~pd.Series(new_hashes).duplicated().to_numpy()
+            appended_df = new_df_filtered[is_new]
+            
+            # The result is exactly what the store holds once the new rows are inserted
             if existing_df.empty:
-                merged_df = new_df_filtered
+                merged_df = appended_df
             else:
-                merged_df = pd.concat([existing_df, new_df_filtered], ignore_index=True)
-            
-            # Remove duplicates if any
-            merged_df = merged_df.drop_duplicates()
+                merged_df = pd.concat([existing_df, appended_df], ignore_index=True)
+            self._pending_changes[data_type] = {'operation': 'MERGE', 'result': merged_df, 'appended': appended_df,
+                                                'user': user_info}
             
             self.log_operation("MERGE", data_type, user_info, 
-                             f"Added {len(new_df_filtered)} records, Total: {len(merged_df)}")
+                             f"Added {len(appended_df)} of {len(new_df_filtered)} records, Total: {len(merged_df)}")
             
             return merged_df, True, "Data merged successfully"
             
         except Exception as e:
             return existing_df, False, f"Error merging data: {e}"
     
+    def _record_index(self, data_type, existing_df):
+        """Saved key index of a dataset, rebuilt from `existing_df` if it is out of date"""
+        index = RecordIndex(data_type)
+        version = self.store.version(data_type) if self.store.exists(data_type) else ''
+        if not (index.load(version) and len(index.keys) == len(existing_df)):
+            index.rebuild(existing_df, self.templates[data_type]['columns'])
+            if version:
+                index.save(version)
+        return index
+    
+    def diff_upload(self, existing_df, new_df, data_type, sample_size=5):
+        """Counts and samples of new, unchanged, changed and dropped rows for an upload"""
+        expected_columns = self.templates[data_type]['columns']
+        index = self._record_index(data_type, existing_df)
+        return diff_rows(index, existing_df, new_df[expected_columns], expected_columns, sample_size)
+    
+    def upsert_data(self, existing_df, new_df, data_type, user_info):
+        """Update stored records whose natural key is uploaded again and insert the rest.
+
+        Uploaded rows whose key matches several stored records are skipped,
+        as there is no telling which of them they update.
+        """
+        if NATURAL_KEYS.get(data_type) is None:
+            return existing_df, False, f"{data_type} has no record key to upsert on; merge or replace instead"
+        try:
+            expected_columns = self.templates[data_type]['columns']
+            new_df_filtered = new_df[expected_columns]
+            
+            # When a key repeats within the upload, its last row wins
+            repeated = pd.Series(key_hashes(new_df_filtered, data_type)).duplicated(keep='last').to_numpy()
+            new_df_filtered = new_df_filtered[~repeated]
+            
+            index = self._record_index(data_type, existing_df)
+            status, keys, rows = index.classify(new_df_filtered, expected_columns)
+            ambiguous = (status == 'changed') & (index.matches(keys) > 1)
+            changed, inserted = (status == 'changed') & ~ambiguous, status == 'new'
+            upserted = changed | inserted
+            
+            keep = index.replace(keys[changed], keys[upserted], rows[upserted])
+            upserted_df = new_df_filtered[upserted]
+            result_df = pd.concat([existing_df[keep], upserted_df], ignore_index=True)
+            self._pending_changes[data_type] = {
+                'operation': 'UPSERT', 'result': result_df, 'upserted': upserted_df,
+                'replaced': existing_df[~keep], 'index': index, 'user': user_info
+            }
+            
+            summary = (f"Updated {changed.sum()} records, inserted {inserted.sum()}, "
+                       f"{(status == 'unchanged').sum()} unchanged")
+            if ambiguous.any():
+                summary += f", skipped {ambiguous.sum()} whose key matches several stored records"
+            self.log_operation("UPSERT", data_type, user_info, f"{summary}, Total: {len(result_df)}")
+            
+            return result_df, True, f"Data upserted successfully: {summary}"
+            
+        except Exception as e:
+            return existing_df, False, f"Error upserting data: {e}"
+    
     def replace_data(self, new_df, data_type, user_info):
         """Replace existing data with new data"""
         try:
             # Filter new data to only include expected columns
             expected_columns = self.templates[data_type]['columns']
             new_df_filtered = new_df[expected_columns]
+            self._pending_changes[data_type] = {'operation': 'REPLACE', 'result': new_df_filtered, 'user': user_info}
             
             self.log_operation("REPLACE", data_type, user_info, 
                              f"Replaced all data with {len(new_df_filtered)} new records")
@@ -200,11 +409,49 @@ class DataManager:
             return pd.DataFrame(), False, f"Error replacing data: {e}"
     
     def save_data(self, df, data_type):
-        """Save data to file"""
-        filename = self.data_files.get(data_type)
-        if filename:
+        """Save data to storage.
+
+        A merge result is saved by inserting only the new rows, and an upsert
+        by rewriting only the changed records where the backend allows it.
+        Every save is also recorded as a new version in the dataset history.
+        """
+        if data_type in self.data_files:
+            pending = self._pending_changes.pop(data_type, None)
             try:
-                df.to_csv(filename, index=False)
+                if pending and pending['result'] is df and self.store.exists(data_type):
+                    operation = pending['operation']
+                else:
+                    operation = None
+                history = self._history(data_type)
+                
+                # Partitioned storage regroups rows by partition, so only the
+                # other backends keep the row order the pending key index has
+                reordered = isinstance(self.store, PartitionedCSVStore)
+                if operation == 'MERGE':
+                    self.store.append(data_type, pending['appended'])
+                elif operation == 'UPSERT' and pending['replaced'].empty:
+                    self.store.append(data_type, pending['upserted'])
+                elif operation == 'UPSERT' and hasattr(self.store, 'upsert'):
+                    self.store.upsert(data_type, pending['upserted'], NATURAL_KEYS[data_type], pending['replaced'])
+                else:
+                    self.store.save(data_type, df)
+                    reordered = True
+                
+                if operation == 'UPSERT' and reordered:
+                    stored = self.store.load(data_type)
+                    index = RecordIndex(data_type).rebuild(stored, self.templates[data_type]['columns'])
+                    index.save(self.store.version(data_type))
+                elif operation == 'UPSERT':
+                    pending['index'].save(self.store.version(data_type))
+                
+                user_info = pending['user'] if pending else ''
+                if operation == 'MERGE':
+                    history.commit(operation, user_info, appended=pending['appended'])
+                elif operation == 'UPSERT':
+                    history.commit(operation, user_info, appended=pending['upserted'],
+                                   removed_keys=key_hashes(pending['replaced'], data_type))
+                else:
+                    history.commit(operation or 'SAVE', user_info, appended=df, replace=True)
                 return True, "Data saved successfully"
             except Exception as e:
                 return False, f"Error saving data: {e}"
@@ -214,15 +461,21 @@ class DataManager:
         """Delete all data for a specific type"""
         try:
             filename = self.data_files.get(data_type)
-            if filename and os.path.exists(filename):
-                # Create backup before deletion
-                backup_filename = f"{filename}.backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-                df = pd.read_csv(filename)
-                df.to_csv(backup_filename, index=False)
+            if filename and self.store.exists(data_type):
+                # Archive the stored files before deletion; old archives are compacted in the background.
+                # A dataset sharing its file with others (SQLite) is exported on its own first
+                if hasattr(self.store, 'export'):
+                    with tempfile.TemporaryDirectory() as directory:
+                        backup_filename = self.backups.backup(data_type, [self.store.export(data_type, directory)])
+                else:
+                    backup_filename = self.backups.backup(data_type, self.store.files(data_type))
+                self.backups.compact_in_background(data_type)
                 
                 # Create empty dataframe with correct structure
+                history = self._history(data_type)
                 empty_df = self.create_template(data_type)
-                empty_df.to_csv(filename, index=False)
+                self.store.save(data_type, empty_df)
+                history.commit("DELETE", user_info, replace=True)
                 
                 self.log_operation("DELETE", data_type, user_info, 
                                  f"All data deleted, backup created: {backup_filename}")
@@ -234,17 +487,36 @@ class DataManager:
         except Exception as e:
             return False, f"Error deleting data: {e}"
     
+    def _history(self, data_type):
+        """History of a dataset, started from the stored rows if it has no versions yet"""
+        history = DatasetHistory(data_type)
+        if history.latest() is None and self.store.exists(data_type):
+            history.commit('BASELINE', appended=self.store.load(data_type))
+        return history
+    
+    def list_versions(self, data_type):
+        """Saved versions of a dataset, oldest first"""
+        return DatasetHistory(data_type).versions()
+    
+    def load_version(self, data_type, version=None, as_of=None, filters=None, columns=None):
+        """A dataset as it was at a saved version or point in time (the latest by default)"""
+        history = DatasetHistory(data_type)
+        if history.latest() is None:
+            return self.load_existing_data(data_type, filters=filters, columns=columns)
+        df = history.read(version=version, as_of=as_of, filters=filters, columns=columns)
+        if df.empty and not len(df.columns):
+            df = project_columns(self.create_template(data_type), columns)
+        return df
+    
     def get_data_summary(self):
         """Get summary of all data files"""
         summary = {}
-        for data_type, filename in self.data_files.items():
-            if os.path.exists(filename):
+        for data_type in self.data_files:
+            if self.store.exists(data_type):
                 try:
-                    df = pd.read_csv(filename)
                     summary[data_type] = {
-                        'records': len(df),
-                        'last_modified': datetime.fromtimestamp(os.path.getmtime(filename)).strftime('%Y-%m-%d %H:%M:%S'),
-                        'file_size': f"{os.path.getsize(filename) / 1024:.1f} KB",
+                        'records': self.store.count(data_type),
+                        **self.store.describe(data_type),
                         'description': self.templates[data_type]['description']
                     }
                 except Exception as e:
@@ -254,6 +526,12 @@ class DataManager:
         
         return summary
     
+    def get_data_profile(self, data_type):
+        """Column profile of a stored dataset, cached until the dataset changes"""
+        if data_type not in self.data_files or not self.store.exists(data_type):
+            return None
+        return cached_profile(self.store, data_type)
+    
     def get_template_info(self, data_type):
         """Get detailed template information"""
         if data_type in self.templates:
@@ -0,0 +1,142 @@
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+from csv_reader import TEMPLATE_DTYPES
+from dimensions import DATE_FORMATS
+from storage import dataset_slug
+
+PROFILE_QUANTILES = (0.25, 0.5, 0.75)
+
+# Most frequent values kept for each text column
+FREQUENT_VALUES = 5
+
+
+def _scalar(value):
+    """A statistic as a JSON value"""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    if isinstance(value, pd.Timestamp):
+        return value.strftime('%Y-%m-%d')
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _profile_column(values, expected):
+    """Statistics of one column, given the template type it should hold ('str' if unknown)"""
+    present = values.notna()
+    entry = {
+        'column': values.name,
+        'type': expected,
+        'nulls': int((~present).sum()),
+        'distinct': int(values.nunique()),
+        'min': None,
+        'max': None,
+        'quantiles': None,
+        'type_violations': 0,
+        'frequent': None,
+    }
+
+    if values.name in DATE_FORMATS:
+        entry['type'] = 'date'
+        parsed = values if pd.api.types.is_datetime64_any_dtype(values) else \
+            pd.to_datetime(values, format=DATE_FORMATS[values.name], errors='coerce')
+    elif expected != 'str' or pd.api.types.is_numeric_dtype(values):
+        parsed = pd.to_numeric(values, errors='coerce')
+    else:
+        counts = values.value_counts().head(FREQUENT_VALUES)
+        entry['frequent'] = {str(value): int(count) for value, count in counts.items()}
+        return entry
+
+    entry['type_violations'] = int((present & parsed.isna()).sum())
+    known = parsed.dropna()
+    if len(known):
+        entry['min'], entry['max'] = _scalar(known.min()), _scalar(known.max())
+        if entry['type'] != 'date':
+            quantiles = np.quantile(known.to_numpy(dtype=float), PROFILE_QUANTILES)
+            entry['quantiles'] = [round(float(value), 4) for value in quantiles]
+    return entry
+
+
+def profile_frame(df, data_type=None):
+    """Profile of every column of a dataset: null and distinct counts, min/max,
+    quartiles of numeric columns, values that are not of the template's type,
+    and the most frequent values of text columns"""
+    expected = TEMPLATE_DTYPES.get(data_type, {})
+    return {
+        'data_type': data_type,
+        'rows': len(df),
+        'columns': [_profile_column(df[column], expected.get(column, 'str')) for column in df.columns],
+    }
+
+
+def profile_table(profile):
+    """A profile as one row per column, for display"""
+    rows = []
+    for entry in profile['columns']:
+        quantiles = entry['quantiles'] or [None] * len(PROFILE_QUANTILES)
+        frequent = entry['frequent'] or {}
+        rows.append({
+            'Column': entry['column'],
+            'Type': entry['type'],
+            'Nulls': entry['nulls'],
+            'Distinct': entry['distinct'],
+            'Min': None if entry['min'] is None else str(entry['min']),
+            'Q1': quantiles[0],
+            'Median': quantiles[1],
+            'Q3': quantiles[2],
+            'Max': None if entry['max'] is None else str(entry['max']),
+            'Type Violations': entry['type_violations'],
+            'Most Frequent': ', '.join(f"{value} ({count})" for value, count in frequent.items()),
+        })
+    return pd.DataFrame(rows)
+
+
+def cached_profile(store, data_type, directory='data_profiles'):
+    """Profile of a stored dataset, recomputed only when the dataset version changes.
+
+    The profile is saved as JSON with the version it was computed for, so
+    later calls (and other processes) read it back without loading the data.
+    """
+    path = os.path.join(directory, f'{dataset_slug(data_type)}.json')
+    version = store.version(data_type)
+    if os.path.exists(path):
+        with open(path) as f:
+            saved = json.load(f)
+        if saved.get('version') == version:
+            return saved['profile']
+
+    profile = profile_frame(store.load(data_type), data_type)
+    os.makedirs(directory, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump({'version': version, 'profile': profile}, f)
+    return profile
+
+
+def print_profile(profile):
+    """Print a profile as a text report"""
+    print(f"📊 {profile['data_type']}: {profile['rows']:,} records, {len(profile['columns'])} columns")
+    table = profile_table(profile)
+    issues = table[(table['Nulls'] > 0) | (table['Type Violations'] > 0)]
+    if issues.empty:
+        print("   ✅ No missing values or type violations")
+    else:
+        for _, row in issues.iterrows():
+            print(f"   ⚠️  {row['Column']}: {row['Nulls']} missing, {row['Type Violations']} type violations")
+    with pd.option_context('display.max_columns', None, 'display.width', 200, 'display.max_colwidth', 40):
+        print(table.to_string(index=False))
+    print()
+
+
+if __name__ == "__main__":
+    # Usage: python data_profiler.py [data type ...] (all stored datasets by default)
+    from data_manager import DataManager
+
+    manager = DataManager()
+    for data_type in sys.argv[1:] or list(manager.data_files):
+        if manager.store.exists(data_type):
+            print_profile(manager.get_data_profile(data_type))
+        else:
+            print(f"❌ {data_type}: not stored")
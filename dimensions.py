@@ -0,0 +1,227 @@
+import calendar
+import re
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+# Date columns of the templates and the format each is stored in
+DATE_FORMATS = {
+    'Unit_Commencement_date': '%d-%b-%Y',
+    'Unit_End_Date': '%d-%b-%Y',
+    'Date of first interview(mm/dd/yyyy)': '%m/%d/%Y',
+}
+
+MONTH_NAMES = list(calendar.month_name)[1:]
+
+# Academic years run from July to June and are split into four terms of three months
+ACADEMIC_YEAR_START_MONTH = 7
+
+# Cohorts are named by intake month and two-digit year, e.g. 'Jan-22'
+COHORT_PATTERN = re.compile(r'^\s*([A-Za-z]{3})[A-Za-z]*-(\d{2})\s*$')
+_MONTH_NUMBERS = {name.lower(): number for number, name in enumerate(calendar.month_abbr) if name}
+
+
+def _term(month):
+    return (month - ACADEMIC_YEAR_START_MONTH) % 12 // 3 + 1
+
+
+def _academic_year(year, month):
+    start = year - (month < ACADEMIC_YEAR_START_MONTH)
+    return f"{start}-{(start + 1) % 100:02d}"
+
+
+def parse_dates(df):
+    """Copy of a frame with its known date columns converted to datetimes (NaT if unparseable)"""
+    columns = [column for column in DATE_FORMATS if column in df.columns]
+    if not columns:
+        return df
+    df = df.copy()
+    for column in columns:
+        if not pd.api.types.is_datetime64_any_dtype(df[column]):
+            df[column] = pd.to_datetime(df[column], format=DATE_FORMATS[column], errors='coerce')
+    return df
+
+
+@st.cache_data(show_spinner=False)
+def calendar_dimension(start, end):
+    """One row per day from start to end with its calendar and academic attributes"""
+    days = pd.date_range(pd.Timestamp(start).normalize(), pd.Timestamp(end).normalize(), freq='D')
+    year = days.year.to_numpy()
+    month = days.month.to_numpy()
+    return pd.DataFrame({
+        'date': days,
+        'year': year,
+        'month': month,
+        'month_name': np.array(MONTH_NAMES, dtype=object)[month - 1],
+        'term': _term(month),
+        'academic_year': [_academic_year(y, m) for y, m in zip(year, month)],
+    })
+
+
+def attach_calendar(df, column, fields):
+    """Copy of a frame with calendar attributes of a date column added.
+
+    `fields` maps calendar field (year, month, month_name, term, academic_year)
+    to the name of the column to add. Rows are matched to the calendar by
+    integer day offset; where the date is missing, integer fields are -1 and
+    text fields are empty.
+    """
+    dates = pd.to_datetime(df[column], errors='coerce')
+    df = df.copy()
+    present = dates.notna().to_numpy()
+    if not present.any():
+        for field, name in fields.items():
+            df[name] = None if field in ('month_name', 'academic_year') else -1
+        return df
+
+    start, end = dates.min(), dates.max()
+    days = calendar_dimension(start, end)
+    offsets = np.zeros(len(df), dtype=np.int64)
+    offsets[present] = (dates[present].dt.normalize() - start.normalize()).dt.days.to_numpy()
+    for field, name in fields.items():
+        values = days[field].to_numpy()[offsets]
+        if values.dtype == object:
+            values = np.where(present, values, None)
+        else:
+            values = np.where(present, values, -1)
+        df[name] = values
+    return df
+
+
+@st.cache_data(show_spinner=False)
+def cohort_dimension(cohorts):
+    """One row per distinct cohort name, in chronological order.
+
+    Columns: cohort, year, intake_month, intake_month_name, ordinal (1 for the
+    earliest cohort), term and academic_year of the intake. Names that do not
+    look like 'Jan-22' get year, month and ordinal -1 and sort last.
+    """
+    rows = []
+    for cohort in dict.fromkeys(cohorts):
+        match = COHORT_PATTERN.match(str(cohort))
+        month = _MONTH_NUMBERS.get(match.group(1).lower(), -1) if match else -1
+        year = 2000 + int(match.group(2)) if match and month > 0 else -1
+        rows.append({
+            'cohort': cohort,
+            'year': year,
+            'intake_month': month,
+            'intake_month_name': MONTH_NAMES[month - 1] if month > 0 else None,
+            'term': _term(month) if month > 0 else -1,
+            'academic_year': _academic_year(year, month) if month > 0 else None,
+        })
+
+    dimension = pd.DataFrame(rows, columns=['cohort', 'year', 'intake_month', 'intake_month_name',
+                                            'term', 'academic_year'])
+    valid = dimension['year'] > 0
+    dimension['_sort'] = np.where(valid, dimension['year'] * 100 + dimension['intake_month'], np.iinfo(np.int64).max)
+    dimension = dimension.sort_values(['_sort', 'cohort'], kind='stable').drop(columns='_sort').reset_index(drop=True)
+    dimension.insert(4, 'ordinal', np.where(dimension['year'] > 0, np.arange(1, len(dimension) + 1), -1))
+    return dimension
+
+
+def cohort_order(values):
+    """Distinct cohorts of a column, oldest first"""
+    return cohort_dimension(tuple(pd.Series(values).dropna().unique()))['cohort'].tolist()
+
+
+def attach_cohort(df, fields, column='Cohort'):
+    """Copy of a frame with cohort attributes added.
+
+    `fields` maps cohort dimension field to the name of the column to add.
+    The dimension is built from the distinct cohorts only, and rows pick
+    their attributes up through categorical codes; rows without a cohort get
+    -1 for integer fields and an empty text field.
+    """
+    values = df[column]
+    dimension = cohort_dimension(tuple(values.dropna().unique()))
+    codes = pd.Categorical(values, categories=dimension['cohort']).codes
+    present = codes >= 0
+
+    df = df.copy()
+    for field, name in fields.items():
+        attribute = dimension[field].to_numpy()[np.where(present, codes, 0)] if len(dimension) else np.full(len(df), -1)
+        df[name] = np.where(present, attribute, None if attribute.dtype == object else -1)
+    return df
+
+
+# Columns holding each shared dimension, under every spelling the templates use
+DIMENSION_COLUMNS = {
+    'course': ['Course', 'Course(GCGM/MGM/GMBA)'],
+    'campus': ['Campus (SG/MUM/SYD/DXB)'],
+    'faculty': ['Faculty Name'],
+    'unit': ['Unit_Name', 'Unit'],
+    'company': ['Company Name'],
+    'industry': ['Industry_Sector'],
+}
+
+
+class StarSchema:
+    """Datasets split into fact tables of integer keys and shared dimension tables.
+
+    Every dimension column of an added dataset is replaced by a `<dimension>_key`
+    column (-1 where missing) pointing into one dimension shared by all data
+    types, so the same course or unit has the same key in every fact table
+    whatever the column is called. A dataset holding several spellings of one
+    dimension gets a single key column, from the first non-missing of them.
+    Dimensions grow as datasets are added.
+    """
+
+    def __init__(self):
+        self.dimensions = {name: pd.Index([], dtype=object) for name in DIMENSION_COLUMNS}
+        self.facts = {}
+        self.key_columns = {}
+
+    def add(self, data_type, df):
+        """Normalize a dataset's rows into its fact table, appending to any rows already added"""
+        fact = df.copy()
+        key_columns = {}
+        for name, columns in DIMENSION_COLUMNS.items():
+            present = [column for column in columns if column in fact.columns]
+            if not present:
+                continue
+            labels = None
+            for column in present:
+                values = fact[column].astype(object).where(fact[column].notna())
+                values = values.where(values.isna(), values.astype(str).str.strip())
+                labels = values if labels is None else labels.combine_first(values)
+                key_columns[column] = name
+            index = self.dimensions[name]
+            unseen = pd.unique(labels[labels.notna() & ~labels.isin(index)])
+            if len(unseen):
+                index = self.dimensions[name] = index.append(pd.Index(unseen, dtype=object))
+            position = min(fact.columns.get_loc(column) for column in present)
+            fact = fact.drop(columns=present)
+            fact.insert(position, f'{name}_key', index.get_indexer(labels).astype(np.int32))
+
+        if data_type in self.facts:
+            fact = pd.concat([self.facts[data_type], fact], ignore_index=True)
+        self.facts[data_type] = fact
+        self.key_columns[data_type] = key_columns
+        return self
+
+    def dimension(self, name):
+        """Dimension table with its integer key and label"""
+        return pd.DataFrame({f'{name}_key': np.arange(len(self.dimensions[name]), dtype=np.int32),
+                             name: self.dimensions[name]})
+
+    def labels(self, name, keys):
+        """Labels of dimension keys (missing where the key is -1)"""
+        keys = np.asarray(keys)
+        labels = self.dimensions[name].to_numpy()[np.where(keys >= 0, keys, 0)] if len(self.dimensions[name]) else keys
+        return np.where(keys >= 0, labels, None)
+
+    def denormalize(self, data_type):
+        """A data type's rows with dimension keys turned back into their original columns.
+
+        Every spelling of a dimension the dataset held is restored, with the
+        same labels, where its key column is.
+        """
+        df = self.facts[data_type].copy()
+        for name in dict.fromkeys(self.key_columns[data_type].values()):
+            position = df.columns.get_loc(f'{name}_key')
+            labels = self.labels(name, df.pop(f'{name}_key'))
+            columns = [column for column, dimension in self.key_columns[data_type].items() if dimension == name]
+            for offset, column in enumerate(columns):
+                df.insert(position + offset, column, labels)
+        return df
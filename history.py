@@ -0,0 +1,124 @@
+import json
+import os
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from csv_reader import read_csv
+from record_keys import key_hashes
+from storage import apply_filters, dataset_slug, project_columns
+
+
+class DatasetHistory:
+    """Every saved state of a dataset, kept as append-only row groups.
+
+    Rows written by a save go into a new compressed row group that is never
+    modified afterwards. A manifest lists the versions of the dataset; each
+    version is a list of segments naming a row group and the positions of
+    the group's rows it no longer includes (rows replaced by an upsert).
+    Merges therefore store only the new rows, upserts the new rows plus a
+    few removed positions, and replaces or deletes start a new list of
+    segments, so past versions are read back without keeping full copies.
+    """
+
+    def __init__(self, data_type, root='data_history'):
+        self.data_type = data_type
+        self.directory = os.path.join(root, dataset_slug(data_type))
+        self.manifest_path = os.path.join(self.directory, 'manifest.json')
+
+    def _read_manifest(self):
+        if not os.path.exists(self.manifest_path):
+            return {'groups': {}, 'versions': []}
+        with open(self.manifest_path) as f:
+            return json.load(f)
+
+    def _write_manifest(self, manifest):
+        """Swap in a new manifest atomically so readers never see a partial one"""
+        with open(self.manifest_path + '.tmp', 'w') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(self.manifest_path + '.tmp', self.manifest_path)
+
+    def _group_path(self, group, suffix):
+        return os.path.join(self.directory, f'group-{int(group):05d}{suffix}')
+
+    def _write_group(self, manifest, df):
+        """Store rows as a new row group with the hashes of their natural keys"""
+        os.makedirs(self.directory, exist_ok=True)
+        group = str(max(map(int, manifest['groups']), default=0) + 1)
+        df.to_csv(self._group_path(group, '.csv.gz'), index=False)
+        np.save(self._group_path(group, '.keys.npy'), key_hashes(df, self.data_type))
+        manifest['groups'][group] = {'file': os.path.basename(self._group_path(group, '.csv.gz')), 'rows': len(df)}
+        return group
+
+    def versions(self):
+        """Version number, time, operation, user and row count of every saved version"""
+        return [{key: value for key, value in version.items() if key != 'segments'}
+                for version in self._read_manifest()['versions']]
+
+    def latest(self):
+        versions = self._read_manifest()['versions']
+        return versions[-1]['version'] if versions else None
+
+    def commit(self, operation, user_info='', appended=None, removed_keys=None, replace=False):
+        """Record a new version of the dataset.
+
+        With `replace` the version holds only the `appended` rows (none for a
+        delete); otherwise it is the previous version without the rows whose
+        natural key hash is in `removed_keys`, plus the `appended` rows.
+        """
+        manifest = self._read_manifest()
+        previous = manifest['versions'][-1]['segments'] if manifest['versions'] and not replace else []
+
+        segments = []
+        for segment in previous:
+            removed = segment['removed']
+            if removed_keys is not None and len(removed_keys):
+                keys = np.load(self._group_path(segment['group'], '.keys.npy'))
+                hit = np.flatnonzero(pd.Index(keys).isin(removed_keys))
+                removed = sorted(set(removed) | set(hit.tolist()))
+            if len(removed) < manifest['groups'][segment['group']]['rows']:
+                segments.append({'group': segment['group'], 'removed': removed})
+        if appended is not None and len(appended):
+            segments.append({'group': self._write_group(manifest, appended), 'removed': []})
+
+        version = (manifest['versions'][-1]['version'] + 1) if manifest['versions'] else 1
+        manifest['versions'].append({
+            'version': version,
+            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'operation': operation,
+            'user': user_info,
+            'rows': sum(manifest['groups'][segment['group']]['rows'] - len(segment['removed']) for segment in segments),
+            'segments': segments,
+        })
+        os.makedirs(self.directory, exist_ok=True)
+        self._write_manifest(manifest)
+        return version
+
+    def _resolve(self, manifest, version, as_of):
+        """The requested version entry: by number, the last one saved at or before `as_of`, or the latest"""
+        versions = manifest['versions']
+        if version is not None:
+            matches = [entry for entry in versions if entry['version'] == version]
+        elif as_of is not None:
+            as_of = pd.Timestamp(as_of)
+            matches = [entry for entry in versions if pd.Timestamp(entry['timestamp']) <= as_of][-1:]
+        else:
+            matches = versions[-1:]
+        if not matches:
+            raise KeyError(f"No version of {self.data_type} matches")
+        return matches[-1]
+
+    def read(self, version=None, as_of=None, filters=None, columns=None):
+        """Rows of a past version of the dataset (the latest by default)"""
+        manifest = self._read_manifest()
+        entry = self._resolve(manifest, version, as_of)
+        frames = []
+        for segment in entry['segments']:
+            group = read_csv(self._group_path(segment['group'], '.csv.gz'), self.data_type)
+            if segment['removed']:
+                group = group.drop(index=segment['removed'])
+            frames.append(project_columns(apply_filters(group, filters), columns))
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, ignore_index=True)
@@ -0,0 +1,53 @@
+# Rankings are recomputed from the loaded data on every rerun rather than kept
+# up to date as rows are merged in. Every list ranks an aggregate (a mean or a
+# year-on-year change per faculty, unit or manager) under the year filter in
+# use, so an appended row changes scores that are already ranked, and the
+# top-k of the old list plus the new rows is not the new top-k. Partial
+# selection over the cached frame is a single O(n) pass.
+
+def top_bottom(df, value_column, k=5, by=None):
+    """Top-k and bottom-k rows by a column using partial selection.
+
+    Both lists are in descending order, so the bottom-k reads like the tail
+    of a full descending sort, lowest last. With `by`, the selection is made
+    within each partition. Rows with a missing value are never ranked.
+    """
+    if by is None:
+        return df.nlargest(k, value_column), df.nsmallest(k, value_column).iloc[::-1]
+
+    # Select on row positions so duplicate index labels cannot multiply rows
+    by = [by] if isinstance(by, str) else list(by)
+    values = df[value_column].reset_index(drop=True)
+    grouped = values.groupby([df[column].to_numpy() for column in by], sort=False)
+    top_positions = grouped.nlargest(k).index.get_level_values(-1)
+    bottom_positions = grouped.nsmallest(k).index.get_level_values(-1)
+    return df.iloc[top_positions], df.iloc[bottom_positions[::-1]]
+
+
+def grouped_top_bottom(df, partition, keys, value_column, agg=None, k=5):
+    """Aggregate and rank every partition in one grouped pass.
+
+    Rows are aggregated over `partition` + `keys` with a single groupby
+    (`agg` defaults to the mean of `value_column`), ranked within each
+    partition, and returned as {partition value: (top, bottom)} in order of
+    first appearance.
+    """
+    agg = agg or {value_column: 'mean'}
+    scores = df.groupby([partition] + list(keys), sort=False).agg(agg).reset_index()
+    top, bottom = top_bottom(scores, value_column, k, by=partition)
+
+    top_by_partition = dict(tuple(top.groupby(partition, sort=False)))
+    bottom_by_partition = dict(tuple(bottom.groupby(partition, sort=False)))
+    empty = scores.iloc[0:0]
+    return {value: (top_by_partition.get(value, empty), bottom_by_partition.get(value, empty))
+            for value in scores[partition].unique()}
+
+
+def leaderboard_table(rows, columns):
+    """Display frame for a ranked list: a Rank column plus renamed columns.
+
+    `columns` maps source column to display label, in display order.
+    """
+    table = rows[list(columns)].rename(columns=columns)
+    table.insert(0, 'Rank', range(1, len(table) + 1))
+    return table.reset_index(drop=True)
@@ -0,0 +1,143 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from storage import dataset_slug
+
+# Columns identifying one record of each template, used to match uploaded rows
+# to stored ones when upserting. Templates whose descriptive columns repeat
+# across records (several AI Mentor projects of one manager and term, several
+# TKT and unit results per unit) have no key: their rows are identified by
+# their full contents and cannot be upserted.
+NATURAL_KEYS = {
+    'AI Tutor': ['Unit_Name', 'Cohort', 'Campus (SG/MUM/SYD/DXB)', 'Unit_Commencement_date'],
+    'AI Mentor': None,
+    'AI Impact': ['Student _mail id'],
+    'AI TKT': None,
+    'Unit Performance': None,
+    'CR (Corporate Relations)': ['Company Name', 'Job_role', 'Location', 'Date of first interview(mm/dd/yyyy)'],
+    'PRP (Placement Readiness Program)': ['Email id'],
+}
+
+# Column added to changed sample rows with the number of stored records under their key
+STORED_MATCHES = 'Stored records with key'
+
+# Version of the key and row hashing; saved indexes of another version are rebuilt
+HASH_SCHEME = 2
+
+
+def _normalized(values):
+    """Numbers as floats and text trimmed, so 2024 matches 2024.0 and ' MGB' matches 'MGB'"""
+    if pd.api.types.is_numeric_dtype(values):
+        return values.astype('float64')
+    if not pd.api.types.is_string_dtype(values) or values.dtype == object:
+        values = values.astype(str).where(values.notna())
+    return values.str.strip()
+
+
+def _hash_columns(df, columns):
+    """Row hashes over the given columns"""
+    if df.empty:
+        return np.array([], dtype=np.uint64)
+    normalized = pd.DataFrame({column: _normalized(df[column]) for column in columns})
+    return pd.util.hash_pandas_object(normalized, index=False, categorize=False).to_numpy()
+
+
+def _pair_hashes(keys, rows):
+    """One hash per (key, row) pair"""
+    return keys ^ (rows * np.uint64(0x9E3779B97F4A7C15))
+
+
+def key_hashes(df, data_type):
+    """Hash of each row's natural key, or of the whole row if the template has none"""
+    return _hash_columns(df, NATURAL_KEYS[data_type] or list(df.columns))
+
+
+def row_hashes(df, columns):
+    """Hash of each row's full contents"""
+    return _hash_columns(df, columns)
+
+
+class RecordIndex:
+    """Persistent key-hash -> row-hash index of a stored dataset.
+
+    The index lists, in stored row order, the hash of every row's natural key
+    and of its full contents, so uploaded rows can be classified as new,
+    changed or unchanged without rehashing the stored data. It is saved with
+    a signature of the stored dataset and the hash scheme, and rebuilt when
+    either no longer matches.
+    """
+
+    def __init__(self, data_type, directory='record_index'):
+        self.data_type = data_type
+        self.path = os.path.join(directory, f'{dataset_slug(data_type)}.npz')
+        self.keys = np.array([], dtype=np.uint64)
+        self.rows = np.array([], dtype=np.uint64)
+
+    def load(self, signature):
+        """Read the saved index if it was saved for the given dataset signature"""
+        if not os.path.exists(self.path):
+            return False
+        with np.load(self.path) as saved:
+            if 'scheme' not in saved or int(saved['scheme']) != HASH_SCHEME or str(saved['signature']) != signature:
+                return False
+            self.keys, self.rows = saved['keys'], saved['rows']
+        return True
+
+    def rebuild(self, df, columns):
+        """Index the stored rows from scratch"""
+        self.keys = key_hashes(df, self.data_type)
+        self.rows = row_hashes(df, columns)
+        return self
+
+    def save(self, signature):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        np.savez(self.path, keys=self.keys, rows=self.rows, signature=np.array(signature),
+                 scheme=np.array(HASH_SCHEME))
+
+    def classify(self, df, columns):
+        """'new', 'changed' or 'unchanged' for each row of `df`, with its key and row hashes"""
+        keys = key_hashes(df, self.data_type)
+        rows = row_hashes(df, columns)
+        known_key = pd.Index(keys).isin(self.keys)
+        known_row = pd.Index(_pair_hashes(keys, rows)).isin(_pair_hashes(self.keys, self.rows))
+        status = np.where(known_row, 'unchanged', np.where(known_key, 'changed', 'new'))
+        return status, keys, rows
+
+    def matches(self, keys):
+        """Number of stored rows under each of the given keys"""
+        counts = pd.Series(self.keys).value_counts()
+        return counts.reindex(keys, fill_value=0).to_numpy()
+
+    def replace(self, removed_keys, keys, rows):
+        """Drop every stored row under `removed_keys` and append the given rows"""
+        keep = ~pd.Index(self.keys).isin(removed_keys)
+        self.keys = np.concatenate([self.keys[keep], keys])
+        self.rows = np.concatenate([self.rows[keep], rows])
+        return keep
+
+
+def diff_rows(index, existing_df, new_df, columns, sample_size=5):
+    """Compare an upload with the stored rows described by `index`.
+
+    Returns counts and sample rows for uploaded rows that are new, unchanged
+    or changed (their key is stored with different values), and for stored
+    rows whose key is not in the upload (dropped if the upload replaced the
+    data). Changed samples show the uploaded version of the row and the
+    number of stored records under its key; `ambiguous` counts the changed
+    rows whose key matches more than one.
+    """
+    status, keys, _ = index.classify(new_df, columns)
+    dropped = ~pd.Index(index.keys).isin(keys)
+    changed = status == 'changed'
+    matches = index.matches(keys[changed])
+    groups = {
+        'new': new_df[status == 'new'],
+        'unchanged': new_df[status == 'unchanged'],
+        'changed': new_df[changed].assign(**{STORED_MATCHES: matches}),
+        'dropped': existing_df[dropped],
+    }
+    diff = {name: {'count': len(rows), 'sample': rows.head(sample_size)} for name, rows in groups.items()}
+    diff['changed']['ambiguous'] = int((matches > 1).sum())
+    return diff
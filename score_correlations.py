@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+
+class CorrelationStats:
+    """Sufficient statistics for a pairwise-complete Pearson correlation matrix.
+
+    For every pair of columns (i, j) the accumulator keeps the number of rows
+    where both are present, and over those rows the sum and sum of squares of
+    column i and the cross-product sum of i and j. The statistics are additive,
+    so appended rows are folded in without revisiting the existing data.
+    """
+
+    def __init__(self, columns):
+        self.columns = list(columns)
+        size = len(self.columns)
+        # Values are shifted by a per-column reference before accumulating so
+        # that the sums stay small and the final differences stay accurate
+        self.shift = None
+        self.n = np.zeros((size, size))
+        self.sum_x = np.zeros((size, size))
+        self.sum_xx = np.zeros((size, size))
+        self.sum_xy = np.zeros((size, size))
+
+    @classmethod
+    def from_frame(cls, df, columns=None):
+        """Build the statistics from the given columns of a DataFrame"""
+        stats = cls(columns if columns is not None else df.columns)
+        stats.update(df)
+        return stats
+
+    def update(self, df):
+        """Fold new rows into the statistics"""
+        values = df[self.columns].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=float)
+        if values.size == 0:
+            return self
+
+        present = np.isfinite(values)
+        if self.shift is None:
+            with np.errstate(invalid='ignore'):
+                shift = np.nanmean(np.where(present, values, np.nan), axis=0)
+            self.shift = np.nan_to_num(shift)
+
+        mask = present.astype(float)
+        centered = np.where(present, values - self.shift, 0.0)
+        self.n += mask.T @ mask
+        self.sum_x += centered.T @ mask
+        self.sum_xx += (centered ** 2).T @ mask
+        self.sum_xy += centered.T @ centered
+        return self
+
+    def merge(self, other):
+        """Combine with statistics accumulated over a disjoint set of rows"""
+        if other.columns != self.columns:
+            raise ValueError("Cannot merge correlation statistics over different columns")
+        if other.shift is None:
+            return self
+        if self.shift is None:
+            self.shift = other.shift.copy()
+
+        # Re-express the other accumulator relative to this one's shift
+        delta = other.shift - self.shift
+        sum_x = other.sum_x + delta[:, None] * other.n
+        self.sum_xx += other.sum_xx + 2 * delta[:, None] * other.sum_x + (delta ** 2)[:, None] * other.n
+        self.sum_xy += (other.sum_xy + delta[:, None] * other.sum_x.T + delta[None, :] * other.sum_x
+                        + np.outer(delta, delta) * other.n)
+        self.sum_x += sum_x
+        self.n += other.n
+        return self
+
+    def matrix(self, columns=None):
+        """Correlation matrix as a DataFrame, optionally restricted to some columns"""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            covariance = self.n * self.sum_xy - self.sum_x * self.sum_x.T
+            variance = self.n * self.sum_xx - self.sum_x ** 2
+            corr = covariance / np.sqrt(variance * variance.T)
+        corr[self.n < 2] = np.nan
+        corr = np.clip(corr, -1.0, 1.0)
+
+        result = pd.DataFrame(corr, index=self.columns, columns=self.columns)
+        if columns is not None:
+            result = result.loc[columns, columns]
+        return result
+
+    def pair(self, x, y):
+        """Correlation between two columns"""
+        return float(self.matrix([x, y]).iloc[0, 1])
+
+
+@st.cache_data(show_spinner=False)
+def correlation_stats(df):
+    """Correlation statistics over all columns of a frame, cached per filter state"""
+    return CorrelationStats.from_frame(df)
@@ -0,0 +1,190 @@
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+
+def _clean_values(values):
+    """Return the finite numeric values of a column as a float array"""
+    array = pd.to_numeric(pd.Series(values), errors='coerce').to_numpy(dtype=float)
+    return array[np.isfinite(array)]
+
+
+class Moments:
+    """Mergeable count, mean and central moment sums (M2, M3, M4) per column.
+
+    Partials built over disjoint row sets (e.g. one per Year/Course partition)
+    merge exactly with the pairwise update formulas, so the distribution of
+    any filter combination comes from a handful of precomputed partials.
+    """
+
+    def __init__(self, columns):
+        self.columns = list(columns)
+        size = len(self.columns)
+        self.count = np.zeros(size)
+        self.mean = np.zeros(size)
+        self.m2 = np.zeros(size)
+        self.m3 = np.zeros(size)
+        self.m4 = np.zeros(size)
+
+    @classmethod
+    def from_frame(cls, df, columns=None):
+        """Accumulate the moments of the given columns of a DataFrame"""
+        moments = cls(columns if columns is not None else df.columns)
+        values = df[moments.columns].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=float)
+        present = np.isfinite(values)
+
+        moments.count = present.sum(axis=0).astype(float)
+        filled = np.where(present, values, 0.0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            moments.mean = np.where(moments.count > 0, filled.sum(axis=0) / moments.count, 0.0)
+        deviations = np.where(present, values - moments.mean, 0.0)
+        moments.m2 = (deviations ** 2).sum(axis=0)
+        moments.m3 = (deviations ** 3).sum(axis=0)
+        moments.m4 = (deviations ** 4).sum(axis=0)
+        return moments
+
+    def merge(self, other):
+        """Return the moments of the union of two disjoint row sets"""
+        if other.columns != self.columns:
+            raise ValueError("Cannot merge moments over different columns")
+
+        n_a, n_b = self.count, other.count
+        n = n_a + n_b
+        with np.errstate(invalid='ignore', divide='ignore'):
+            delta = other.mean - self.mean
+            delta_n = np.where(n > 0, delta / n, 0.0)
+
+        merged = Moments(self.columns)
+        merged.count = n
+        merged.mean = self.mean + delta_n * n_b
+        merged.m2 = self.m2 + other.m2 + delta * delta_n * n_a * n_b
+        merged.m3 = (self.m3 + other.m3
+                     + delta * delta_n ** 2 * n_a * n_b * (n_a - n_b)
+                     + 3 * delta_n * (n_a * other.m2 - n_b * self.m2))
+        merged.m4 = (self.m4 + other.m4
+                     + delta * delta_n ** 3 * n_a * n_b * (n_a ** 2 - n_a * n_b + n_b ** 2)
+                     + 6 * delta_n ** 2 * (n_a ** 2 * other.m2 + n_b ** 2 * self.m2)
+                     + 4 * delta_n * (n_a * other.m3 - n_b * self.m3))
+        return merged
+
+    @property
+    def std(self):
+        """Sample standard deviation per column"""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(self.count > 1, np.sqrt(self.m2 / (self.count - 1)), np.nan)
+
+    @property
+    def skewness(self):
+        """Third central moment over the cubed sample standard deviation"""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(self.std > 0, (self.m3 / self.count) / self.std ** 3, 0.0)
+
+    @property
+    def kurtosis(self):
+        """Excess kurtosis per column"""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(self.m2 > 0, self.count * self.m4 / self.m2 ** 2 - 3, 0.0)
+
+    def summary(self):
+        """Count, mean, std, skewness and kurtosis per column as a DataFrame"""
+        return pd.DataFrame({
+            'count': self.count,
+            'mean': self.mean,
+            'std': self.std,
+            'skewness': self.skewness,
+            'kurtosis': self.kurtosis,
+        }, index=self.columns)
+
+
+@st.cache_data(show_spinner=False)
+def partition_moments(df, columns, by):
+    """Moments of each partition of a dataset, keyed by the tuple of `by` values"""
+    partials = {}
+    for key, group in df.groupby(by):
+        key = key if isinstance(key, tuple) else (key,)
+        partials[key] = Moments.from_frame(group, columns)
+    return partials
+
+
+def merge_partitions(partials, columns, by, filters=None):
+    """Merge the partials whose partition values pass the filters.
+
+    `filters` maps a partition column to the allowed values; columns left
+    out (or given as None) are not filtered.
+    """
+    filters = filters or {}
+    allowed = [set(filters[col]) if filters.get(col) is not None else None for col in by]
+
+    merged = Moments(columns)
+    for key, moments in partials.items():
+        if all(values is None or value in values for value, values in zip(key, allowed)):
+            merged = merged.merge(moments)
+    return merged
+
+
+@st.cache_data(show_spinner=False)
+def bin_scores(values, nbins=20, density=False, curve_points=100):
+    """Bin a score column with np.histogram and fit a normal curve to it.
+
+    The result only holds per-bin aggregates, so charts built from it never
+    ship the per-student values to the browser. Streamlit caches the result
+    per input column, i.e. once per dataset version and filter combination.
+    """
+    array = _clean_values(values)
+    binned = {
+        'count': int(array.size),
+        'edges': np.array([]),
+        'centers': np.array([]),
+        'widths': np.array([]),
+        'heights': np.array([]),
+        'mean': np.nan,
+        'std': np.nan,
+        'skewness': np.nan,
+        'curve_x': np.array([]),
+        'curve_y': np.array([]),
+    }
+    if array.size == 0:
+        return binned
+
+    counts, edges = np.histogram(array, bins=nbins)
+    widths = np.diff(edges)
+    heights = counts / (array.size * widths) if density else counts
+
+    moments = Moments.from_frame(pd.DataFrame({'value': array}))
+    mean = moments.mean[0]
+    std = moments.std[0] if array.size > 1 else 0.0
+    skewness = moments.skewness[0]
+
+    binned.update({
+        'edges': edges,
+        'centers': (edges[:-1] + edges[1:]) / 2,
+        'widths': widths,
+        'heights': heights,
+        'mean': float(mean),
+        'std': float(std),
+        'skewness': float(skewness),
+    })
+
+    if std > 0:
+        curve_x = np.linspace(edges[0], edges[-1], curve_points)
+        curve_y = np.exp(-0.5 * ((curve_x - mean) / std) ** 2) / (std * np.sqrt(2 * np.pi))
+        if not density:
+            # Scale the density to the histogram's count axis
+            curve_y = curve_y * array.size * widths.mean()
+        binned['curve_x'] = curve_x
+        binned['curve_y'] = curve_y
+
+    return binned
+
+
+def histogram_trace(binned, name, **kwargs):
+    """Plotly bar trace drawing pre-binned histogram counts"""
+    return go.Bar(x=binned['centers'], y=binned['heights'], width=binned['widths'],
+                  name=name, **kwargs)
+
+
+def normal_curve_trace(binned, name, **kwargs):
+    """Plotly line trace drawing the fitted normal curve of a binned column"""
+    return go.Scatter(x=binned['curve_x'], y=binned['curve_y'], mode='lines',
+                      name=name, **kwargs)
@@ -0,0 +1,120 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+# Upper bound on the number of values drawn per vectorized batch, which keeps
+# a batch of resamples around 16 MB regardless of group size
+MAX_BATCH_ELEMENTS = 2_000_000
+
+
+def _clean_values(values):
+    """Return the finite numeric values of a column as a float array"""
+    array = pd.to_numeric(pd.Series(values), errors='coerce').to_numpy(dtype=float)
+    return array[np.isfinite(array)]
+
+
+def _batches(n_resamples, row_length):
+    """Split the resamples into batches small enough to draw at once"""
+    batch_size = max(1, min(n_resamples, MAX_BATCH_ELEMENTS // max(row_length, 1)))
+    for start in range(0, n_resamples, batch_size):
+        yield start, min(batch_size, n_resamples - start)
+
+
+def _empty_result(n_a, n_b, confidence):
+    """Result returned when a group is too small to test"""
+    return {
+        'n_a': n_a,
+        'n_b': n_b,
+        'difference': np.nan,
+        'ci_low': np.nan,
+        'ci_high': np.nan,
+        'p_value': np.nan,
+        'significant': False,
+        'confidence': confidence,
+    }
+
+
+@st.cache_data(show_spinner=False)
+def compare_groups(group_a, group_b, n_resamples=5000, confidence=0.95, seed=42):
+    """Bootstrap CI and permutation test for the difference in means (B minus A).
+
+    Resamples are drawn as index matrices and reduced with one mean per row,
+    so thousands of resamples cost a few vectorized NumPy calls. Results are
+    cached by a hash of the inputs.
+    """
+    a = _clean_values(group_a)
+    b = _clean_values(group_b)
+    if a.size < 2 or b.size < 2:
+        return _empty_result(a.size, b.size, confidence)
+
+    rng = np.random.default_rng(seed)
+    observed = b.mean() - a.mean()
+
+    # Bootstrap distribution of the difference in means
+    bootstrap = np.empty(n_resamples)
+    for start, size in _batches(n_resamples, a.size + b.size):
+        resampled_a = a[rng.integers(0, a.size, size=(size, a.size))].mean(axis=1)
+        resampled_b = b[rng.integers(0, b.size, size=(size, b.size))].mean(axis=1)
+        bootstrap[start:start + size] = resampled_b - resampled_a
+
+    # Permutation distribution under the null of exchangeable group labels
+    pooled = np.concatenate([a, b])
+    permuted = np.empty(n_resamples)
+    for start, size in _batches(n_resamples, pooled.size):
+        shuffled = rng.permuted(np.broadcast_to(pooled, (size, pooled.size)), axis=1)
+        permuted[start:start + size] = shuffled[:, a.size:].mean(axis=1) - shuffled[:, :a.size].mean(axis=1)
+
+    return _summarize(observed, bootstrap, permuted, confidence, a.size, b.size)
+
+
+@st.cache_data(show_spinner=False)
+def compare_paired(before, after, n_resamples=5000, confidence=0.95, seed=42):
+    """Bootstrap CI and sign-flip permutation test for paired before/after values"""
+    paired = pd.DataFrame({
+        'before': pd.to_numeric(pd.Series(before), errors='coerce').to_numpy(dtype=float),
+        'after': pd.to_numeric(pd.Series(after), errors='coerce').to_numpy(dtype=float)
+    }).dropna()
+    differences = (paired['after'] - paired['before']).to_numpy()
+    if differences.size < 2:
+        return _empty_result(differences.size, differences.size, confidence)
+
+    rng = np.random.default_rng(seed)
+    observed = differences.mean()
+
+    bootstrap = np.empty(n_resamples)
+    permuted = np.empty(n_resamples)
+    for start, size in _batches(n_resamples, differences.size):
+        indices = rng.integers(0, differences.size, size=(size, differences.size))
+        bootstrap[start:start + size] = differences[indices].mean(axis=1)
+        signs = rng.choice([-1.0, 1.0], size=(size, differences.size))
+        permuted[start:start + size] = (signs * differences).mean(axis=1)
+
+    return _summarize(observed, bootstrap, permuted, confidence, differences.size, differences.size)
+
+
+def _summarize(observed, bootstrap, permuted, confidence, n_a, n_b):
+    """Percentile interval and two-sided permutation p-value"""
+    alpha = 1 - confidence
+    ci_low, ci_high = np.quantile(bootstrap, [alpha / 2, 1 - alpha / 2])
+    # The +1 terms count the observed labelling as one of the permutations
+    p_value = (np.sum(np.abs(permuted) >= abs(observed) - 1e-12) + 1) / (permuted.size + 1)
+    return {
+        'n_a': int(n_a),
+        'n_b': int(n_b),
+        'difference': float(observed),
+        'ci_low': float(ci_low),
+        'ci_high': float(ci_high),
+        'p_value': float(p_value),
+        'significant': bool(p_value < alpha),
+        'confidence': confidence,
+    }
+
+
+def describe_result(result, unit=''):
+    """One-line summary of a comparison for display"""
+    if np.isnan(result['difference']):
+        return "Not enough data for a significance test"
+    verdict = "statistically significant" if result['significant'] else "not statistically significant"
+    return (f"Difference {result['difference']:+.2f}{unit} "
+            f"({result['confidence']:.0%} CI {result['ci_low']:+.2f}{unit} to {result['ci_high']:+.2f}{unit}, "
+            f"p = {result['p_value']:.4f}) - {verdict}")
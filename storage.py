@@ -0,0 +1,460 @@
+import json
+import os
+import re
+import shutil
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime
+
+import pandas as pd
+
+from csv_reader import read_csv
+
+# Columns indexed in the SQLite store whenever a dataset has them
+INDEXED_COLUMNS = [
+    'Year', 'Course', 'Course(GCGM/MGM/GMBA)', 'Cohort', 'Campus (SG/MUM/SYD/DXB)',
+    'Student Roll No.', 'Email id', 'Student _mail id', 'Faculty Name', 'Faculty_Email_ID'
+]
+
+
+# Columns whose distinct values the partition manifest records for pruning
+PARTITION_STATS_COLUMNS = ['Year', 'Course', 'Course(GCGM/MGM/GMBA)', 'Cohort', 'Campus (SG/MUM/SYD/DXB)']
+
+
+def dataset_slug(data_type):
+    """File-system and SQL safe name for a data type"""
+    return re.sub(r'\W+', '_', data_type).strip('_').lower()
+
+
+def apply_filters(df, filters):
+    """Keep rows whose values are in the allowed lists (columns the frame lacks are ignored)"""
+    if not filters or df.empty:
+        return df
+    mask = pd.Series(True, index=df.index)
+    for column, values in filters.items():
+        if values is not None and column in df.columns:
+            mask &= df[column].isin(list(values))
+    return df[mask]
+
+
+def project_columns(df, columns):
+    """Keep the requested columns the frame actually has"""
+    if columns is None:
+        return df
+    return df[[column for column in columns if column in df.columns]]
+
+
+class CSVStore:
+    """Each dataset lives in one flat CSV file"""
+
+    def __init__(self, data_files):
+        self.data_files = data_files
+
+    def exists(self, data_type):
+        filename = self.data_files.get(data_type)
+        return bool(filename) and os.path.exists(filename)
+
+    def columns(self, data_type):
+        """Column names of a stored dataset"""
+        return list(read_csv(self.data_files[data_type], nrows=0).columns)
+
+    def load(self, data_type, filters=None, columns=None):
+        """Read a dataset, keeping only rows passing the filters.
+
+        With `columns`, only those columns (plus any filter columns) are parsed.
+        """
+        usecols = None
+        if columns is not None:
+            wanted = set(columns) | set(filters or {})
+            usecols = [column for column in self.columns(data_type) if column in wanted]
+        df = read_csv(self.data_files[data_type], data_type, usecols=usecols)
+        return project_columns(apply_filters(df, filters), columns)
+
+    def save(self, data_type, df):
+        """Overwrite a dataset"""
+        df.to_csv(self.data_files[data_type], index=False)
+
+    def append(self, data_type, df):
+        """Add rows to a dataset without rewriting the existing ones"""
+        if not self.exists(data_type):
+            return self.save(data_type, df)
+        df[self.columns(data_type)].to_csv(self.data_files[data_type], mode='a', header=False, index=False)
+
+    def count(self, data_type):
+        return len(read_csv(self.data_files[data_type], data_type))
+
+    def files(self, data_type):
+        """Files holding the stored dataset"""
+        return [self.data_files[data_type]]
+
+    def version(self, data_type):
+        """Token that changes whenever the stored dataset is rewritten"""
+        stat = os.stat(self.data_files[data_type])
+        return f"{stat.st_mtime_ns}-{stat.st_size}"
+
+    def describe(self, data_type):
+        """Last-modified time and size of the stored dataset"""
+        filename = self.data_files[data_type]
+        return {
+            'last_modified': datetime.fromtimestamp(os.path.getmtime(filename)).strftime('%Y-%m-%d %H:%M:%S'),
+            'file_size': f"{os.path.getsize(filename) / 1024:.1f} KB"
+        }
+
+
+class SQLiteStore:
+    """All datasets live in one embedded SQLite database, one table each.
+
+    Tables are indexed on the filter and identity columns listed in
+    INDEXED_COLUMNS, so filtered loads only fetch matching rows. A dataset
+    with no table yet is imported from its CSV file on first use; from then
+    on the table is the stored data and the CSV file is never read or
+    updated again.
+    """
+
+    def __init__(self, data_files, db_path='ai_initiatives.db'):
+        self.data_files = data_files
+        self.db_path = db_path
+
+    @contextmanager
+    def _connect(self):
+        """Connection running everything inside one explicit transaction"""
+        conn = sqlite3.connect(self.db_path, isolation_level=None)
+        try:
+            conn.execute("BEGIN")
+            yield conn
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _table(data_type):
+        return dataset_slug(data_type)
+
+    @staticmethod
+    def _quote(name):
+        return '"' + name.replace('"', '""') + '"'
+
+    def _has_table(self, conn, data_type):
+        row = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+                           (self._table(data_type),)).fetchone()
+        return row is not None
+
+    def _ensure_table(self, conn, data_type):
+        """Import the dataset's CSV file the first time the table is needed"""
+        if self._has_table(conn, data_type):
+            return True
+        filename = self.data_files.get(data_type)
+        if filename and os.path.exists(filename):
+            self._write(conn, data_type, read_csv(filename, data_type))
+            return True
+        return False
+
+    def _write(self, conn, data_type, df):
+        """Replace a table and rebuild its indexes inside the current transaction"""
+        table = self._table(data_type)
+        conn.execute(f"DROP TABLE IF EXISTS {self._quote(table)}")
+        definitions = ', '.join(f"{self._quote(column)} {self._sql_type(dtype)}" for column, dtype in df.dtypes.items())
+        conn.execute(f"CREATE TABLE {self._quote(table)} ({definitions})")
+        self._insert(conn, data_type, df)
+        for position, column in enumerate(df.columns):
+            if column in INDEXED_COLUMNS:
+                conn.execute(f"CREATE INDEX IF NOT EXISTS {self._quote(f'idx_{table}_{position}')} "
+                             f"ON {self._quote(table)} ({self._quote(column)})")
+
+    @staticmethod
+    def _sql_type(dtype):
+        if pd.api.types.is_bool_dtype(dtype) or pd.api.types.is_integer_dtype(dtype):
+            return 'INTEGER'
+        if pd.api.types.is_float_dtype(dtype):
+            return 'REAL'
+        return 'TEXT'
+
+    def _insert(self, conn, data_type, df):
+        """Insert rows with one executemany (to_sql would commit mid-transaction)"""
+        if df.empty:
+            return
+        rows = df.astype(object).where(df.notna(), None).itertuples(index=False, name=None)
+        conn.executemany(f"INSERT INTO {self._quote(self._table(data_type))} "
+                         f"({', '.join(self._quote(c) for c in df.columns)}) "
+                         f"VALUES ({', '.join('?' * len(df.columns))})", rows)
+
+    def exists(self, data_type):
+        with self._connect() as conn:
+            return self._ensure_table(conn, data_type)
+
+    def columns(self, data_type):
+        with self._connect() as conn:
+            self._ensure_table(conn, data_type)
+            rows = conn.execute(f"PRAGMA table_info({self._quote(self._table(data_type))})").fetchall()
+        return [row[1] for row in rows]
+
+    def load(self, data_type, filters=None, columns=None):
+        """Fetch the rows passing the filters, using the column indexes"""
+        stored_columns = self.columns(data_type)
+        selected = [c for c in columns if c in stored_columns] if columns is not None else stored_columns
+
+        clauses, params = [], []
+        for column, values in (filters or {}).items():
+            if values is None or column not in stored_columns:
+                continue
+            values = list(values)
+            clauses.append(f"{self._quote(column)} IN ({', '.join('?' * len(values))})")
+            params.extend(v.item() if hasattr(v, 'item') else v for v in values)
+
+        query = (f"SELECT {', '.join(self._quote(c) for c in selected)} "
+                 f"FROM {self._quote(self._table(data_type))}")
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        with self._connect() as conn:
+            return pd.read_sql_query(query, conn, params=params)
+
+    def save(self, data_type, df):
+        """Replace a dataset in one transaction"""
+        with self._connect() as conn:
+            self._write(conn, data_type, df)
+
+    def append(self, data_type, df):
+        """Insert rows in one transaction"""
+        with self._connect() as conn:
+            if not self._ensure_table(conn, data_type):
+                self._write(conn, data_type, df)
+            else:
+                self._insert(conn, data_type, df)
+
+    def upsert(self, data_type, df, key_columns, replaced):
+        """Delete the stored rows under the keys of `replaced` and insert `df`, in one transaction"""
+        with self._connect() as conn:
+            self._ensure_table(conn, data_type)
+            condition = ' AND '.join(f"{self._quote(column)} IS ?" for column in key_columns)
+            keys = replaced[key_columns]
+            conn.executemany(f"DELETE FROM {self._quote(self._table(data_type))} WHERE {condition}",
+                             keys.astype(object).where(keys.notna(), None).itertuples(index=False, name=None))
+            self._insert(conn, data_type, df)
+
+    def count(self, data_type):
+        with self._connect() as conn:
+            self._ensure_table(conn, data_type)
+            return conn.execute(f"SELECT COUNT(*) FROM {self._quote(self._table(data_type))}").fetchone()[0]
+
+    def export(self, data_type, directory):
+        """Copy the dataset's table and its indexes into a database file of its own, returning its path"""
+        path = os.path.join(directory, f'{self._table(data_type)}.db')
+        table = self._quote(self._table(data_type))
+        target = sqlite3.connect(path)
+        try:
+            with self._connect() as conn:
+                self._ensure_table(conn, data_type)
+                statements = conn.execute("SELECT sql FROM sqlite_master WHERE tbl_name = ? AND sql IS NOT NULL "
+                                          "ORDER BY type DESC", (self._table(data_type),)).fetchall()
+                columns = len(conn.execute(f"PRAGMA table_info({table})").fetchall())
+                with target:
+                    for (statement,) in statements:
+                        target.execute(statement)
+                    target.executemany(f"INSERT INTO {table} VALUES ({', '.join('?' * columns)})",
+                                       conn.execute(f"SELECT * FROM {table}"))
+        finally:
+            target.close()
+        return path
+
+    def version(self, data_type):
+        """Token that changes whenever the database is written"""
+        stat = os.stat(self.db_path)
+        return f"{stat.st_mtime_ns}-{stat.st_size}"
+
+    def describe(self, data_type):
+        """Last-modified time and size of the database file"""
+        return {
+            'last_modified': datetime.fromtimestamp(os.path.getmtime(self.db_path)).strftime('%Y-%m-%d %H:%M:%S'),
+            'file_size': f"{os.path.getsize(self.db_path) / 1024:.1f} KB (shared database)"
+        }
+
+
+class PartitionedCSVStore:
+    """Each dataset is split into one CSV file per Year (and optionally Cohort).
+
+    A manifest.json per dataset lists the partition files with their row
+    counts and the distinct Year/Course/Cohort/Campus values they hold, so a
+    filtered load only opens the partitions that can match. Appends only
+    touch the partitions receiving rows. Datasets without a Year column are
+    partitioned by Cohort; a dataset with no partition column at all is kept
+    as a single partition. A full save writes a new generation directory of
+    partitions and swaps the manifest over to it, so readers and crashes only
+    ever see a complete dataset.
+
+    Datasets are imported from their flat CSV file on first use; from then
+    on the partitions are the stored data and the flat file is never read
+    or updated again.
+    """
+
+    def __init__(self, data_files, root='data_partitions', partition_columns=('Year',)):
+        self.data_files = data_files
+        self.root = root
+        self.partition_columns = list(partition_columns)
+
+    def _dir(self, data_type):
+        return os.path.join(self.root, dataset_slug(data_type))
+
+    def _manifest_path(self, data_type):
+        return os.path.join(self._dir(data_type), 'manifest.json')
+
+    def _read_manifest(self, data_type):
+        """The dataset's manifest, importing the flat CSV file if there is none yet"""
+        path = self._manifest_path(data_type)
+        if not os.path.exists(path):
+            filename = self.data_files.get(data_type)
+            if not (filename and os.path.exists(filename)):
+                return None
+            self.save(data_type, read_csv(filename, data_type))
+        with open(path) as f:
+            return json.load(f)
+
+    def _write_manifest(self, data_type, manifest):
+        """Swap in a new manifest atomically so readers never see a partial one"""
+        path = self._manifest_path(data_type)
+        with open(path + '.tmp', 'w') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(path + '.tmp', path)
+
+    def _path(self, data_type, manifest, relative):
+        """Path of a partition file, inside the manifest's generation directory"""
+        return os.path.join(self._dir(data_type), manifest.get('generation', ''), relative)
+
+    def _partition_by(self, df):
+        columns = [column for column in self.partition_columns if column in df.columns]
+        if not columns and 'Cohort' in df.columns:
+            columns = ['Cohort']
+        return columns
+
+    @staticmethod
+    def _plain(value):
+        """JSON-friendly version of a NumPy scalar"""
+        return value.item() if hasattr(value, 'item') else value
+
+    def _partition_file(self, key):
+        if not key:
+            return 'all.csv'
+        parts = [f"{column}={re.sub(r'[^A-Za-z0-9.-]+', '_', str(value))}" for column, value in key.items()]
+        return os.path.join(*parts) + '.csv'
+
+    def _stats(self, df):
+        return {column: sorted({self._plain(v) for v in df[column].dropna().unique()}, key=str)
+                for column in PARTITION_STATS_COLUMNS if column in df.columns}
+
+    def _write_partitions(self, data_type, df, partition_by, manifest):
+        """Write rows into their partitions, appending to partitions that already exist"""
+        entries = {entry['file']: entry for entry in manifest['partitions']}
+        groups = df.groupby(partition_by, dropna=False, sort=False) if partition_by else [((), df)]
+        for key, rows in groups:
+            key = key if isinstance(key, tuple) else (key,)
+            values = {column: (None if pd.isna(value) else self._plain(value))
+                      for column, value in zip(partition_by, key)}
+            relative = self._partition_file(values)
+            path = self._path(data_type, manifest, relative)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+            entry = entries.get(relative)
+            if entry is None:
+                rows[manifest['columns']].to_csv(path, index=False)
+                entry = {'file': relative, 'values': values, 'rows': 0, 'stats': {}}
+                manifest['partitions'].append(entry)
+                entries[relative] = entry
+            else:
+                rows[manifest['columns']].to_csv(path, mode='a', header=False, index=False)
+
+            entry['rows'] += len(rows)
+            for column, stat_values in self._stats(rows).items():
+                merged = {*entry['stats'].get(column, []), *stat_values}
+                entry['stats'][column] = sorted(merged, key=str)
+
+    def _matches(self, entry, filters):
+        for column, values in (filters or {}).items():
+            if values is None or column not in entry['stats']:
+                continue
+            if not set(entry['stats'][column]) & {self._plain(v) for v in values}:
+                return False
+        return True
+
+    def exists(self, data_type):
+        return self._read_manifest(data_type) is not None
+
+    def columns(self, data_type):
+        return list(self._read_manifest(data_type)['columns'])
+
+    def partitions(self, data_type, filters=None):
+        """Manifest entries of the partitions that can hold rows passing the filters"""
+        manifest = self._read_manifest(data_type)
+        return [entry for entry in manifest['partitions'] if self._matches(entry, filters)]
+
+    def load(self, data_type, filters=None, columns=None):
+        """Read only the partitions the manifest says can match the filters"""
+        manifest = self._read_manifest(data_type)
+        selected = [entry for entry in manifest['partitions'] if self._matches(entry, filters)]
+        # Filter columns are read too, then dropped after filtering
+        needed = None
+        if columns is not None:
+            needed = [c for c in manifest['columns'] if c in columns or c in (filters or {})]
+        frames = [read_csv(self._path(data_type, manifest, entry['file']), data_type, usecols=needed)
+                  for entry in selected]
+        if not frames:
+            return project_columns(pd.DataFrame(columns=manifest['columns']), columns)
+        df = pd.concat(frames, ignore_index=True)
+        return project_columns(apply_filters(df, filters), columns)
+
+    def save(self, data_type, df):
+        """Rewrite a dataset's partitions from scratch.
+
+        The partitions go into a new generation directory next to the current
+        one; replacing the manifest switches readers over to it, and only then
+        are the previous partitions removed.
+        """
+        directory = self._dir(data_type)
+        generation = f"generation-{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}"
+        manifest = {'columns': list(df.columns), 'partition_by': self._partition_by(df), 'partitions': [],
+                    'generation': generation}
+        os.makedirs(os.path.join(directory, generation))
+        self._write_partitions(data_type, df, manifest['partition_by'], manifest)
+        self._write_manifest(data_type, manifest)
+        for name in os.listdir(directory):
+            if name not in (generation, 'manifest.json'):
+                path = os.path.join(directory, name)
+                if os.path.isdir(path):
+                    shutil.rmtree(path)
+                else:
+                    os.remove(path)
+
+    def append(self, data_type, df):
+        """Append rows, writing only the partitions they fall into"""
+        manifest = self._read_manifest(data_type)
+        if manifest is None:
+            return self.save(data_type, df)
+        self._write_partitions(data_type, df, manifest['partition_by'], manifest)
+        self._write_manifest(data_type, manifest)
+
+    def count(self, data_type):
+        return sum(entry['rows'] for entry in self._read_manifest(data_type)['partitions'])
+
+    def files(self, data_type):
+        """Files holding the stored dataset: its manifest and partitions"""
+        manifest = self._read_manifest(data_type)
+        return [self._manifest_path(data_type)] + [self._path(data_type, manifest, entry['file'])
+                                                    for entry in manifest['partitions']]
+
+    def version(self, data_type):
+        """Token that changes whenever the manifest is rewritten"""
+        self._read_manifest(data_type)
+        stat = os.stat(self._manifest_path(data_type))
+        return f"{stat.st_mtime_ns}-{stat.st_size}"
+
+    def describe(self, data_type):
+        """Last-modified time of the manifest and total size of the partitions"""
+        manifest = self._read_manifest(data_type)
+        size = sum(os.path.getsize(self._path(data_type, manifest, entry['file']))
+                   for entry in manifest['partitions'])
+        modified = os.path.getmtime(self._manifest_path(data_type))
+        return {
+            'last_modified': datetime.fromtimestamp(modified).strftime('%Y-%m-%d %H:%M:%S'),
+            'file_size': f"{size / 1024:.1f} KB ({len(manifest['partitions'])} partitions)"
+        }
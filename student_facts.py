@@ -0,0 +1,173 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+from dimensions import attach_cohort
+from student_index import StudentIndex
+
+# Fact table columns and the PRP / AI Impact columns they come from. Where both
+# datasets hold a value, the PRP one wins and AI Impact fills the gaps.
+PRP_FACT_COLUMNS = {
+    'Student Roll No.': 'Roll No',
+    'Student Name': 'Name',
+    'Email id': 'Email',
+    'Course': 'Course',
+    'Cohort': 'Cohort',
+    'Year': 'Year',
+    'Term-1': 'Term-1',
+    'Term-2': 'Term-2',
+    'Term-3': 'Term-3',
+    'No. of JPT Mock Interviews attempted and scored equal or above 80%': 'JPT High Scores',
+    'Area Head Mock Interview Score': 'Area Head Score',
+    'Categorise student overall (Outstanding, Good, Average, Needs Handholding)': 'Category',
+    'Placed/Not Placed': 'Placement',
+}
+IMPACT_FACT_COLUMNS = {
+    'Student Name': 'Name',
+    'Student _mail id': 'Email',
+    'Course': 'Course',
+    'Cohort': 'Cohort',
+    'Placed/Not Placed': 'Placement',
+    'CGPA': 'CGPA',
+    'AI Tutor Usage': 'AI Tutor Usage',
+    'AI Mentor Usage': 'AI Mentor Usage',
+    'JPT Usage': 'JPT Usage',
+    'Yoodli Usage': 'Yoodli Usage',
+}
+
+JPT_LEVELS = ['No JPT Usage', 'Low JPT Usage', 'High JPT Usage']
+
+
+def jpt_level(high_scores):
+    """JPT usage level from the number of mock interviews scored at 80% or above"""
+    scores = pd.to_numeric(pd.Series(high_scores), errors='coerce').to_numpy(dtype=float)
+    levels = np.select([scores >= 3, scores >= 1, scores >= 0], JPT_LEVELS[::-1], default=None)
+    return levels.astype(object)
+
+
+def _row_hashes(df):
+    return pd.util.hash_pandas_object(df, index=False).to_numpy()
+
+
+def _appended_from(old_hashes, df):
+    """Position where new rows start if `df` only appends to the rows seen before, else None"""
+    hashes = _row_hashes(df)
+    if len(hashes) >= len(old_hashes) and np.array_equal(hashes[:len(old_hashes)], old_hashes):
+        return len(old_hashes), hashes
+    return None, hashes
+
+
+class StudentFacts:
+    """One row per student across PRP and AI Impact, kept up to date incrementally.
+
+    PRP students are matched to AI Impact students on normalized roll number
+    or email (first AI Impact row wins); AI Impact students with no PRP record
+    get a row of their own. When a source only gains rows, just the new rows
+    are matched: new PRP rows are looked up in the AI Impact index, and new AI
+    Impact rows get an index of their own that unmatched students are looked
+    up in. Any other change to a source rebuilds the table.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.prp = pd.DataFrame()
+        self.impact = pd.DataFrame()
+        self._prp_hashes = np.array([], dtype=np.uint64)
+        self._impact_hashes = np.array([], dtype=np.uint64)
+        # Indexes over consecutive appended blocks of AI Impact rows, as (offset, index)
+        self._impact_indexes = []
+        # Source row of every fact row in each dataset (-1 where absent)
+        self.prp_rows = np.array([], dtype=np.int64)
+        self.impact_rows = np.array([], dtype=np.int64)
+        self.table = pd.DataFrame(columns=self.columns())
+
+    @staticmethod
+    def columns():
+        return list(dict.fromkeys([*PRP_FACT_COLUMNS.values(), *IMPACT_FACT_COLUMNS.values(), 'JPT Level', 'Placed']))
+
+    def _match_impact(self, df, indexes):
+        """AI Impact row of every row of `df` across the given indexes (-1 where unmatched)"""
+        positions = np.full(len(df), -1, dtype=np.int64)
+        for offset, index in indexes:
+            unmatched = positions < 0
+            if not unmatched.any():
+                break
+            found = index.positions_for(df[unmatched])
+            positions[np.flatnonzero(unmatched)[found >= 0]] = found[found >= 0] + offset
+        return positions
+
+    def update(self, prp, impact):
+        """Bring the table in line with the current PRP and AI Impact data"""
+        with self._lock:
+            prp_start, prp_hashes = _appended_from(self._prp_hashes, prp)
+            impact_start, impact_hashes = _appended_from(self._impact_hashes, impact)
+            if prp_start is None or impact_start is None:
+                self._reset()
+                prp_start, impact_start = 0, 0
+            if prp_start == len(prp) and impact_start == len(impact):
+                return self.table
+
+            prp_rows, impact_rows = self.prp_rows, self.impact_rows
+            self.prp, self.impact = prp, impact
+
+            # New AI Impact rows: fill students still unmatched, then add the rest on their own
+            if impact_start < len(impact):
+                block = (impact_start, StudentIndex(impact.iloc[impact_start:]))
+                self._impact_indexes.append(block)
+                waiting = np.flatnonzero((prp_rows >= 0) & (impact_rows < 0))
+                if len(waiting):
+                    impact_rows = impact_rows.copy()
+                    impact_rows[waiting] = self._match_impact(prp.iloc[prp_rows[waiting]], [block])
+
+            # New PRP rows: look them up in every AI Impact block
+            if prp_start < len(prp):
+                new_rows = np.arange(prp_start, len(prp))
+                prp_rows = np.concatenate([prp_rows, new_rows])
+                impact_rows = np.concatenate([impact_rows, self._match_impact(prp.iloc[prp_start:], self._impact_indexes)])
+
+            # AI Impact students without a PRP record get their own rows
+            matched = np.zeros(len(impact), dtype=bool)
+            matched[impact_rows[(prp_rows >= 0) & (impact_rows >= 0)]] = True
+            has_prp = prp_rows >= 0
+            standalone = np.flatnonzero(~matched)
+            self.prp_rows = np.concatenate([prp_rows[has_prp], np.full(len(standalone), -1)])
+            self.impact_rows = np.concatenate([impact_rows[has_prp], standalone])
+
+            self._prp_hashes, self._impact_hashes = prp_hashes, impact_hashes
+            self.table = self._assemble()
+            return self.table
+
+    def _take(self, df, rows, column):
+        """Values of a source column for each fact row (missing where the row is absent)"""
+        if column not in df.columns:
+            return pd.Series(np.nan, index=range(len(rows)), dtype=object)
+        values = df[column].to_numpy()
+        taken = pd.Series(values[np.where(rows >= 0, rows, 0)] if len(values) else np.full(len(rows), np.nan, dtype=object))
+        return taken.where(rows >= 0)
+
+    def _assemble(self):
+        table = pd.DataFrame(index=range(len(self.prp_rows)))
+        for source, rows, mapping in ((self.prp, self.prp_rows, PRP_FACT_COLUMNS),
+                                      (self.impact, self.impact_rows, IMPACT_FACT_COLUMNS)):
+            for column, name in mapping.items():
+                values = self._take(source, rows, column)
+                table[name] = table[name].combine_first(values) if name in table.columns else values
+
+        # Students known only from AI Impact get their year from the cohort
+        cohort_years = attach_cohort(table, {'year': 'Cohort_Year'})['Cohort_Year']
+        table['Year'] = table['Year'].where(table['Year'].notna(), cohort_years.where(cohort_years > 0)).astype('Int64')
+        table['JPT Level'] = jpt_level(table['JPT High Scores'])
+        table['Placed'] = np.where(table['Placement'].isna(), np.nan, table['Placement'] == 'Placed')
+        return table[self.columns()]
+
+
+def placement_rate_by(facts, rows, columns):
+    """Placement rate (%) and student count for each combination of two fact columns"""
+    known = facts.dropna(subset=[rows, columns, 'Placed'])
+    summary = known.groupby([rows, columns])['Placed'].agg(['mean', 'size']).reset_index()
+    summary['Placement_Rate'] = (summary['mean'].astype(float) * 100).round(1)
+    return summary.rename(columns={'size': 'Students'}).drop(columns='mean')
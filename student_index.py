@@ -0,0 +1,115 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+# Columns identifying a student in each template, in matching priority order
+STUDENT_KEY_COLUMNS = {
+    'roll_no': ['Student Roll No.'],
+    'email': ['Email id', 'Student _mail id'],
+}
+
+
+def _as_strings(values):
+    """Values as strings, keeping missing values as NaN"""
+    series = pd.Series(values, dtype=object)
+    return series.astype(str).where(series.notna())
+
+
+def normalize_emails(values):
+    """Lower-case and trim email addresses so spelling variants match"""
+    return _as_strings(values).str.strip().str.lower()
+
+
+def normalize_roll_numbers(values):
+    """Upper-case roll numbers and drop embedded whitespace"""
+    return _as_strings(values).str.upper().str.replace(r'\s+', '', regex=True)
+
+
+_NORMALIZERS = {
+    'roll_no': normalize_roll_numbers,
+    'email': normalize_emails,
+}
+
+
+def _key_column(df, key):
+    """First column of the frame holding the given student key, if any"""
+    for column in STUDENT_KEY_COLUMNS[key]:
+        if column in df.columns:
+            return column
+    return None
+
+
+def student_keys(df, key):
+    """Normalized values of a student key for every row (NaN where missing)"""
+    column = _key_column(df, key)
+    if column is None:
+        return None
+    normalized = _NORMALIZERS[key](df[column].to_numpy())
+    return normalized.where(normalized != '')
+
+
+class StudentIndex:
+    """Hash index from normalized student email and roll number to row positions.
+
+    Each key maps to the first row holding it. Single lookups and joins both
+    go through the hash table behind pandas' Index.get_indexer, so they stay
+    O(1) per student.
+    """
+
+    def __init__(self, df):
+        self.size = len(df)
+        self.indexes = {}
+        for key in STUDENT_KEY_COLUMNS:
+            keys = student_keys(df, key)
+            if keys is None:
+                continue
+            present = keys.notna().to_numpy()
+            unique = ~keys.duplicated().to_numpy() & present
+            self.indexes[key] = (pd.Index(keys[unique].to_numpy()), np.flatnonzero(unique))
+
+    def lookup(self, email=None, roll_no=None):
+        """Row position of a single student, or None if the student is not indexed"""
+        for key, value in (('roll_no', roll_no), ('email', email)):
+            if value is None or key not in self.indexes:
+                continue
+            normalized = _NORMALIZERS[key]([value]).iloc[0]
+            index, positions = self.indexes[key]
+            location = index.get_indexer([normalized])[0]
+            if location >= 0:
+                return int(positions[location])
+        return None
+
+    def positions_for(self, df):
+        """Indexed row position for every row of another frame (-1 where unmatched)"""
+        positions = np.full(len(df), -1, dtype=np.int64)
+        for key, (index, index_positions) in self.indexes.items():
+            keys = student_keys(df, key)
+            if keys is None:
+                continue
+            unmatched = positions < 0
+            found = index.get_indexer(keys[unmatched].to_numpy())
+            matched = np.full(len(found), -1, dtype=np.int64)
+            matched[found >= 0] = index_positions[found[found >= 0]]
+            positions[unmatched] = matched
+        return positions
+
+
+@st.cache_data(show_spinner=False)
+def build_student_index(df):
+    """Student index over a dataset, built once per dataset version"""
+    return StudentIndex(df)
+
+
+def join_students(left, right, columns, index=None):
+    """Attach columns of `right` to `left` by matching students (NaN where unmatched)"""
+    index = index if index is not None else StudentIndex(right)
+    positions = index.positions_for(left)
+    matched = positions >= 0
+
+    joined = left.copy()
+    for column in columns:
+        values = right[column].to_numpy()
+        joined_values = np.full(len(left), np.nan, dtype=float if np.issubdtype(values.dtype, np.number) else object)
+        joined_values[matched] = values[positions[matched]]
+        joined[column] = joined_values
+    return joined
@@ -1,36 +1,47 @@
 import pandas as pd
 import numpy as np
+import json
 import os
+import shutil
+import tempfile
+from io import BytesIO
+from csv_reader import read_csv
+from data_profiler import profile_frame
+from validation_rules import ERROR, check_values
+
+# Stored datasets checked by the data file and data quality tests
+DATA_FILES = {
+    'AI Tutor': 'ai_tutor template updated.csv',
+    'AI Mentor': 'ai_mentor_template - updated.csv',
+    'AI Impact': 'AI-initiatives impact updated.csv',
+    'AI TKT': 'AI_ TKT _ Template updated.csv',
+    'Unit Performance': 'unit_performance_template -updated.csv',
+    'CR (Corporate Relations)': 'CR_template -updated.csv',
+    'PRP (Placement Readiness Program)': 'PRP_template - updated.csv'
+}
+
+def profiles():
+    """Profile of every data file, read once"""
+    return {data_type: profile_frame(read_csv(file, data_type), data_type) for data_type, file in DATA_FILES.items()}
+
+def column_profile(profile, column):
+    return next(entry for entry in profile['columns'] if entry['column'] == column)
 
 def test_data_files():
     """Test if all required data files exist and are readable"""
-    required_files = [
-        'ai_tutor_mock_data.csv',
-        'ai_mentor_mock_data.csv',
-        'ai_impact_mock_data.csv',
-        'jpt_mock_data.csv',
-        'unit_performance_mock_data.csv'
-    ]
-    
     print("🔍 Testing data files...")
     
-    for file in required_files:
-        if os.path.exists(file):
-            try:
-                df = pd.read_csv(file)
-                print(f"✅ {file}: {len(df)} records, {len(df.columns)} columns")
-                
-                # Check for missing values
-                missing_count = df.isnull().sum().sum()
-                if missing_count > 0:
-                    print(f"   ⚠️  {missing_count} missing values found")
-                else:
-                    print(f"   ✅ No missing values")
-                    
-            except Exception as e:
-                print(f"❌ {file}: Error reading file - {e}")
+    for data_type, profile in profiles().items():
+        print(f"✅ {DATA_FILES[data_type]}: {profile['rows']} records, {len(profile['columns'])} columns")
+        
+        # Check for missing values and values of the wrong type
+        missing_count = sum(entry['nulls'] for entry in profile['columns'])
+        violations = sum(entry['type_violations'] for entry in profile['columns'])
+        assert violations == 0, f"{data_type}: {violations} values of the wrong type"
+        if missing_count > 0:
+            print(f"   ⚠️  {missing_count} missing values found")
         else:
-            print(f"❌ {file}: File not found")
+            print(f"   ✅ No missing values")
     
     print("\n" + "="*50)
 
@@ -38,54 +49,29 @@ def test_data_quality():
     """Test data quality and consistency"""
     print("🔍 Testing data quality...")
     
-    try:
-        # Test AI Tutor data
-        ai_tutor = pd.read_csv('ai_tutor_mock_data.csv')
-        print("✅ AI Tutor data loaded successfully")
-        
-        # Check adoption rate range
-        adoption_range = (ai_tutor['Student_adoption_rate'].min(), ai_tutor['Student_adoption_rate'].max())
-        print(f"   📊 Adoption rate range: {adoption_range[0]:.1f}% - {adoption_range[1]:.1f}%")
-        
-        # Check rating range
-        rating_range = (ai_tutor['Avg_Rating_for_AI_Tutor_Tool'].min(), ai_tutor['Avg_Rating_for_AI_Tutor_Tool'].max())
-        print(f"   ⭐ Rating range: {rating_range[0]:.1f} - {rating_range[1]:.1f}")
-        
-    except Exception as e:
-        print(f"❌ Error testing AI Tutor data: {e}")
+    data_profiles = profiles()
     
-    try:
-        # Test JPT data
-        jpt_data = pd.read_csv('jpt_mock_data.csv')
-        print("✅ JPT data loaded successfully")
-        
-        # Check conversion rates
-        jpt_data['conversion_rate'] = (jpt_data['Students_Selected'] / jpt_data['Students_Interviewed'] * 100).fillna(0)
-        conversion_range = (jpt_data['conversion_rate'].min(), jpt_data['conversion_rate'].max())
-        print(f"   📈 Conversion rate range: {conversion_range[0]:.1f}% - {conversion_range[1]:.1f}%")
-        
-        # Check CTC ranges
-        ctc_range = (jpt_data['Avg_CTC'].min(), jpt_data['Avg_CTC'].max())
-        print(f"   💰 CTC range: ₹{ctc_range[0]:,.0f} - ₹{ctc_range[1]:,.0f}")
-        
-    except Exception as e:
-        print(f"❌ Error testing JPT data: {e}")
+    # AI Tutor rating and quiz score ranges
+    rating = column_profile(data_profiles['AI Tutor'], 'Avg_Rating_for_AI_Tutor_Tool')
+    quiz = column_profile(data_profiles['AI Tutor'], 'Average_ Quiz_Score')
+    assert 0 <= rating['min'] <= rating['max'] <= 10 and 0 <= quiz['min'] <= quiz['max'] <= 10
+    print(f"   ⭐ Rating range: {rating['min']:.1f} - {rating['max']:.1f} (median {rating['quantiles'][1]:.1f})")
+    print(f"   📝 Quiz score range: {quiz['min']:.1f} - {quiz['max']:.1f}")
     
-    try:
-        # Test AI Impact data
-        ai_impact = pd.read_csv('ai_impact_mock_data.csv')
-        print("✅ AI Impact data loaded successfully")
-        
-        # Check placement rates
-        placement_rate = (ai_impact['Placed_Not_Placed'] == 'Placed').mean() * 100
-        print(f"   🎯 Overall placement rate: {placement_rate:.1f}%")
-        
-        # Check CGPA range
-        cgpa_range = (ai_impact['CGPA'].min(), ai_impact['CGPA'].max())
-        print(f"   📚 CGPA range: {cgpa_range[0]:.2f} - {cgpa_range[1]:.2f}")
-        
-    except Exception as e:
-        print(f"❌ Error testing AI Impact data: {e}")
+    # CR CTC range
+    ctc = column_profile(data_profiles['CR (Corporate Relations)'], 'Avg_CTC(in USD)')
+    assert ctc['min'] <= ctc['quantiles'][0] <= ctc['quantiles'][1] <= ctc['quantiles'][2] <= ctc['max']
+    print(f"   💰 CTC range: ${ctc['min']:,.1f} - ${ctc['max']:,.1f}")
+    
+    # AI Impact placement rate and CGPA range
+    impact = data_profiles['AI Impact']
+    placement = column_profile(impact, 'Placed/Not Placed')
+    placement_rate = placement['frequent'].get('Placed', 0) / (impact['rows'] - placement['nulls']) * 100
+    print(f"   🎯 Overall placement rate: {placement_rate:.1f}%")
+    
+    cgpa = column_profile(impact, 'CGPA')
+    assert 0 <= cgpa['min'] <= cgpa['max'] <= 4
+    print(f"   📚 CGPA range: {cgpa['min']:.2f} - {cgpa['max']:.2f}")
     
     print("\n" + "="*50)
 
@@ -116,6 +102,805 @@ def test_dashboard_requirements():
     
     print("\n" + "="*50)
 
+def test_score_binning():
+    """Test server-side histogram binning and normal curve fitting"""
+    print("🔍 Testing score binning...")
+    
+    from score_distributions import bin_scores
+    
+    scores = pd.Series(np.random.default_rng(7).normal(70, 8, 500))
+    
+    counts = bin_scores(scores, nbins=20)
+    assert counts['heights'].sum() == 500
+    assert len(counts['centers']) == 20
+    print(f"   ✅ 500 scores binned into {len(counts['centers'])} bars")
+    
+    density = bin_scores(scores, nbins=20, density=True)
+    area = (density['heights'] * density['widths']).sum()
+    assert abs(area - 1.0) < 1e-9
+    assert abs(density['mean'] - scores.mean()) < 1e-9
+    assert abs(density['std'] - scores.std()) < 1e-9
+    print(f"   ✅ Density integrates to {area:.3f}, skewness {density['skewness']:.3f}")
+    
+    print("\n" + "="*50)
+
+def test_score_correlations():
+    """Test the single-pass correlation engine against pandas"""
+    print("🔍 Testing score correlations...")
+    
+    from score_correlations import CorrelationStats
+    
+    rng = np.random.default_rng(11)
+    scores = pd.DataFrame(rng.normal(75, 10, size=(300, 4)), columns=['Term-1', 'Term-2', 'Term-3', 'Area Head'])
+    scores['Term-2'] += 0.5 * scores['Term-1']
+    scores.loc[rng.choice(300, 30, replace=False), 'Term-3'] = np.nan
+    
+    stats = CorrelationStats.from_frame(scores)
+    assert np.allclose(stats.matrix().values, scores.corr().values)
+    print("   ✅ Full matrix matches pandas pairwise correlations")
+    
+    # Appending rows incrementally gives the same matrix as one pass
+    incremental = CorrelationStats.from_frame(scores.iloc[:120])
+    incremental.merge(CorrelationStats.from_frame(scores.iloc[120:] + 40))
+    combined = pd.concat([scores.iloc[:120], scores.iloc[120:] + 40])
+    assert np.allclose(incremental.matrix().values, combined.corr().values)
+    assert abs(incremental.pair('Term-1', 'Term-2') - combined['Term-1'].corr(combined['Term-2'])) < 1e-9
+    print("   ✅ Incremental merge matches a full recomputation")
+    
+    print("\n" + "="*50)
+
+def test_score_moments():
+    """Test that merged moment partials match a direct computation"""
+    print("🔍 Testing streaming moments...")
+    
+    from score_distributions import Moments, merge_partitions, partition_moments
+    
+    rng = np.random.default_rng(5)
+    prp = pd.DataFrame({
+        'Year': rng.choice([2022, 2023, 2024], 400),
+        'Course': rng.choice(['GCGM', 'MGB', 'GMBA'], 400),
+        'Score': rng.gamma(4, 10, 400)
+    })
+    
+    partials = partition_moments(prp, ['Score'], ['Year', 'Course'])
+    merged = merge_partitions(partials, ['Score'], ['Year', 'Course'],
+                              filters={'Year': [2023, 2024], 'Course': ['MGB']})
+    subset = prp[prp['Year'].isin([2023, 2024]) & (prp['Course'] == 'MGB')]['Score']
+    direct = Moments.from_frame(subset.to_frame())
+    
+    assert merged.count[0] == len(subset)
+    assert np.allclose([merged.mean[0], merged.std[0]], [subset.mean(), subset.std()])
+    assert np.allclose([merged.m3[0], merged.m4[0]], [direct.m3[0], direct.m4[0]])
+    print(f"   ✅ {len(partials)} partitions merged: skewness {merged.skewness[0]:.3f}")
+    
+    print("\n" + "="*50)
+
+def test_significance():
+    """Test bootstrap/permutation significance without scipy"""
+    print("🔍 Testing significance tests...")
+    
+    from significance import compare_groups, compare_paired
+    
+    rng = np.random.default_rng(3)
+    before = rng.normal(70, 8, 200)
+    
+    shifted = compare_groups(before, rng.normal(75, 8, 220), n_resamples=2000)
+    assert shifted['significant'] and shifted['ci_low'] < shifted['difference'] < shifted['ci_high']
+    print(f"   ✅ Shifted groups: p = {shifted['p_value']:.4f}")
+    
+    same = compare_groups(before[:100], before[100:], n_resamples=2000)
+    assert not same['significant'] and same['ci_low'] < 0 < same['ci_high']
+    print(f"   ✅ Same distribution: p = {same['p_value']:.4f}")
+    
+    paired = compare_paired(before, before + rng.normal(2, 1, 200), n_resamples=2000)
+    assert paired['significant'] and paired['n_a'] == 200
+    print(f"   ✅ Paired before/after: {paired['difference']:+.2f} points")
+    
+    print("\n" + "="*50)
+
+def test_student_index():
+    """Test student-level joins on normalized email and roll number"""
+    print("🔍 Testing student index...")
+    
+    from student_index import StudentIndex, join_students
+    
+    prp = pd.DataFrame({
+        'Student Roll No.': ['SPJ001', 'spj 002', 'SPJ003', None],
+        'Email id': ['a@spjain.edu', 'b@spjain.edu', 'c@spjain.edu', ' D@SPJain.edu '],
+        'Term-1': [70, 80, 90, 60]
+    })
+    impact = pd.DataFrame({
+        'Student _mail id': ['d@spjain.edu', 'A@spjain.edu', 'x@spjain.edu'],
+        'CGPA': [3.1, 3.6, 2.9]
+    })
+    
+    index = StudentIndex(prp)
+    assert index.lookup(roll_no='SPJ002') == 1
+    assert index.lookup(email='d@spjain.edu ') == 3
+    assert index.lookup(email='nobody@spjain.edu') is None
+    print("   ✅ Single-student lookups hit the right rows")
+    
+    joined = join_students(prp, impact, ['CGPA'])
+    assert joined['CGPA'].tolist()[0] == 3.6 and joined['CGPA'].tolist()[3] == 3.1
+    assert joined['CGPA'].isna().sum() == 2
+    print(f"   ✅ Joined CGPA for {joined['CGPA'].notna().sum()} of {len(joined)} students")
+    
+    print("\n" + "="*50)
+
+def test_leaderboard():
+    """Test partial-selection leaderboards against a full sort"""
+    print("🔍 Testing leaderboards...")
+    
+    from leaderboard import grouped_top_bottom, top_bottom
+    
+    rng = np.random.default_rng(9)
+    faculty = pd.DataFrame({
+        'Faculty_Name': [f'Prof_{i}' for i in range(60)],
+        'Program': rng.choice(['GCGM', 'MGB', 'GMBA'], 60),
+        'Avg_Faculty_Rating': rng.uniform(5, 10, 60)
+    })
+    
+    top, bottom = top_bottom(faculty, 'Avg_Faculty_Rating', k=5)
+    ranked = faculty.sort_values('Avg_Faculty_Rating', ascending=False)
+    assert top['Faculty_Name'].tolist() == ranked.head(5)['Faculty_Name'].tolist()
+    assert bottom['Faculty_Name'].tolist() == ranked.tail(5)['Faculty_Name'].tolist()
+    print("   ✅ Top/bottom 5 match a full sort, bottom 5 lowest last")
+    
+    rankings = grouped_top_bottom(faculty, 'Program', ['Faculty_Name'], 'Avg_Faculty_Rating', k=3)
+    for program, (program_top, program_bottom) in rankings.items():
+        program_rows = faculty[faculty['Program'] == program].sort_values('Avg_Faculty_Rating', ascending=False)
+        assert program_top['Faculty_Name'].tolist() == program_rows.head(3)['Faculty_Name'].tolist()
+        assert program_bottom['Faculty_Name'].tolist() == program_rows.tail(3)['Faculty_Name'].tolist()
+    print(f"   ✅ One grouped pass ranked {len(rankings)} programs")
+    
+    print("\n" + "="*50)
+
+def test_storage_backends():
+    """Test filtered loads and append-only merges on every storage backend"""
+    print("🔍 Testing storage backends...")
+    
+    from data_manager import DataManager
+    
+    source = os.path.abspath('unit_performance_template -updated.csv')
+    original_dir = os.getcwd()
+    
+    for storage in ['csv', 'sqlite', 'partitioned']:
+        with tempfile.TemporaryDirectory() as workdir:
+            shutil.copy(source, workdir)
+            os.chdir(workdir)
+            try:
+                manager = DataManager(storage=storage)
+                existing = manager.load_existing_data('Unit Performance')
+                
+                filtered = manager.load_existing_data('Unit Performance', filters={'Year': [2024]},
+                                                      columns=['Year', 'Unit_Name', 'Total_Avg_score'])
+                assert len(filtered) == (existing['Year'] == 2024).sum()
+                assert list(filtered.columns) == ['Year', 'Unit_Name', 'Total_Avg_score']
+                sections, _ = manager.load_sections({'Trend': {'Unit Performance': ['Year', 'Total_Avg_score']},
+                                                  'Units': {'Unit Performance': ['Year', 'Unit_Name']}})
+                assert list(sections['Unit Performance'].columns) == ['Year', 'Total_Avg_score', 'Unit_Name']
+                
+                upload = pd.concat([existing.head(3), existing.head(2).assign(Total_Avg_score=99.9)])
+                merged, success, _ = manager.merge_data(existing, upload, 'Unit Performance', 'test')
+                assert success and manager.save_data(merged, 'Unit Performance')[0]
+                
+                reloaded = manager.load_existing_data('Unit Performance')
+                assert len(reloaded) == len(existing) + 2
+                assert manager.get_data_summary()['Unit Performance']['records'] == len(existing) + 2
+                print(f"   ✅ {storage}: filtered load of {len(filtered)} rows, merge appended 2 rows")
+                
+                if storage == 'partitioned':
+                    # Year filters only open matching partitions; a new year adds one partition
+                    store = manager.store
+                    assert len(store.partitions('Unit Performance', {'Year': [2024]})) == 1
+                    files_before = {entry['file'] for entry in store.partitions('Unit Performance')}
+                    new_year = existing.head(2).assign(Year=2031)
+                    merged, success, _ = manager.merge_data(reloaded, new_year, 'Unit Performance', 'test')
+                    assert success and manager.save_data(merged, 'Unit Performance')[0]
+                    files_after = {entry['file'] for entry in store.partitions('Unit Performance')}
+                    assert files_after - files_before == {'Year=2031.csv'}
+                    assert len(manager.load_existing_data('Unit Performance', filters={'Year': [2031]})) == 2
+                    print(f"   ✅ partitioned: {len(files_before)} year partitions, new year written as its own partition")
+                    
+                    # A rewrite that fails before the manifest is replaced leaves the stored data as it was
+                    stored = len(merged)
+                    def interrupted(*args):
+                        raise OSError("disk full")
+                    store._write_manifest = interrupted
+                    try:
+                        store.save('Unit Performance', existing.head(5))
+                    except OSError:
+                        pass
+                    del store._write_manifest
+                    assert store.count('Unit Performance') == len(store.load('Unit Performance')) == stored
+                    store.save('Unit Performance', existing.head(5))
+                    directory = os.path.join('data_partitions', 'unit_performance')
+                    assert len([name for name in os.listdir(directory) if name != 'manifest.json']) == 1
+                    assert len(store.load('Unit Performance')) == 5
+                    print("   ✅ partitioned: full rewrites are swapped in whole")
+                
+                # Rows stored twice stay stored, and the merge result and its log count them
+                current = manager.load_existing_data('Unit Performance')
+                doubled = pd.concat([current, current.head(1)], ignore_index=True)
+                manager.store.save('Unit Performance', doubled)
+                merged, _, _ = manager.merge_data(doubled, existing.tail(1).assign(Total_Avg_score=11.1), 'Unit Performance', 'test')
+                assert manager.save_data(merged, 'Unit Performance')[0]
+                assert len(merged) == len(manager.load_existing_data('Unit Performance')) == len(doubled) + 1
+                assert manager.audit.query(operations=['MERGE'])[0][0]['details'] == f"Added 1 of 1 records, Total: {len(merged)}"
+            finally:
+                os.chdir(original_dir)
+    
+    print("\n" + "="*50)
+
+def test_upsert():
+    """Test upload diffs and upserts on natural keys with the persistent key index on every backend"""
+    print("🔍 Testing upserts...")
+    
+    from data_manager import DataManager
+    from record_keys import NATURAL_KEYS, STORED_MATCHES, RecordIndex
+    
+    data_type = 'PRP (Placement Readiness Program)'
+    data_files = DataManager().data_files
+    sources = [os.path.abspath(data_files[name]) for name in [data_type, 'AI TKT', 'Unit Performance']]
+    original_dir = os.getcwd()
+    
+    # The shipped templates have no repeated keys
+    for data_type_name, key_columns in NATURAL_KEYS.items():
+        if key_columns:
+            assert not pd.read_csv(data_files[data_type_name]).duplicated(key_columns).any(), data_type_name
+    
+    for storage in ['csv', 'sqlite', 'partitioned']:
+        with tempfile.TemporaryDirectory() as workdir:
+            for source in sources:
+                shutil.copy(source, workdir)
+            os.chdir(workdir)
+            try:
+                manager = DataManager(storage=storage)
+                existing = manager.load_existing_data(data_type)
+                
+                corrected = existing.head(2).assign(**{'Area Head Mock Interview Score': 12.5})
+                added = existing.head(1).assign(**{'Email id': 'new.student@example.com'})
+                upload = pd.concat([corrected, existing.iloc[[5]], added])
+                
+                diff = manager.diff_upload(existing, upload, data_type)
+                assert [diff[name]['count'] for name in ['new', 'changed', 'unchanged']] == [1, 2, 1]
+                assert diff['dropped']['count'] == len(existing) - 3
+                assert (diff['changed']['sample'][STORED_MATCHES] == 1).all() and diff['changed']['ambiguous'] == 0
+                
+                result, success, msg = manager.upsert_data(existing, upload, data_type, 'test')
+                assert success and 'Updated 2 records, inserted 1, 1 unchanged' in msg, msg
+                assert manager.save_data(result, data_type)[0]
+                
+                reloaded = manager.load_existing_data(data_type)
+                assert len(reloaded) == len(existing) + 1
+                rows = reloaded[reloaded['Email id'].isin(corrected['Email id'])]
+                assert len(rows) == 2 and (rows['Area Head Mock Interview Score'] == 12.5).all()
+                
+                # A second upsert still replaces the right stored rows once partitioning has reordered them
+                others = reloaded[~reloaded['Email id'].isin(upload['Email id'])]
+                again = others.iloc[[0, len(others) // 2, -1]].assign(**{'Area Head Mock Interview Score': 33.5})
+                result, success, msg = manager.upsert_data(reloaded, again, data_type, 'test')
+                assert success and 'Updated 3 records, inserted 0, 0 unchanged' in msg, msg
+                assert manager.save_data(result, data_type)[0]
+                reloaded = manager.load_existing_data(data_type)
+                assert len(reloaded) == len(existing) + 1 and reloaded['Email id'].is_unique
+                rows = reloaded[reloaded['Email id'].isin(again['Email id'])]
+                assert len(rows) == 3 and (rows['Area Head Mock Interview Score'] == 33.5).all()
+                
+                # The saved index is reused, and re-uploading the same rows changes nothing
+                index = RecordIndex(data_type)
+                assert index.load(manager.store.version(data_type))
+                
+                # An index saved by an older hash scheme is not reused
+                np.savez(index.path, keys=index.keys, rows=index.rows, signature=np.array(manager.store.version(data_type)))
+                assert not RecordIndex(data_type).load(manager.store.version(data_type))
+                _, success, msg = manager.upsert_data(reloaded, upload, data_type, 'test')
+                assert success and 'Updated 0 records, inserted 0, 4 unchanged' in msg, msg
+                
+                # A key stored twice is skipped rather than collapsing both records into one
+                twice = reloaded.iloc[[7]].assign(**{'Area Head Mock Interview Score': 55.5})
+                merged, _, _ = manager.merge_data(reloaded, twice, data_type, 'test')
+                assert manager.save_data(merged, data_type)[0]
+                stored = manager.load_existing_data(data_type)
+                assert manager.diff_upload(stored, twice.assign(**{'Area Head Mock Interview Score': 1.0}),
+                                           data_type)['changed']['ambiguous'] == 1
+                result, success, msg = manager.upsert_data(stored, twice.assign(**{'Area Head Mock Interview Score': 1.0}),
+                                                           data_type, 'test')
+                assert success and 'skipped 1 whose key matches several stored records' in msg, msg
+                assert manager.save_data(result, data_type)[0]
+                assert len(manager.load_existing_data(data_type)) == len(stored)
+                
+                # Templates without a key keep all their rows and refuse upserts
+                for keyless in ['AI TKT', 'Unit Performance']:
+                    rows = manager.load_existing_data(keyless)
+                    result, success, msg = manager.upsert_data(rows, rows.head(3), keyless, 'test')
+                    assert not success and 'no record key' in msg and len(result) == len(rows)
+                    assert len(manager.load_existing_data(keyless)) == len(rows)
+                print(f"   ✅ {storage}: 2 then 3 records updated, 1 inserted, repeated key skipped, key index reused")
+            finally:
+                os.chdir(original_dir)
+    
+    print("\n" + "="*50)
+
+def test_parallel_loading():
+    """Test that concurrent loading returns what is ready and reports the rest"""
+    print("🔍 Testing parallel loading...")
+    
+    import time
+    from data_manager import DataManager, load_in_parallel
+    
+    def corrupt():
+        raise ValueError("corrupt file")
+    
+    loaders = {
+        'fast': lambda: pd.DataFrame({'a': [1, 2]}),
+        'slow': lambda: time.sleep(2) or pd.DataFrame(),
+        'corrupt': corrupt,
+    }
+    start = time.perf_counter()
+    results, report = load_in_parallel(loaders, timeout=0.5)
+    assert time.perf_counter() - start < 1.5
+    assert list(results) == ['fast'] and len(results['fast']) == 2
+    assert report['slow']['status'] == 'timeout'
+    assert report['corrupt']['status'] == 'error' and 'corrupt file' in report['corrupt']['error']
+    print("   ✅ Slow and corrupt loaders reported without blocking the rest")
+    
+    data, report = DataManager().load_all_data()
+    for data_type, entry in report.items():
+        assert entry['status'] == 'ok', f"{data_type}: {entry['error']}"
+        print(f"   ✅ {data_type}: {entry['rows']} rows in {entry['seconds'] * 1000:.1f} ms")
+    
+    print("\n" + "="*50)
+
+def test_csv_reader():
+    """Test template-typed parsing and the fallback parser"""
+    print("🔍 Testing CSV reader...")
+    
+    unit_data = read_csv('unit_performance_template -updated.csv', 'Unit Performance')
+    assert unit_data['Year'].dtype == 'int64' and unit_data['Total_Avg_score'].dtype == 'float64'
+    assert unit_data.equals(pd.read_csv('unit_performance_template -updated.csv'))
+    print(f"   ✅ Unit Performance parsed with template types ({len(unit_data)} rows)")
+    
+    # A blank Year cannot be parsed as int64, so the upload is re-read from the start with inferred types
+    upload = BytesIO(b"Course,Cohort,Year,Unit_Name,AI Tutor (Before/After),Total_Avg_score\n"
+                     b"GMBA,Jan-24,2024,Finance,After,81.5\nGMBA,Jan-24,,Finance,Before,75.0\n")
+    uploaded = read_csv(upload, 'Unit Performance')
+    assert len(uploaded) == 2 and uploaded['Year'].isna().sum() == 1
+    print("   ✅ Rows the typed parser rejects fall back to inferred types")
+    
+    print("\n" + "="*50)
+
+def test_date_dimension():
+    """Test date parsing at ingest and the calendar dimension"""
+    print("🔍 Testing date dimension...")
+    
+    from dimensions import attach_calendar, parse_dates
+    
+    ai_tutor = parse_dates(read_csv('ai_tutor template updated.csv', 'AI Tutor'))
+    assert pd.api.types.is_datetime64_any_dtype(ai_tutor['Unit_Commencement_date'])
+    assert ai_tutor['Unit_Commencement_date'].notna().all()
+    print(f"   ✅ Parsed {len(ai_tutor)} commencement dates")
+    
+    dates = pd.DataFrame({'Date of first interview(mm/dd/yyyy)': ['10/01/2024', '01/25/2025', None]})
+    calendar = attach_calendar(parse_dates(dates), 'Date of first interview(mm/dd/yyyy)',
+                               {'month': 'Month', 'term': 'Term', 'academic_year': 'Academic_Year'})
+    assert calendar['Month'].tolist() == [10, 1, -1]
+    assert calendar['Term'].tolist() == [2, 3, -1]
+    assert calendar['Academic_Year'].tolist()[:2] == ['2024-25', '2024-25'] and pd.isna(calendar['Academic_Year'][2])
+    print("   ✅ Calendar attributes joined by day offset")
+    
+    print("\n" + "="*50)
+
+def test_cohort_dimension():
+    """Test the cohort dimension against per-row parsing"""
+    print("🔍 Testing cohort dimension...")
+    
+    from dimensions import attach_cohort, cohort_dimension, cohort_order
+    
+    ai_tutor = read_csv('ai_tutor template updated.csv', 'AI Tutor')
+    with_cohort = attach_cohort(ai_tutor, {'year': 'Year', 'intake_month': 'Intake_Month'})
+    expected_years = ai_tutor['Cohort'].apply(lambda x: int(x.split('-')[1]) + 2000)
+    assert (with_cohort['Year'] == expected_years).all()
+    assert set(with_cohort['Intake_Month']) <= {1, 7}
+    print(f"   ✅ Years of {len(ai_tutor)} rows from {ai_tutor['Cohort'].nunique()} distinct cohorts")
+    
+    assert cohort_order(['Jul-22', 'Jan-23', 'Jan-22', None]) == ['Jan-22', 'Jul-22', 'Jan-23']
+    dimension = cohort_dimension(('Jul-24', 'unknown'))
+    assert dimension['ordinal'].tolist() == [1, -1] and dimension['academic_year'][0] == '2024-25'
+    print("   ✅ Chronological ordering and unparseable cohorts")
+    
+    print("\n" + "="*50)
+
+def test_star_schema():
+    """Test shared dimension keys across data types"""
+    print("🔍 Testing star schema...")
+    
+    from data_manager import DataManager
+    
+    manager = DataManager()
+    data, _ = manager.load_all_data()
+    schema = manager.build_star_schema(data)
+    
+    # 'Course' and 'Course(GCGM/MGM/GMBA)' resolve to the same course keys
+    tutor_courses = schema.labels('course', schema.facts['AI Tutor']['course_key'].unique())
+    assert set(tutor_courses) == set(data['AI Tutor']['Course(GCGM/MGM/GMBA)'].unique())
+    unit_keys = schema.facts['Unit Performance']['unit_key']
+    assert (schema.labels('unit', unit_keys) == data['Unit Performance']['Unit_Name'].to_numpy()).all()
+    print(f"   ✅ {len(schema.dimensions['course'])} courses and {len(schema.dimensions['unit'])} units shared by all fact tables")
+    
+    restored = schema.denormalize('CR (Corporate Relations)')
+    assert list(restored.columns) == list(data['CR (Corporate Relations)'].columns)
+    assert (restored['Company Name'] == data['CR (Corporate Relations)']['Company Name']).all()
+    
+    schema.add('CR (Corporate Relations)', data['CR (Corporate Relations)'].head(1).assign(**{'Company Name': 'New Co'}))
+    assert schema.dimensions['company'][-1] == 'New Co'
+    assert len(schema.facts['CR (Corporate Relations)']) == len(data['CR (Corporate Relations)']) + 1
+    print("   ✅ Round trip and incremental rows")
+    
+    # Both course spellings in one frame give a single key column
+    tutor = data['AI Tutor'].head(3).assign(Course=[None, 'GMBA', 'GCGM'])
+    schema.add('Mixed', tutor)
+    fact = schema.facts['Mixed']
+    assert [column for column in fact.columns if column.startswith('course')] == ['course_key']
+    assert list(schema.labels('course', fact['course_key'])) == [tutor['Course(GCGM/MGM/GMBA)'].iloc[0], 'GMBA', 'GCGM']
+    assert {'Course', 'Course(GCGM/MGM/GMBA)'} <= set(schema.denormalize('Mixed').columns)
+    print("   ✅ Course spellings merged into one key")
+    
+    print("\n" + "="*50)
+
+def test_student_facts():
+    """Test the student fact table and its incremental updates"""
+    print("🔍 Testing student fact table...")
+    
+    from student_facts import StudentFacts, placement_rate_by
+    
+    prp = read_csv('PRP_template - updated.csv', 'PRP (Placement Readiness Program)')
+    impact = read_csv('AI-initiatives impact updated.csv', 'AI Impact')
+    
+    full = StudentFacts().update(prp, impact)
+    matched = ((full['Term-1'].notna()) & (full['CGPA'].notna())).sum()
+    assert len(full) == len(prp) + len(impact) - matched
+    assert full['Year'].notna().all()
+    print(f"   ✅ {len(full)} students, {matched} with both PRP and AI Impact records")
+    
+    # Appending to either source gives the same table as building from scratch
+    facts = StudentFacts()
+    facts.update(prp.head(250), impact.head(300))
+    facts.update(prp.head(250), impact)
+    incremental = facts.update(prp, impact)
+    by_student = lambda df: df.sort_values(['Email', 'Roll No']).reset_index(drop=True)
+    assert by_student(incremental).equals(by_student(full))
+    print("   ✅ Incremental updates match a full rebuild")
+    
+    rates = placement_rate_by(full, 'JPT Level', 'AI Tutor Usage')
+    assert 0 < rates['Students'].sum() <= matched and rates['Placement_Rate'].between(0, 100).all()
+    print(f"   ✅ Placement rate by JPT level and AI Tutor usage over {len(rates)} groups")
+    
+    print("\n" + "="*50)
+
+def test_validation_rules():
+    """Test value-level validation rules on uploads"""
+    print("🔍 Testing validation rules...")
+    
+    tutor = read_csv('ai_tutor template updated.csv', 'AI Tutor')
+    assert not any(result['count'] for result in check_values(tutor, 'AI Tutor'))
+    print("   ✅ Mock AI Tutor data passes every rule")
+    
+    bad = tutor.copy()
+    batch = 'Batch_size(number should come from student feedback form)'
+    bad.loc[3, 'Total_Students_Participated_watched videos'] = bad.loc[3, batch] + 1
+    bad.loc[4, 'Average_ Quiz_Score'] = 11.0
+    bad.loc[5, 'AI_Quizzes_used_for_grading'] = 'yes'
+    bad.loc[6, 'Cohort'] = 'Jna-2024'
+    results = check_values(bad, 'AI Tutor')
+    failed = {result['rule']: list(result['sample'].index) for result in results if result['count']}
+    assert failed == {
+        f'Total_Students_Participated_watched videos greater than {batch}': [4],
+        'Average_ Quiz_Score outside 0–10': [5],
+        'AI_Quizzes_used_for_grading not one of Yes/No': [6],
+        "Cohort is not a cohort like 'Jan-22'": [7],
+    }
+    assert all(result['severity'] == ERROR for result in results if result['count'])
+    print(f"   ✅ {len(failed)} broken rules reported with their upload rows")
+    
+    # Streamed chunks give the same counts and row numbers as the whole upload
+    chunked = check_values((bad.iloc[start:start + 50] for start in range(0, len(bad), 50)), 'AI Tutor')
+    assert [(r['count'], list(r['sample'].index)) for r in chunked] == [(r['count'], list(r['sample'].index)) for r in results]
+    
+    impact = read_csv('AI-initiatives impact updated.csv', 'AI Impact')
+    impact.loc[0, 'CGPA'] = 4.5
+    cgpa = [result for result in check_values(impact, 'AI Impact') if result['rule'] == 'CGPA outside 0–4']
+    assert cgpa[0]['count'] == 1
+    print("   ✅ Chunked checks and CGPA range verified")
+    
+    print("\n" + "="*50)
+
+def test_data_profiler():
+    """Test that stored dataset profiles are cached until the dataset changes"""
+    print("🔍 Testing data profiler...")
+    
+    from data_manager import DataManager
+    
+    data_type = 'AI TKT'
+    source = os.path.abspath(DATA_FILES[data_type])
+    original_dir = os.getcwd()
+    
+    with tempfile.TemporaryDirectory() as workdir:
+        shutil.copy(source, workdir)
+        os.chdir(workdir)
+        try:
+            manager = DataManager()
+            profile = manager.get_data_profile(data_type)
+            assert profile == profile_frame(manager.load_existing_data(data_type), data_type)
+            
+            # A second profile comes from the cache without reading the dataset
+            load = manager.store.load
+            manager.store.load = None
+            assert manager.get_data_profile(data_type) == profile
+            manager.store.load = load
+            print(f"   ✅ Profile of {profile['rows']} rows cached with the dataset version")
+            
+            existing = manager.load_existing_data(data_type)
+            merged, success, msg = manager.merge_data(existing, existing.head(3).assign(Unit='New Unit'), data_type, 'test')
+            assert success and manager.save_data(merged, data_type)[0]
+            assert manager.get_data_profile(data_type)['rows'] == profile['rows'] + 3
+            print("   ✅ Profile recomputed after the dataset changed")
+        finally:
+            os.chdir(original_dir)
+    
+    print("\n" + "="*50)
+
+def test_dataset_history():
+    """Test versioned dataset history and time-travel reads on every backend"""
+    print("🔍 Testing dataset history...")
+    
+    from data_manager import DataManager
+    
+    data_type = 'PRP (Placement Readiness Program)'
+    source = os.path.abspath(DATA_FILES[data_type])
+    original_dir = os.getcwd()
+    
+    def rows(df):
+        return df.astype(str).sort_values(list(df.columns)).reset_index(drop=True)
+    
+    for storage in ['csv', 'sqlite', 'partitioned']:
+        with tempfile.TemporaryDirectory() as workdir:
+            shutil.copy(source, workdir)
+            os.chdir(workdir)
+            try:
+                manager = DataManager(storage=storage)
+                snapshots = [manager.load_existing_data(data_type)]
+                
+                merged, _, _ = manager.merge_data(snapshots[0], snapshots[0].head(2).assign(Cohort='Jan-25'), data_type, 'merger')
+                assert manager.save_data(merged, data_type)[0]
+                snapshots.append(manager.load_existing_data(data_type))
+                
+                upserted, _, _ = manager.upsert_data(snapshots[1], snapshots[1].iloc[[3]].assign(**{'Term-1': 1.0}), data_type, 'upserter')
+                assert manager.save_data(upserted, data_type)[0]
+                snapshots.append(manager.load_existing_data(data_type))
+                
+                replaced, _, _ = manager.replace_data(snapshots[0].head(10), data_type, 'replacer')
+                assert manager.save_data(replaced, data_type)[0]
+                snapshots.append(manager.load_existing_data(data_type))
+                
+                assert manager.delete_data(data_type, 'deleter')[0]
+                
+                versions = manager.list_versions(data_type)
+                assert [v['operation'] for v in versions] == ['BASELINE', 'MERGE', 'UPSERT', 'REPLACE', 'DELETE']
+                assert [v['rows'] for v in versions] == [len(snapshot) for snapshot in snapshots] + [0]
+                for version, snapshot in enumerate(snapshots, start=1):
+                    assert rows(manager.load_version(data_type, version)).equals(rows(snapshot)), (storage, version)
+                assert manager.load_version(data_type).empty
+                
+                # Only the changed rows were written after the baseline
+                groups = sorted(f for f in os.listdir(os.path.join('data_history', 'prp_placement_readiness_program')) if f.endswith('.csv.gz'))
+                assert len(groups) == 4 and len(read_csv(os.path.join('data_history', 'prp_placement_readiness_program', groups[2]))) == 1
+                
+                filtered = manager.load_version(data_type, 2, filters={'Cohort': ['Jan-25']}, columns=['Cohort', 'Year'])
+                assert len(filtered) == 2 and list(filtered.columns) == ['Cohort', 'Year']
+                assert len(manager.load_version(data_type, as_of=versions[-1]['timestamp'])) == 0
+            finally:
+                os.chdir(original_dir)
+        print(f"   ✅ {storage}: {len(versions)} versions read back as they were saved")
+    
+    print("\n" + "="*50)
+
+def test_backups():
+    """Test compressed backups, compaction and retention"""
+    print("🔍 Testing backups...")
+    
+    import sqlite3
+    import zipfile
+    from datetime import datetime, timedelta
+    from backups import BackupManager
+    from data_manager import DataManager
+    
+    data_type = 'AI TKT'
+    source = os.path.abspath(DATA_FILES[data_type])
+    original_dir = os.getcwd()
+    
+    with tempfile.TemporaryDirectory() as workdir:
+        shutil.copy(source, workdir)
+        os.chdir(workdir)
+        try:
+            manager = DataManager()
+            message = manager.delete_data(data_type, 'test')[1]
+            archive_path = message.split('Backup created: ')[1]
+            with zipfile.ZipFile(archive_path) as archive, open(source, 'rb') as original:
+                assert archive.namelist() == [DATA_FILES[data_type]]
+                assert archive.read(DATA_FILES[data_type]) == original.read()
+            assert not [name for name in os.listdir('.') if '.backup_' in name]
+            print(f"   ✅ Deletion archived the stored file ({os.path.getsize(archive_path)} of {os.path.getsize(source)} bytes)")
+            
+            backups = BackupManager('old_backups', keep_recent=2, compact_after_days=7, max_age_days=60)
+            now = datetime(2025, 6, 15, 12)
+            ages = [timedelta(days=100), timedelta(days=20), timedelta(days=10), timedelta(days=1), timedelta(hours=2), timedelta(0)]
+            for age in ages:
+                backups.backup(data_type, [source], now=now - age)
+            backups.compact(data_type, now=now)
+            
+            names = [name for name, _, _ in backups.list_backups(data_type)]
+            snapshots = [name for name in names if not name.endswith('.compact.zip')]
+            monthly = [name for name in names if name.endswith('.compact.zip')]
+            assert len(snapshots) == 2 and monthly == ['ai_tkt-202506.compact.zip', 'ai_tkt-202505.compact.zip']
+            folded = []
+            for name in monthly:
+                with zipfile.ZipFile(os.path.join('old_backups', 'ai_tkt', name)) as archive:
+                    folded += archive.namelist()
+                    with open(source, 'rb') as original:
+                        assert archive.read(archive.namelist()[0]) == original.read()
+            assert len(folded) == 3
+            print(f"   ✅ {len(snapshots)} recent snapshots kept, {len(folded)} folded into {len(monthly)} monthly archives, 1 expired")
+            
+            # Folding into an existing monthly archive keeps its entries
+            backups.backup(data_type, [source], now=now - timedelta(days=21))
+            backups.compact(data_type, now=now)
+            with zipfile.ZipFile(os.path.join('old_backups', 'ai_tkt', 'ai_tkt-202505.compact.zip')) as archive:
+                assert len(archive.namelist()) == 2
+            assert not [name for name in os.listdir(os.path.join('old_backups', 'ai_tkt')) if name.endswith('.tmp')]
+            
+            # A SQLite deletion archives only the deleted dataset's table
+            shutil.copy(source, os.path.basename(source))
+            shutil.copy(os.path.join(original_dir, DATA_FILES['PRP (Placement Readiness Program)']), workdir)
+            sqlite_manager = DataManager(storage='sqlite')
+            assert sqlite_manager.store.exists('PRP (Placement Readiness Program)')
+            rows = len(sqlite_manager.load_existing_data(data_type))
+            message = sqlite_manager.delete_data(data_type, 'test')[1]
+            with zipfile.ZipFile(message.split('Backup created: ')[1]) as archive, tempfile.TemporaryDirectory() as exported:
+                assert archive.namelist() == ['ai_tkt.db']
+                archive.extractall(exported)
+                with sqlite3.connect(os.path.join(exported, 'ai_tkt.db')) as conn:
+                    tables = [row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")]
+                    assert tables == ['ai_tkt'] and conn.execute("SELECT COUNT(*) FROM ai_tkt").fetchone()[0] == rows
+            print("   ✅ Monthly archives rewritten atomically, SQLite backups hold one table")
+        finally:
+            os.chdir(original_dir)
+    
+    print("\n" + "="*50)
+
+def test_audit_log():
+    """Test the segmented audit log: rotation, filtered paging and streamed export"""
+    print("🔍 Testing audit log...")
+    
+    from audit_log import AuditLog
+    from data_manager import DataManager
+    
+    original_dir = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        try:
+            audit = AuditLog('audit', segment_bytes=1000, max_segments=3)
+            for number in range(40):
+                audit.append(['MERGE', 'UPSERT', 'DELETE'][number % 3], ['AI Tutor', 'PRP'][number % 2], f'user{number % 4}', f'record {number}')
+            
+            segments = sorted(name for name in os.listdir('audit') if name.endswith('.jsonl'))
+            assert len(segments) == 3 and segments[0] != 'segment-000001.jsonl'
+            kept = sum(1 for name in segments for _ in open(os.path.join('audit', name)))
+            assert audit.facets()['records'] == kept < 40
+            print(f"   ✅ Rotated to {len(segments)} segments holding the newest {kept} records")
+            
+            # Unfiltered totals come from the manifest, and only the indexes the page spans are read
+            read_indexes = []
+            read_entries = audit._entries
+            audit._entries = lambda segment: read_indexes.append(segment['id']) or read_entries(segment)
+            page, total = audit.query(offset=0, limit=5)
+            assert total == kept and [r['details'] for r in page] == [f'record {n}' for n in range(39, 34, -1)]
+            assert 0 < len(read_indexes) < len(segments)
+            page, total = audit.query(offset=kept - 1, limit=5)
+            assert total == kept and [r['details'] for r in page] == [f'record {40 - kept}']
+            read_indexes.clear()
+            page, total = audit.query(operations=['DELETE'], data_types=['PRP'], offset=1, limit=2)
+            expected = [n for n in range(39, 39 - kept, -1) if n % 3 == 2 and n % 2 == 1]
+            assert total == len(expected) and [r['details'] for r in page] == [f'record {n}' for n in expected[1:3]]
+            assert sorted(read_indexes) == sorted(set(read_indexes))
+            audit._entries = read_entries
+            print(f"   ✅ Filtered page of {len(page)} of {total} matching records, newest first")
+            
+            exported = audit.export(users=['user1']).read().decode().splitlines()
+            assert [json.loads(line)['details'] for line in exported] == [f'record {n}' for n in range(40 - kept, 40) if n % 4 == 1]
+            assert len(audit.export().read().decode().splitlines()) == kept
+            
+            # A line written without its manifest update does not shift the offsets of later records
+            with open(os.path.join('audit', segments[-1]), 'ab') as f:
+                f.write(b'{"details": "interrupted"}\n')
+            audit.append('MERGE', 'PRP', 'user9', 'after interruption')
+            assert audit.query(users=['user9'])[0][0]['details'] == 'after interruption'
+            
+            DataManager().log_operation('MERGE', 'AI TKT', 'tester', 'Added 3 records')
+            page, total = AuditLog().query()
+            assert total == 1 and page[0]['user'] == 'tester' and not os.path.exists('data_operations.log')
+            print("   ✅ Exports stream the matching records; DataManager logs to the audit store")
+        finally:
+            os.chdir(original_dir)
+    
+    print("\n" + "="*50)
+
+def test_session_log():
+    """Test the bounded, newest-first session log"""
+    print("🔍 Testing session log...")
+    
+    from audit_log import SessionLog
+    
+    session_log = SessionLog(capacity=100)
+    for number in range(250):
+        session_log.add({'timestamp': f'2025-01-01 00:{number // 60:02d}:{number % 60:02d}', 'details': number})
+    
+    assert len(session_log) == session_log.capacity == 100
+    assert [record['details'] for record in session_log.page(0, 3)] == [249, 248, 247]
+    assert [record['details'] for record in session_log.page(98, 5)] == [151, 150]
+    timestamps = [record['timestamp'] for record in session_log.page(0, 100)]
+    assert timestamps == sorted(timestamps, reverse=True)
+    print(f"   ✅ {len(session_log)} of 250 operations kept, newest first")
+    
+    session_log.clear()
+    assert not session_log and session_log.page() == []
+    print("   ✅ Cleared session log is empty")
+    
+    print("\n" + "="*50)
+
+def test_template_downloads():
+    """Test cached, deterministic template downloads and their ETags"""
+    print("🔍 Testing template downloads...")
+    
+    import zipfile
+    from data_manager import DataManager
+    
+    manager = DataManager()
+    columns = manager.templates['AI TKT']['columns']
+    expected = BytesIO()
+    pd.DataFrame(columns=columns).to_csv(expected, index=False)
+    assert manager.download_template('AI TKT') == expected.getvalue()
+    
+    archive_bytes = manager.download_all_templates()
+    assert DataManager().download_all_templates() == archive_bytes
+    assert manager.template_etag() == DataManager().template_etag() != manager.template_etag('AI TKT')
+    with zipfile.ZipFile(BytesIO(archive_bytes)) as archive:
+        assert archive.namelist() == [info['filename'] for info in manager.templates.values()]
+        assert {entry.date_time for entry in archive.infolist()} == {(1980, 1, 1, 0, 0, 0)}
+        assert archive.read(manager.templates['AI TKT']['filename']) == expected.getvalue()
+    print(f"   ✅ {len(manager.templates)} templates zipped to identical bytes with ETag {manager.template_etag()}")
+    
+    # Templates come from the template schema, which the shipped files follow, even before any data is stored
+    from csv_reader import TEMPLATE_DTYPES
+    for data_type, template in manager.templates.items():
+        assert template['columns'] == list(TEMPLATE_DTYPES[data_type])
+        assert template['columns'] == list(pd.read_csv(manager.data_files[data_type], nrows=0).columns)
+    original_dir = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        try:
+            assert DataManager().download_template('AI TKT') == expected.getvalue()
+        finally:
+            os.chdir(original_dir)
+    print("   ✅ Templates follow the shared template schema")
+    
+    manager.templates['AI TKT']['columns'] = columns + ['Notes']
+    assert manager.template_etag('AI TKT') != DataManager().template_etag('AI TKT')
+    assert manager.download_all_templates() != archive_bytes
+    print("   ✅ A schema change gives new template bytes and ETags")
+    
+    print("\n" + "="*50)
+
 def main():
     """Run all tests"""
     print("🚀 AI Initiatives Dashboard - Data & System Test")
@@ -124,6 +909,27 @@ def main():
     test_data_files()
     test_data_quality()
     test_dashboard_requirements()
+    test_score_binning()
+    test_score_correlations()
+    test_score_moments()
+    test_significance()
+    test_student_index()
+    test_leaderboard()
+    test_storage_backends()
+    test_upsert()
+    test_parallel_loading()
+    test_csv_reader()
+    test_date_dimension()
+    test_cohort_dimension()
+    test_star_schema()
+    test_student_facts()
+    test_validation_rules()
+    test_data_profiler()
+    test_dataset_history()
+    test_backups()
+    test_audit_log()
+    test_session_log()
+    test_template_downloads()
     
     print("🎉 Testing completed!")
     print("\n📋 Next steps:")
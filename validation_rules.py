@@ -0,0 +1,212 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from csv_reader import TEMPLATE_DTYPES
+from dimensions import DATE_FORMATS, cohort_dimension
+
+# Severity of a rule: errors block the upload, warnings are only reported
+ERROR = 'error'
+WARNING = 'warning'
+
+YES_NO = ['Yes', 'No']
+PLACEMENT = ['Placed', 'Not Placed']
+USAGE_LEVELS = ['High', 'Medium', 'Low']
+
+
+class _Chunk:
+    """A frame being checked, converting each column to numbers or text at most once"""
+
+    def __init__(self, df):
+        self.df = df
+        self._numbers = {}
+        self._text = {}
+
+    def present(self, column):
+        return self.df[column].notna().to_numpy()
+
+    def number(self, column):
+        if column not in self._numbers:
+            self._numbers[column] = pd.to_numeric(self.df[column], errors='coerce').to_numpy(dtype=float)
+        return self._numbers[column]
+
+    def text(self, column):
+        if column not in self._text:
+            values = self.df[column]
+            self._text[column] = values.astype(str).str.strip().where(values.notna())
+        return self._text[column]
+
+
+class Rule:
+    """A named value check over some columns.
+
+    `violations` takes a chunk of the upload and returns a boolean mask of
+    the rows breaking the rule; missing values only break rules that say so.
+    """
+
+    def __init__(self, name, columns, violations, severity=ERROR):
+        self.name = name
+        self.columns = columns
+        self.violations = violations
+        self.severity = severity
+
+
+def numeric(column):
+    return Rule(f"{column} is not a number", [column],
+                lambda chunk: chunk.present(column) & np.isnan(chunk.number(column)))
+
+
+def between(column, low, high, severity=ERROR):
+    def violations(chunk):
+        values = chunk.number(column)
+        return (values < low) | (values > high)
+    return Rule(f"{column} outside {low}–{high}", [column], violations, severity)
+
+
+def at_most(column, limit_column, severity=ERROR):
+    return Rule(f"{column} greater than {limit_column}", [column, limit_column],
+                lambda chunk: chunk.number(column) > chunk.number(limit_column), severity)
+
+
+def one_of(column, allowed, severity=ERROR):
+    return Rule(f"{column} not one of {'/'.join(allowed)}", [column],
+                lambda chunk: chunk.present(column) & ~chunk.text(column).isin(allowed).to_numpy(), severity)
+
+
+def cohort(column='Cohort'):
+    """Cohort names that do not look like 'Jan-22', checked once per distinct name"""
+    def violations(chunk):
+        values = chunk.df[column]
+        dimension = cohort_dimension(tuple(values.dropna().unique()))
+        return values.isin(dimension.loc[dimension['year'] < 0, 'cohort']).to_numpy()
+    return Rule(f"{column} is not a cohort like 'Jan-22'", [column], violations)
+
+
+def date(column, severity=WARNING):
+    def violations(chunk):
+        parsed = pd.to_datetime(chunk.df[column], format=DATE_FORMATS[column], errors='coerce')
+        return chunk.present(column) & parsed.isna().to_numpy()
+    return Rule(f"{column} is not a date", [column], violations, severity)
+
+
+def _numeric_rules(data_type):
+    return [numeric(column) for column, dtype in TEMPLATE_DTYPES[data_type].items() if dtype != 'str']
+
+
+# Value checks of each template, on top of the numeric type checks
+VALIDATION_RULES = {
+    'AI Tutor': [
+        at_most('Total_Students_Participated_watched videos', 'Batch_size(number should come from student feedback form)'),
+        at_most('Total_Students_Attempted_AI Tutor Platform Quiz', 'Batch_size(number should come from student feedback form)'),
+        at_most('No_of_students_who_filled_student feedback form', 'Batch_size(number should come from student feedback form)'),
+        between('Average Score of AI Tutor Platform Quiz', 0, 10),
+        between('Average_ Quiz_Score', 0, 10),
+        between('Faculty_Rating_provide by students', 0, 10),
+        between('AI_Tutor_quality_score', 0, 10),
+        between('AI_Tutor_impact_score', 0, 10),
+        between('Avg_Rating_for_AI_Tutor_Tool', 0, 10),
+        one_of('Faculty_Implemented_AI_Tutor_efficiently(Yes/No)', YES_NO),
+        one_of('AI_Quizzes_used_for_grading', YES_NO),
+        one_of('Faculty_Feedback', ['Very Positive', 'Positive', 'Neutral', 'Negative'], WARNING),
+        cohort(),
+        date('Unit_Commencement_date'),
+        date('Unit_End_Date'),
+    ],
+    'AI Mentor': [
+        one_of("Q1_Are Students_motivated to use AI Mentor? (Yes/No, as they don't find it useful)", YES_NO),
+        one_of('Q2_Are students using AI Mentor effectively ? (Yes/No)', YES_NO),
+        one_of('Q3_Have you mandated students to meet you only after obtaining suggestions from AI Mentor? (Yes/No)', YES_NO),
+        one_of("Q4_Improvement_observed in student's logical thinking, Presentation & Report Structure with the use of AI Mentor (Yes/No)", YES_NO),
+        one_of('Project Type (ARP, IBR 1, IBR 2, Industry Project)', ['ARP', 'IBR 1', 'IBR 2', 'Industry Project'], WARNING),
+        between('Approx. percentage of students under your guidance who levelled up using AI Mentor.', 0, 100),
+        cohort(),
+    ],
+    'AI Impact': [
+        between('CGPA', 0, 4),
+        one_of('Placed/Not Placed', PLACEMENT),
+        one_of('AI Tutor Usage', USAGE_LEVELS, WARNING),
+        one_of('AI Mentor Usage', USAGE_LEVELS, WARNING),
+        one_of('JPT Usage', USAGE_LEVELS, WARNING),
+        one_of('Yoodli Usage', USAGE_LEVELS, WARNING),
+        cohort(),
+    ],
+    'AI TKT': [
+        between('Average Grades Before AI for TKT', 0, 100),
+        between('Avergae Grades After AI for TKT', 0, 100),
+    ],
+    'Unit Performance': [
+        one_of('AI Tutor (Before/After)', ['Before', 'After']),
+        between('Total_Avg_score', 0, 100),
+        cohort(),
+    ],
+    'CR (Corporate Relations)': [
+        at_most('No. of students applied', 'No. of Students_Eligible'),
+        at_most('No. of Students_Interviewed', 'No. of students applied'),
+        at_most('Students_Selected', 'No. of Students_Interviewed'),
+        at_most('Avg_CTC(in USD)', 'Highest_CTC(in USD)', WARNING),
+        one_of('Students used JPT(Yes/No)', YES_NO),
+        cohort(),
+        date('Date of first interview(mm/dd/yyyy)'),
+    ],
+    'PRP (Placement Readiness Program)': [
+        between('Term-1', 0, 100),
+        between('Term-2', 0, 100),
+        between('Term-3', 0, 100),
+        between('Area Head Mock Interview Score', 0, 100),
+        one_of('Categorise student overall (Outstanding, Good, Average, Needs Handholding)',
+               ['Outstanding', 'Good', 'Average', 'Needs Handholding'], WARNING),
+        one_of('Placed/Not Placed', PLACEMENT),
+        cohort(),
+    ],
+}
+
+
+def rules_for(data_type):
+    return _numeric_rules(data_type) + VALIDATION_RULES[data_type] if data_type in VALIDATION_RULES else []
+
+
+def check_values(data, data_type, sample_size=5):
+    """Run a template's rules over an upload, given as a frame or an iterable of chunks.
+
+    Every rule is evaluated as one vectorized mask per chunk; rules whose
+    columns are missing are skipped. Returns one entry per rule with its
+    severity, the number of violating rows and up to `sample_size` of them,
+    numbered from 1 in upload order.
+    """
+    rules = rules_for(data_type)
+    counts = np.zeros(len(rules), dtype=np.int64)
+    samples = [[] for _ in rules]
+    offset = 0
+    for df in [data] if isinstance(data, pd.DataFrame) else data:
+        chunk = _Chunk(df)
+        for position, rule in enumerate(rules):
+            if not set(rule.columns) <= set(df.columns):
+                continue
+            mask = np.asarray(rule.violations(chunk), dtype=bool)
+            found = np.count_nonzero(mask)
+            if not found:
+                continue
+            counts[position] += found
+            missing = sample_size - sum(len(sample) for sample in samples[position])
+            if missing > 0:
+                rows = np.flatnonzero(mask)[:missing]
+                sample = df.iloc[rows][rule.columns]
+                samples[position].append(sample.set_axis(rows + offset + 1).rename_axis('Row'))
+        offset += len(df)
+
+    return [
+        {'rule': rule.name, 'severity': rule.severity, 'count': int(count),
+         'sample': pd.concat(sample) if sample else pd.DataFrame(columns=rule.columns)}
+        for rule, count, sample in zip(rules, counts, samples)
+    ]
+
+
+def render_violations(results, container=st):
+    """Report every broken rule with a few of the rows breaking it"""
+    for result in results:
+        if not result['count']:
+            continue
+        report = container.error if result['severity'] == ERROR else container.warning
+        report(f"{result['rule']}: {result['count']} rows")
+        with container.expander(f"Rows failing: {result['rule']}"):
+            st.dataframe(result['sample'])